@@ -0,0 +1,19 @@
+# home/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from jobs.models import Job
+from jobs.signals import jobs_bulk_changed
+from users.models import Profile
+from .stats import invalidate_home_stats
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(jobs_bulk_changed, sender=Job)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def refresh_home_stats(sender, **kwargs):
+    """
+    Mark the home page statistics stale when jobs or profiles change.
+    """
+    invalidate_home_stats()
@@ -0,0 +1,82 @@
+"""
+Cached statistics for the home page.
+
+The numbers come from one conditional aggregate per table and live in the
+cache as {"stats", "fresh_until"}. Once an entry goes stale (TTL passed or a
+Job/Profile signal marked it), the first request to take the recompute lock
+rebuilds it while every other request keeps serving the stale copy, so an
+expiry under load costs two queries instead of a stampede.
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from jobs.models import Job
+from users.models import Profile
+
+HOME_STATS_KEY = "home-stats"
+HOME_STATS_LOCK_KEY = "home-stats:lock"
+HOME_STATS_TTL = 300  # seconds a computed entry counts as fresh
+HOME_STATS_STALE_TTL = 24 * 60 * 60  # seconds a stale entry may still be served
+HOME_STATS_LOCK_TIMEOUT = 30  # seconds before an abandoned lock expires
+
+
+def compute_home_stats():
+    """
+    Count active jobs (total and per industry) and profiles per role.
+    """
+    industry_counts = {
+        code: Count("pk", filter=Q(industry=code)) for code, _ in Job.INDUSTRIES
+    }
+    jobs = Job.objects.filter(is_active=True).aggregate(total=Count("pk"), **industry_counts)
+    profiles = Profile.objects.aggregate(
+        companies=Count("pk", filter=Q(role="company")),
+        applicants=Count("pk", filter=Q(role="applicant")),
+    )
+    return {
+        "total_jobs": jobs.pop("total"),
+        "total_companies": profiles["companies"],
+        "total_applicants": profiles["applicants"],
+        "industry_counts": jobs,
+    }
+
+
+def get_home_stats():
+    """
+    Return the home page statistics, recomputing them at most once at a time.
+    """
+    entry = cache.get(HOME_STATS_KEY)
+    if entry is not None and entry["fresh_until"] > time.time():
+        return entry["stats"]
+
+    # Stale or missing: only the lock holder recomputes. Without a stale
+    # copy to fall back on (cold cache) everybody has to compute.
+    has_lock = cache.add(HOME_STATS_LOCK_KEY, 1, HOME_STATS_LOCK_TIMEOUT)
+    if entry is not None and not has_lock:
+        return entry["stats"]
+
+    try:
+        stats = compute_home_stats()
+        cache.set(
+            HOME_STATS_KEY,
+            {"stats": stats, "fresh_until": time.time() + HOME_STATS_TTL},
+            HOME_STATS_STALE_TTL,
+        )
+    finally:
+        if has_lock:
+            cache.delete(HOME_STATS_LOCK_KEY)
+    return stats
+
+
+def invalidate_home_stats():
+    """
+    Mark the cached statistics stale without dropping them.
+
+    Keeping the entry lets concurrent requests serve it while a single
+    worker recomputes.
+    """
+    entry = cache.get(HOME_STATS_KEY)
+    if entry is not None and entry["fresh_until"] > 0:
+        entry["fresh_until"] = 0
+        cache.set(HOME_STATS_KEY, entry, HOME_STATS_STALE_TTL)
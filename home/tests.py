@@ -1,3 +1,52 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from jobs.testing import make_job, make_user
+
+from .stats import HOME_STATS_KEY, HOME_STATS_LOCK_KEY, get_home_stats
+
+
+class HomeStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+        make_user("seeker")
+
+    def test_counts(self):
+        make_job(self.employer, industry="tech")
+        make_job(self.employer, industry="finance")
+        make_job(self.employer, industry="finance", is_active=False)
+        stats = get_home_stats()
+        self.assertEqual(stats["total_jobs"], 2)
+        self.assertEqual(stats["total_companies"], 1)
+        self.assertEqual(stats["total_applicants"], 1)
+        self.assertEqual(stats["industry_counts"]["finance"], 1)
+
+    def test_served_from_cache(self):
+        get_home_stats()
+        with self.assertNumQueries(1):
+            # Just the cache read
+            get_home_stats()
+
+    def test_job_change_marks_stats_stale(self):
+        self.assertEqual(get_home_stats()["total_jobs"], 0)
+        make_job(self.employer)
+        self.assertEqual(cache.get(HOME_STATS_KEY)["fresh_until"], 0)
+        self.assertEqual(get_home_stats()["total_jobs"], 1)
+
+    def test_stale_copy_served_while_another_request_recomputes(self):
+        get_home_stats()
+        make_job(self.employer)
+        cache.add(HOME_STATS_LOCK_KEY, 1)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(get_home_stats()["total_jobs"], 0)
+        self.assertFalse([query for query in queries if "jobs_job" in query["sql"]])
+
+    def test_home_page(self):
+        make_job(self.employer)
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_jobs"], 1)
@@ -1,7 +1,13 @@
 from django.shortcuts import render
-from django.contrib.auth.models import User
-from jobs.models import Job
-from users.models import Profile
+from .stats import get_home_stats
+
+# Industries featured on the home page
+FEATURED_INDUSTRIES = [
+    {"name": "Technology", "code": "tech", "icon": "fa-laptop-code"},
+    {"name": "Healthcare", "code": "healthcare", "icon": "fa-heartbeat"},
+    {"name": "Finance", "code": "finance", "icon": "fa-chart-line"},
+    {"name": "Education", "code": "education", "icon": "fa-graduation-cap"},
+]
 
 
 def home(request):
@@ -12,44 +18,20 @@ def home(request):
         HttpResponse: The rendered home page.
     """
 
-    # Get the total number of active jobs and profiles
-    total_jobs = Job.objects.filter(is_active=True).count()
-    total_companies = Profile.objects.filter(role="company").count()
-    total_applicants = Profile.objects.filter(role="applicant").count()
+    # Cached job/profile totals and per-industry job counts
+    stats = get_home_stats()
 
     # Get the count of jobs per industry
     job_types = [
-        {
-            "name": "Technology",
-            "code": "tech",
-            "icon": "fa-laptop-code",
-            "count": Job.objects.filter(is_active=True, industry="tech").count(),
-        },
-        {
-            "name": "Healthcare",
-            "code": "health",
-            "icon": "fa-heartbeat",
-            "count": Job.objects.filter(is_active=True, industry="health").count(),
-        },
-        {
-            "name": "Finance",
-            "code": "finance",
-            "icon": "fa-chart-line",
-            "count": Job.objects.filter(is_active=True, industry="finance").count(),
-        },
-        {
-            "name": "Education",
-            "code": "education",
-            "icon": "fa-graduation-cap",
-            "count": Job.objects.filter(is_active=True, industry="education").count(),
-        },
+        {**industry, "count": stats["industry_counts"].get(industry["code"], 0)}
+        for industry in FEATURED_INDUSTRIES
     ]
 
     # Render the home page with the statistics
     context = {
-        "total_jobs": total_jobs,
-        "total_companies": total_companies,
-        "total_applicants": total_applicants,
+        "total_jobs": stats["total_jobs"],
+        "total_companies": stats["total_companies"],
+        "total_applicants": stats["total_applicants"],
         "job_types": job_types,
     }
     return render(request, "home/home.html", context)
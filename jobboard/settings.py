@@ -50,6 +50,8 @@ CUSTOM_APPS = [
     'users.apps.UsersConfig', # user app
     'home.apps.HomeConfig', # home app
     'chatbot.apps.ChatbotConfig', # chatbot app 
+    'outbox.apps.OutboxConfig', # background task queue
+    'notifications.apps.NotificationsConfig', # email digests
 ]
 
 INSTALLED_APPS = DJANGO_APPS + CUSTOM_APPS + THIRD_PARTY_APPS
@@ -91,9 +93,26 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # A file rather than SQLite's shared in-memory database, whose table
+        # locks fail concurrent writers at once instead of waiting
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# Shared by every process (web workers, run_worker, management commands), so
+# cached pages, counters and locks agree between them. The default keeps it
+# in the database; run `manage.py createcachetable` once. Point
+# CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached in production.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'jobboard_cache'),
+    }
+}
+if CACHES['default']['BACKEND'].endswith('.DatabaseCache'):
+    # Room for the job list fragments before old entries are culled
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 10000}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -146,4 +165,51 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Crispy forms settings
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
-LOGIN_REDIRECT_URL = '/'
\ No newline at end of file
+LOGIN_REDIRECT_URL = '/'
+
+# Job search backend (dotted path to a class in jobs.search).
+# Leave as None to use FTS5 on SQLite and a plain icontains search elsewhere.
+JOB_SEARCH_BACKEND = None
+
+# Seconds between sweeps that close jobs past their application deadline,
+# run as a periodic task by `manage.py run_worker`. Set to None to schedule
+# `manage.py expire_jobs` with cron (or similar) instead.
+JOB_EXPIRY_SWEEP_INTERVAL = 300
+
+# Snapshots of the in-memory job indexes (see jobs.indexes), rebuilt by
+# `manage.py run_worker` every JOB_INDEX_REBUILD_INTERVAL seconds (or by
+# `manage.py build_job_indexes`) and caught up with the database every
+# JOB_INDEX_REFRESH_INTERVAL seconds; request processes reload them.
+JOB_INDEX_DIR = BASE_DIR / 'var' / 'indexes'
+JOB_INDEX_REBUILD_INTERVAL = 60 * 60
+JOB_INDEX_REFRESH_INTERVAL = 30
+
+# Salary filters compare monthly pay in this currency. CURRENCY_RATES gives
+# the value of one unit of each currency in BASE_CURRENCY; rerun
+# `manage.py normalize_salaries` after changing it.
+BASE_CURRENCY = 'BDT'
+CURRENCY_RATES = {
+    'BDT': 1,
+    'USD': 122,
+    'EUR': 132,
+    'GBP': 155,
+    'INR': 1.45,
+}
+
+# Offline gazetteer (CSV of name, aliases, country, latitude, longitude) used
+# to place job locations for radius search; rerun `manage.py geocode_jobs`
+# after editing it.
+JOB_GAZETTEER = BASE_DIR / 'jobs' / 'data' / 'gazetteer.csv'
+
+# Email digests: once a user's oldest pending notification of a kind has
+# waited its cadence (seconds), everything pending for them goes out in one
+# email. Run `manage.py send_notification_digests` every few minutes.
+NOTIFICATION_CADENCE = {
+    'application': 15 * 60,
+    'job_alert': 24 * 60 * 60,
+    'job_import': 0,
+}
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'JobBoard <noreply@jobboard.local>')
+# Absolute links in emails
+SITE_URL = os.getenv('SITE_URL', 'http://127.0.0.1:8000')
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
-from .models import Job, Application
+from .models import Job, Application, ResumeBlob, SavedSearch
 admin.site.register(Job)
-admin.site.register(Application)
\ No newline at end of file
+admin.site.register(Application)
+admin.site.register(SavedSearch)
+admin.site.register(ResumeBlob)
@@ -0,0 +1,131 @@
+"""
+Saved-search alerts: matching new jobs against subscribed searches.
+
+This is a percolator: instead of running every saved search as a query, each
+new job is turned into the set of saved searches it could satisfy. Every
+SavedSearch stores an `anchor`, the first ANCHOR_LENGTH characters of its
+longest query term (or "" for searches without text). A job can only match
+searches whose anchor is a prefix of one of its terms and whose facet
+filters are either blank or equal to the job's, so indexed lookups over
+(anchor, job_type, industry, experience_level) yield a small candidate set.
+Capping the anchor bounds the prefixes looked up per word, and they are
+sent ANCHOR_BATCH_SIZE at a time. Candidates are then checked in Python
+against the full terms and salary bounds.
+
+Terms follow the job search semantics (see jobs.search): every query term
+must match the start of a word in the job's searchable fields.
+"""
+from django.db import transaction
+
+from notifications.digests import notify_many
+from notifications.models import Notification
+
+from .models import Job, JobAlert, SavedSearch, Watermark
+from .search import SEARCH_FIELDS, TOKEN_RE, parse_query
+
+ALERTS_WATERMARK = "saved-search-alerts:jobs"
+
+# Words are matched on this many characters at most
+MAX_TERM_LENGTH = 100
+
+# Anchors are truncated to this many characters (SavedSearch.anchor's max_length)
+ANCHOR_LENGTH = 20
+
+# Anchors looked up per query
+ANCHOR_BATCH_SIZE = 500
+
+
+def anchor_term(query):
+    """
+    The term a saved search is indexed under: the start of its longest query term.
+    """
+    terms = parse_query(query)
+    return max(terms, key=len)[:ANCHOR_LENGTH] if terms else ""
+
+
+def job_prefixes(job):
+    """
+    Every prefix of every word in the job's searchable fields.
+    """
+    prefixes = set()
+    for field in SEARCH_FIELDS:
+        for word in TOKEN_RE.findall((getattr(job, field) or "").lower()):
+            word = word[:MAX_TERM_LENGTH]
+            prefixes.update(word[:length] for length in range(1, len(word) + 1))
+    return prefixes
+
+
+def candidate_searches(job, prefixes):
+    """
+    Yield (pk, user_id, query, min_salary, max_salary) of the active saved
+    searches anchored at one of `prefixes` whose facets admit the job.
+    """
+    anchors = sorted({prefix for prefix in prefixes if len(prefix) <= ANCHOR_LENGTH} | {""})
+    searches = SavedSearch.objects.filter(
+        is_active=True,
+        job_type__in=[job.job_type, ""],
+        industry__in=[job.industry, ""],
+        experience_level__in=[job.experience_level, ""],
+    ).values_list("pk", "user_id", "query", "min_salary", "max_salary")
+    for start in range(0, len(anchors), ANCHOR_BATCH_SIZE):
+        # A search has one anchor, so the batches never return it twice
+        yield from searches.filter(anchor__in=anchors[start:start + ANCHOR_BATCH_SIZE]).iterator(chunk_size=2000)
+
+
+def matching_searches(job):
+    """
+    Return (saved_search_id, user_id) for every active saved search the job satisfies.
+    """
+    prefixes = job_prefixes(job)
+    matches = []
+    for pk, user_id, query, min_salary, max_salary in candidate_searches(job, prefixes):
+        if not all(term in prefixes for term in parse_query(query)):
+            continue
+        # Same salary semantics as the job list filters: the job's normalized
+        # range must overlap the (base currency) bounds
+        if min_salary is not None and (job.normalized_max is None or job.normalized_max < min_salary):
+            continue
+        if max_salary is not None and (job.normalized_min is None or job.normalized_min > max_salary):
+            continue
+        matches.append((pk, user_id))
+    return matches
+
+
+def percolate_new_jobs(batch_size=500):
+    """
+    Match jobs posted since the last run against saved searches.
+
+    Jobs are read in id batches past the watermark; each batch's alerts and
+    the watermark move are committed together, along with one digest
+    notification per (user, job) (see notifications.digests). A user's own
+    postings never alert them. Returns (jobs_processed, alerts_created).
+    """
+    last_id = Watermark.objects.filter(name=ALERTS_WATERMARK).values_list("last_id", flat=True).first() or 0
+    jobs_processed = alerts_created = 0
+    while True:
+        jobs = list(Job.objects.filter(pk__gt=last_id).order_by("pk")[:batch_size])
+        if not jobs:
+            return jobs_processed, alerts_created
+
+        alerts, notifications = [], {}
+        for job in jobs:
+            if not job.is_active:
+                continue
+            for search_id, user_id in matching_searches(job):
+                if user_id == job.posted_by_id:
+                    continue
+                alerts.append(JobAlert(saved_search_id=search_id, job_id=job.pk))
+                # Several saved searches matching one job are one line in the digest
+                notifications.setdefault((user_id, job.pk), Notification(
+                    recipient_id=user_id,
+                    kind="job_alert",
+                    message=f"{job.title} at {job.company}",
+                    url=job.get_absolute_url(),
+                ))
+        last_id = jobs[-1].pk
+        with transaction.atomic():
+            JobAlert.objects.bulk_create(alerts, ignore_conflicts=True, batch_size=1000)
+            notify_many(list(notifications.values()))
+            Watermark.objects.update_or_create(name=ALERTS_WATERMARK, defaults={"last_id": last_id})
+        jobs_processed += len(jobs)
+        alerts_created += len(alerts)
@@ -0,0 +1,84 @@
+"""
+Submitting job applications.
+
+One application per (job, applicant) is enforced by the database's unique
+constraint alone: the insert runs in its own transaction (a savepoint when
+nested) and an IntegrityError means the applicant already applied. There is
+no check-then-insert window for concurrent double-submits to race through.
+
+The apply form also carries an idempotency key. A POST claims its key with
+`cache.add()` before anything is stored, so a retried or double-clicked
+submit with the same key is usually answered without uploading the resume
+a second time. That is only an optimization: the claim is as shared and as
+atomic as the cache backend (a local-memory cache only sees its own
+process), and a submit that gets past it is still stopped by the unique
+constraint.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+# Job columns the apply flow reads: the acceptance checks, the page, the
+# match scoring that follows a new application (see jobs.ranking) and the
+# employer's notification
+APPLY_JOB_FIELDS = (
+    "title", "company", "requirements", "experience_level", "is_active", "application_deadline", "posted_by",
+)
+
+IDEMPOTENCY_TIMEOUT = 24 * 60 * 60  # seconds a submitted key is remembered
+
+
+def new_idempotency_key():
+    return uuid.uuid4().hex
+
+
+def _claim_key(user_id, job_id, key):
+    return f"apply:{user_id}:{job_id}:{key}"
+
+
+def claim_submission(user_id, job_id, key):
+    """
+    Claim an idempotency key; False when a submit with this key was already
+    seen by the cache (best effort, see the module docstring).
+
+    Requests without a valid key are never treated as retries.
+    """
+    try:
+        key = uuid.UUID(key).hex
+    except (TypeError, ValueError):
+        return True
+    return cache.add(_claim_key(user_id, job_id, key), True, IDEMPOTENCY_TIMEOUT)
+
+
+def release_submission(user_id, job_id, key):
+    """
+    Forget a claimed key, e.g. when the submit was rejected and may be corrected and resent.
+    """
+    try:
+        key = uuid.UUID(key).hex
+    except (TypeError, ValueError):
+        return
+    cache.delete(_claim_key(user_id, job_id, key))
+
+
+def submit_application(application):
+    """
+    Insert an unsaved Application. Returns False if the applicant already applied.
+
+    The insert and the job counter update its signals make commit or roll
+    back together. The resume is stored (taking its reference, see
+    jobs.resumes) before that transaction, so on a duplicate it can be
+    handed back again.
+    """
+    resume = application.resume
+    if resume and not resume._committed:
+        resume.save(resume.name, resume.file, save=False)
+    try:
+        with transaction.atomic():
+            application.save()
+    except IntegrityError:
+        if application.resume and application.resume.name != application._meta.get_field("resume").default:
+            application.resume.delete(save=False)
+        return False
+    return True
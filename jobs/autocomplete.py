@@ -0,0 +1,193 @@
+"""
+Search box suggestions for job titles, companies and locations.
+
+Each field of the active jobs is kept in memory as a `PrefixIndex`: a sorted
+list of (word-start suffix, phrase) entries, so "dev" finds "Python
+Developer" with two bisections and no database access. Suggestions are
+ranked by how many active jobs use the phrase. The words of those fields
+also feed a trigram index (see jobs.fuzzy) used to correct misspelled search
+terms.
+
+Like the recommendation index (see jobs.recommendations) each process keeps
+its own copy, loaded from a snapshot the worker builds and kept current with
+the database as described in jobs.indexes.
+"""
+import bisect
+import heapq
+
+from .fuzzy import MIN_WORD_LENGTH, TrigramIndex
+from .indexes import IndexHolder, LiveIndex
+from .search import TOKEN_RE, parse_query
+
+# Job fields offered as suggestions, in display order
+AUTOCOMPLETE_FIELDS = ("title", "company", "location")
+
+# Shorter prefixes match too much of the index to be useful
+MIN_PREFIX_LENGTH = 2
+
+# Longest suffix kept per phrase; longer prefixes are matched on this much
+MAX_KEY_LENGTH = 40
+
+
+def normalize(phrase):
+    return " ".join((phrase or "").lower().split())
+
+
+def words(values):
+    """
+    The distinct search words (as the search backends tokenize them) in some field values.
+    """
+    return {
+        word
+        for value in values
+        for word in TOKEN_RE.findall((value or "").lower())
+        if len(word) >= MIN_WORD_LENGTH and not word.isdigit()
+    }
+
+
+class PrefixIndex:
+    """
+    Phrases with usage counts, searchable by the prefix of any of their words.
+    """
+
+    def __init__(self):
+        self.entries = []  # sorted [(suffix, phrase_key), ...]
+        self.counts = {}  # phrase_key -> number of jobs using it
+        self.display = {}  # phrase_key -> phrase as written
+
+    @staticmethod
+    def suffixes(key):
+        words = key.split(" ")
+        return {" ".join(words[start:])[:MAX_KEY_LENGTH] for start in range(len(words))}
+
+    def add(self, phrase):
+        key = normalize(phrase)
+        if not key:
+            return
+        if key not in self.counts:
+            self.counts[key] = 0
+            self.display[key] = " ".join(phrase.split())
+            for suffix in self.suffixes(key):
+                bisect.insort(self.entries, (suffix, key))
+        self.counts[key] += 1
+
+    def discard(self, phrase):
+        key = normalize(phrase)
+        if key not in self.counts:
+            return
+        self.counts[key] -= 1
+        if self.counts[key] > 0:
+            return
+        del self.counts[key], self.display[key]
+        for suffix in self.suffixes(key):
+            position = bisect.bisect_left(self.entries, (suffix, key))
+            if position < len(self.entries) and self.entries[position] == (suffix, key):
+                del self.entries[position]
+
+    def load(self, phrases):
+        """
+        Bulk-load phrases; sorting once beats inserting one at a time.
+        """
+        for phrase in phrases:
+            key = normalize(phrase)
+            if key:
+                self.counts[key] = self.counts.get(key, 0) + 1
+                self.display.setdefault(key, " ".join(phrase.split()))
+        self.entries = sorted({(suffix, key) for key in self.counts for suffix in self.suffixes(key)})
+
+    def complete(self, prefix, limit=8):
+        """
+        Return [(phrase, count), ...] for the most used phrases with a word starting with `prefix`.
+        """
+        prefix = normalize(prefix)[:MAX_KEY_LENGTH]
+        start = bisect.bisect_left(self.entries, (prefix,))
+        end = bisect.bisect_left(self.entries, (prefix + "\uffff",), lo=start)
+        keys = {key for _, key in self.entries[start:end]}
+        best = heapq.nlargest(limit, keys, key=lambda key: (self.counts[key], key))
+        return [(self.display[key], self.counts[key]) for key in best]
+
+
+class AutocompleteIndex(LiveIndex):
+    """
+    One PrefixIndex per autocomplete field, a TrigramIndex of their words
+    and each job's current values.
+    """
+    name = "job-autocomplete"
+    fields = AUTOCOMPLETE_FIELDS
+
+    def __init__(self):
+        super().__init__()
+        self.phrases = {field: PrefixIndex() for field in AUTOCOMPLETE_FIELDS}
+        self.words = TrigramIndex()
+        self.jobs = {}  # job_id -> (title, company, location)
+
+    def job_ids(self):
+        return self.jobs.keys()
+
+    def add(self, job_id, values):
+        self.remove(job_id)
+        self.jobs[job_id] = values
+        for field, value in zip(AUTOCOMPLETE_FIELDS, values):
+            self.phrases[field].add(value)
+        for word in words(values):
+            self.words.add(word)
+
+    def remove(self, job_id):
+        values = self.jobs.pop(job_id, None)
+        for field, value in zip(AUTOCOMPLETE_FIELDS, values or ()):
+            self.phrases[field].discard(value)
+        for word in words(values or ()):
+            self.words.discard(word)
+
+    def load(self, rows):
+        """
+        Bulk-load (job_id, values) rows; sorting once beats inserting one at a time.
+        """
+        self.jobs = dict(rows)
+        for position, field in enumerate(AUTOCOMPLETE_FIELDS):
+            self.phrases[field].load(values[position] for values in self.jobs.values())
+        self.words.load(word for values in self.jobs.values() for word in words(values))
+
+    def complete(self, prefix, fields=AUTOCOMPLETE_FIELDS, limit=8):
+        return {field: self.phrases[field].complete(prefix, limit) for field in fields}
+
+
+index_holder = IndexHolder(AutocompleteIndex)
+
+
+def get_index(build=False):
+    """
+    Return this process's copy of the index (see IndexHolder.get()).
+    """
+    return index_holder.get(build)
+
+
+def suggest(prefix, fields=AUTOCOMPLETE_FIELDS, limit=8):
+    """
+    Return {field: [(phrase, count), ...]} for a search box prefix.
+
+    Prefixes shorter than MIN_PREFIX_LENGTH get no suggestions.
+    """
+    if len(normalize(prefix)) < MIN_PREFIX_LENGTH:
+        return {field: [] for field in fields}
+    return get_index().complete(prefix, fields, limit)
+
+
+def correct_query(query):
+    """
+    Return `query` with misspelled terms replaced by the closest known word.
+
+    A term counts as known when some title, company or location word starts
+    with it; other terms are swapped for their most similar word by trigram
+    similarity (or kept when nothing is close). Returns None when nothing
+    was corrected.
+    """
+    vocabulary = get_index().words
+    corrected, changed = [], False
+    for term in parse_query(query):
+        if len(term) >= MIN_WORD_LENGTH and not vocabulary.has_prefix(term):
+            matches = vocabulary.similar(term, limit=1)
+            if matches:
+                term, changed = matches[0][0], True
+        corrected.append(term)
+    return " ".join(corrected) if changed else None
@@ -0,0 +1,36 @@
+"""
+Change detection for the jobs table.
+
+`jobs_version()` sums the table up as the latest `updated_at` and the
+number of rows. Saves, lifecycle actions, imports and backfills all move
+`updated_at` (bulk writes set it explicitly, see jobs.lifecycle) and
+deletes change the count, so the version changes whenever job data does.
+
+The two are read with separate queries: a lone MAX() is answered from the
+end of `job_updated_idx` without reading the table, which SQLite only does
+when nothing else is aggregated alongside it. The COUNT() still walks the
+smallest index, but without the MAX riding along.
+
+The version is read from the database rather than kept in a cache, so
+every process sees the same one whatever the cache backend; cache keys,
+HTTP validators and the in-memory indexes are derived from it.
+"""
+from django.db.models import Max
+
+from .models import Job
+
+
+def jobs_version():
+    """
+    Return (changed_at, count): the latest Job.updated_at (None without jobs) and the number of jobs.
+    """
+    changed_at = Job.objects.order_by().aggregate(changed_at=Max("updated_at"))["changed_at"]
+    return changed_at, Job.objects.order_by().count()
+
+
+def version_token(version):
+    """
+    A short string naming a jobs version, for cache keys and ETags.
+    """
+    changed_at, count = version
+    return f"{changed_at.timestamp() if changed_at else 0:.6f}-{count}"
@@ -0,0 +1,41 @@
+"""
+Maintenance for the denormalized application counters on Job.
+
+`Job.application_count` and `Job.last_applied_at` are kept current by the
+Application signals in jobs.signals; `recount_applications()` recomputes
+them from the Application table when they drift (raw SQL imports, restored
+backups, bugs).
+"""
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Job, Application
+
+
+def recount_applications(jobs=None, batch_size=5000):
+    """
+    Recompute the counters for `jobs` (default: every job) in id batches.
+
+    Each batch is a single UPDATE with correlated subqueries, run in its own
+    transaction so large tables don't hold one long write lock.
+    Returns the number of jobs updated.
+    """
+    jobs = Job.objects.all() if jobs is None else jobs
+    per_job = Application.objects.filter(job=OuterRef("pk")).order_by().values("job")
+    counts = per_job.annotate(n=Count("pk")).values("n")
+    latest = per_job.annotate(latest=Max("date_applied")).values("latest")
+
+    updated, last_id = 0, 0
+    while True:
+        ids = list(
+            jobs.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return updated
+        with transaction.atomic():
+            updated += Job.objects.filter(pk__in=ids).update(
+                application_count=Coalesce(Subquery(counts), 0),
+                last_applied_at=Subquery(latest),
+            )
+        last_id = ids[-1]
@@ -0,0 +1,84 @@
+"""
+Facet counts for the job list filters.
+
+All counts come from a single aggregate: one conditional `COUNT(...) FILTER`
+per facet value over the queryset filtered by everything except the facet
+selects. Each facet's counts ignore its own selection but honour the other
+facets' (the usual disjunctive-facet rule), so picking "Remote" still shows
+how many jobs every other job type would give. Results are cached briefly
+per normalized filter signature, which the job list extends with the jobs
+version (see jobs.changes) so a change retires them.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Job
+
+# Facet field -> its choices, in display order
+FACETS = {
+    "job_type": Job.JOB_TYPES,
+    "industry": Job.INDUSTRIES,
+    "experience_level": Job.EXPERIENCE_LEVELS,
+}
+
+FACET_CACHE_TIMEOUT = 60  # seconds
+
+
+def facet_cache_key(signature):
+    """
+    Cache key for a normalized filter signature (a dict of filter values).
+    """
+    payload = json.dumps(signature, sort_keys=True, separators=(",", ":"), default=str)
+    return "job-facets:" + hashlib.md5(payload.encode()).hexdigest()
+
+
+def compute_facet_counts(queryset, selected):
+    """
+    Count jobs per facet value in one query.
+
+    `queryset` must be filtered by the non-facet filters only; `selected`
+    maps facet fields to the currently selected value (or empty).
+    """
+    aggregates, slots = {}, {}
+    for field, choices in FACETS.items():
+        others = Q(**{other: value for other, value in selected.items() if other != field and value})
+        for value, _ in choices:
+            alias = f"facet_{len(slots)}"
+            aggregates[alias] = Count("pk", filter=others & Q(**{field: value}))
+            slots[alias] = (field, value)
+
+    totals = queryset.order_by().aggregate(**aggregates)
+
+    counts = {field: {} for field in FACETS}
+    for alias, (field, value) in slots.items():
+        counts[field][value] = totals[alias]
+    return counts
+
+
+def get_facets(queryset, selected, signature):
+    """
+    Return facet options for the template, using the cache when possible.
+
+    Each facet maps to a list of {"value", "label", "count", "selected"}.
+    """
+    key = facet_cache_key(signature)
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute_facet_counts(queryset, selected)
+        cache.set(key, counts, FACET_CACHE_TIMEOUT)
+
+    return {
+        field: [
+            {
+                "value": value,
+                "label": label,
+                "count": counts[field].get(value, 0),
+                "selected": selected.get(field) == value,
+            }
+            for value, label in choices
+        ]
+        for field, choices in FACETS.items()
+    }
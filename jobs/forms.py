@@ -1,12 +1,13 @@
 from django import forms
 from django.utils import timezone
 from .models import Job, Application 
+from .lifecycle import ACTIONS, JOB_STATUSES
 
 # job lsiting form using model form
 class JobForm(forms.ModelForm):
     class Meta:
         model = Job
-        exclude = ['posted_by', 'date_posted', 'is_active']
+        exclude = ['posted_by', 'date_posted', 'is_active', 'application_count', 'last_applied_at', 'external_ref']
         widgets = {
             "description": forms.Textarea(attrs={'rows':4}),
             "requirements": forms.Textarea(attrs={'rows':4}),\
@@ -21,9 +22,55 @@ class JobForm(forms.ModelForm):
         
 # application form for applicant
 class ApplicantForm(forms.ModelForm):
+    use_profile_resume = forms.BooleanField(
+        required=False,
+        label="Use the resume from my profile",
+        help_text="Attach the resume already on your profile instead of uploading one.",
+    )
+
     class Meta:
         model = Application
-        exclude = ['applicant', 'job', 'date_applied']
+        exclude = ['applicant', 'job', 'date_applied', 'match_score']
         widgets = {
             "cover_letter": forms.Textarea(attrs={'rows':4}),
-        }
\ No newline at end of file
+        }
+
+    def __init__(self, *args, profile_resume=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if profile_resume:
+            # Reusing the stored resume means nothing to upload (see jobs.resumes)
+            self.fields['use_profile_resume'].initial = True
+            self.fields['resume'].required = False
+        else:
+            del self.fields['use_profile_resume']
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('use_profile_resume'):
+            cleaned_data['resume'] = None  # keep any file that came along out of storage
+        elif 'use_profile_resume' in self.fields and not cleaned_data.get('resume') and 'resume' not in self.errors:
+            self.add_error('resume', "Upload a resume or use the one from your profile.")
+        return cleaned_data
+
+# bulk upload form for employers
+class JobImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV with a header row, or JSON Lines (.jsonl) with one job per line.")
+    upsert = forms.BooleanField(
+        required=False,
+        label="Update existing jobs",
+        help_text="Rows whose external_ref matches one of your jobs update it instead of adding a new one.",
+    )
+
+
+# bulk action form for an employer's posted jobs
+class BulkJobActionForm(forms.Form):
+    action = forms.ChoiceField(choices=ACTIONS)
+    days = forms.IntegerField(min_value=1, max_value=365, required=False, help_text="Days to extend deadlines by.")
+    select_all = forms.BooleanField(required=False)  # act on every job matching `status` instead of `job_ids`
+    status = forms.ChoiceField(choices=[("", "All")] + JOB_STATUSES, required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("action") == "extend" and not cleaned_data.get("days"):
+            self.add_error("days", "Enter how many days to extend the deadlines by.")
+        return cleaned_data
@@ -0,0 +1,141 @@
+"""
+Cached HTML fragments of the job list.
+
+The search form (with its facet counts), the result cards and the
+pagination of `JobListView` only depend on the query string, so they are
+rendered once per distinct set of filter parameters and served from the
+cache after that. The page around them (navbar, messages, the save-search
+button) is still rendered per request, so signed-in users keep their own
+chrome.
+
+Keys embed the jobs version (see jobs.changes), read from the database on
+each request. Any Job save, delete or bulk change therefore retires every
+cached fragment at once, in every process, without scanning or deleting
+keys; the old entries simply age out.
+
+Hits and misses are counted in process and added to shared counters in the
+cache every hundred lookups or thirty seconds (like the detail page views,
+see jobs.rollups), so with the shared cache backend from settings all
+processes report together without a cache write per request.
+The `job_list_cache_stats` command prints them.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+
+from .changes import jobs_version, version_token
+
+STATS_KEYS = {"hits": "job-list-cache:hits", "misses": "job-list-cache:misses"}
+
+FRAGMENT_CACHE_TIMEOUT = 300  # seconds
+
+# Query string parameters the fragment depends on; anything else is ignored
+FRAGMENT_PARAMS = (
+    "q",
+    "exact",
+    "job_type",
+    "industry",
+    "experience_level",
+    "min_salary",
+    "max_salary",
+    "currency",
+    "near",
+    "radius",
+    "page",
+    "cursor",
+)
+
+
+def _incr(key, delta=1):
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Missing (first use or evicted); a racing add() just loses one batch
+        cache.add(key, delta, None)
+        return delta
+
+
+class FragmentStats:
+    """
+    In-process buffer of fragment hits and misses, flushed to the shared counters.
+    """
+
+    def __init__(self, flush_every=100, flush_interval=30):
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    def record(self, outcome):
+        with self._lock:
+            self._pending[outcome] += 1
+            due = (
+                sum(self._pending.values()) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        for outcome, n in pending.items():
+            _incr(STATS_KEYS[outcome], n)
+
+
+fragment_stats = FragmentStats()
+
+
+def fragment_etag(key):
+    """
+    ETag for a page built around the fragment stored under `key`.
+    """
+    return f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+
+def fragment_cache_key(query, version=None):
+    """
+    Cache key for the fragment of a job list query string (a QueryDict).
+
+    `version` is the current jobs_version(), read when not given. Values are whitespace-normalized but otherwise kept as typed, since the
+    form inside the fragment echoes them back.
+    """
+    # A present but empty parameter can still matter (?page= switches to numbered pages)
+    params = {name: " ".join(query[name].split()) for name in FRAGMENT_PARAMS if name in query}
+    payload = json.dumps(params, sort_keys=True)
+    digest = hashlib.md5(payload.encode()).hexdigest()
+    return f"job-list:{version_token(version or jobs_version())}:{digest}"
+
+
+def get_fragment(key):
+    """
+    Return the cached fragment entry for `key` (or None), counting the hit or miss.
+    """
+    entry = cache.get(key)
+    fragment_stats.record("misses" if entry is None else "hits")
+    return entry
+
+
+def set_fragment(key, entry):
+    cache.set(key, entry, FRAGMENT_CACHE_TIMEOUT)
+
+
+def cache_stats():
+    """
+    Return {"hits", "misses", "hit_rate"} flushed by all processes since the last reset.
+    """
+    counts = cache.get_many(list(STATS_KEYS.values()))
+    stats = {name: counts.get(key, 0) for name, key in STATS_KEYS.items()}
+    total = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / total if total else None
+    return stats
+
+
+def reset_stats():
+    cache.delete_many(list(STATS_KEYS.values()))
@@ -0,0 +1,106 @@
+"""
+Typo-tolerant matching of search terms against the words used in jobs.
+
+Words are broken into character trigrams ("devloper" -> "  d", " de", "dev",
+"evl", ...) and kept in an inverted index from trigram to words. Looking up
+a misspelled term only touches the words that share a trigram with it, and
+each candidate is scored by trigram similarity (shared / total distinct
+trigrams, as PostgreSQL's pg_trgm does), so lookups scale with the
+vocabulary around the term, not with the number of jobs.
+"""
+import bisect
+import heapq
+from collections import Counter, defaultdict
+
+# Below this similarity two words are unrelated (pg_trgm's default)
+SIMILARITY_THRESHOLD = 0.3
+
+# Shorter words have too few trigrams to correct reliably
+MIN_WORD_LENGTH = 3
+
+
+def trigrams(word):
+    """
+    Return the set of trigrams of a word, padded so its start and end count.
+    """
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    A vocabulary of words with usage counts, searchable by trigram similarity.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(set)  # trigram -> words
+        self.counts = {}  # word -> number of uses
+        self.sizes = {}  # word -> number of distinct trigrams
+        self.sorted_words = []  # for prefix checks
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, word):
+        if word in self.counts:
+            self.counts[word] += 1
+            return
+        self.counts[word] = 1
+        bisect.insort(self.sorted_words, word)
+        word_trigrams = trigrams(word)
+        self.sizes[word] = len(word_trigrams)
+        for trigram in word_trigrams:
+            self.postings[trigram].add(word)
+
+    def discard(self, word):
+        if word not in self.counts:
+            return
+        self.counts[word] -= 1
+        if self.counts[word] > 0:
+            return
+        del self.counts[word], self.sizes[word]
+        del self.sorted_words[bisect.bisect_left(self.sorted_words, word)]
+        for trigram in trigrams(word):
+            posting = self.postings[trigram]
+            posting.discard(word)
+            if not posting:
+                del self.postings[trigram]
+
+    def load(self, words):
+        """
+        Bulk-load words; sorting once beats inserting one at a time.
+        """
+        for word, count in Counter(words).items():
+            self.counts[word] = self.counts.get(word, 0) + count
+        self.sorted_words = sorted(self.counts)
+        for word in self.sorted_words:
+            word_trigrams = trigrams(word)
+            self.sizes[word] = len(word_trigrams)
+            for trigram in word_trigrams:
+                self.postings[trigram].add(word)
+
+    def has_prefix(self, prefix):
+        """
+        Return True if any word starts with `prefix`.
+        """
+        position = bisect.bisect_left(self.sorted_words, prefix)
+        return position < len(self.sorted_words) and self.sorted_words[position].startswith(prefix)
+
+    def similar(self, word, limit=3, threshold=SIMILARITY_THRESHOLD):
+        """
+        Return [(word, similarity), ...] for the closest words, best first.
+
+        Ties are broken by how often each word is used.
+        """
+        query = trigrams(word)
+        shared = Counter()
+        for trigram in query:
+            shared.update(self.postings.get(trigram, ()))
+
+        scored = []
+        for candidate, common in shared.items():
+            # |A ∪ B| = |A| + |B| - |A ∩ B|
+            score = common / (len(query) + self.sizes[candidate] - common)
+            if score >= threshold:
+                scored.append((score, self.counts[candidate], candidate))
+        return [(candidate, score) for score, _, candidate in heapq.nlargest(limit, scored)]
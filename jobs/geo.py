@@ -0,0 +1,194 @@
+"""
+Offline geocoding and radius search for job locations.
+
+Free-text locations ("Gulshan, Dhaka", "Chattogram / Remote") are resolved
+against a bundled gazetteer (`settings.JOB_GAZETTEER`, a CSV of place names,
+aliases and coordinates) without any network calls, and `Job.save()` stores
+the result in `latitude`/`longitude`.
+
+Radius queries first narrow jobs to the bounding box around the centre, a
+plain range filter served by the (latitude, longitude) partial index, and
+only compute the exact great-circle distance for the jobs inside it.
+
+Jobs written in bulk go through `Job.set_derived_fields()` explicitly; after
+editing the gazetteer, rerun the `geocode_jobs` command.
+"""
+import csv
+import functools
+import math
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models import FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+from .lifecycle import bulk_update_jobs
+from .models import Job
+
+# Job fields the coordinates are derived from
+LOCATION_FIELDS = {"location"}
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Kilometres per degree of latitude (and of longitude at the equator)
+KM_PER_DEGREE = 111.195
+
+# Radius search bounds, in kilometres
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 500
+
+# Longest run of words tried as a place name inside a location
+MAX_NAME_WORDS = 3
+
+Place = namedtuple("Place", ["name", "country", "latitude", "longitude"])
+
+PART_SEPARATORS_RE = re.compile(r"[,;/|()]|\s-\s")
+NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(name):
+    return NON_WORD_RE.sub(" ", (name or "").lower()).strip()
+
+
+@functools.lru_cache(maxsize=4)
+def load_gazetteer(path):
+    """
+    Return {normalized name or alias: Place} from a gazetteer CSV.
+    """
+    places = {}
+    with open(path, encoding="utf-8", newline="") as gazetteer:
+        for row in csv.DictReader(gazetteer):
+            place = Place(row["name"], row["country"], float(row["latitude"]), float(row["longitude"]))
+            for name in [row["name"], *(row["aliases"] or "").split("|")]:
+                key = normalize(name)
+                if key:
+                    # First entry wins, so list the better-known place first
+                    places.setdefault(key, place)
+    return places
+
+
+def gazetteer():
+    return load_gazetteer(str(settings.JOB_GAZETTEER))
+
+
+def geocode(location):
+    """
+    Return the Place a free-text location refers to, or None.
+
+    Each comma/slash separated part is looked up whole, most specific
+    (leftmost) first; failing that, the longest run of words that names a
+    place wins ("Senior role in Dhaka city centre" -> Dhaka).
+    """
+    places = gazetteer()
+    parts = [normalize(part) for part in PART_SEPARATORS_RE.split(location or "")]
+    for part in parts:
+        if part in places:
+            return places[part]
+
+    for part in parts:
+        words = part.split()
+        for size in range(min(MAX_NAME_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                place = places.get(" ".join(words[start:start + size]))
+                if place is not None:
+                    return place
+    return None
+
+
+def haversine(latitude1, longitude1, latitude2, longitude2):
+    """
+    Great-circle distance between two points, in kilometres.
+    """
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    half_dphi = math.radians(latitude2 - latitude1) / 2
+    half_dlambda = math.radians(longitude2 - longitude1) / 2
+    a = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Return (min_lat, max_lat, min_lon, max_lon) enclosing every point within `radius_km`.
+
+    The longitude bounds are None when the box reaches a pole or crosses the
+    antimeridian; only the latitude range narrows the search then.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+    # A circle's widest longitude span is at the latitude nearest a pole
+    delta_lon = radius_km / (KM_PER_DEGREE * math.cos(math.radians(max(abs(min_lat), abs(max_lat)))))
+    min_lon, max_lon = longitude - delta_lon, longitude + delta_lon
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def distance_expression(latitude, longitude):
+    """
+    SQL expression for the haversine distance (km) from a point to each job.
+    """
+    phi = Radians("latitude")
+    half_dphi = (phi - Value(math.radians(latitude))) / 2
+    half_dlambda = (Radians("longitude") - Value(math.radians(longitude))) / 2
+    a = Power(Sin(half_dphi), 2) + Value(math.cos(math.radians(latitude))) * Cos(phi) * Power(Sin(half_dlambda), 2)
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a), output_field=FloatField())
+
+
+def within_radius(queryset, place, radius_km):
+    """
+    Restrict jobs to those within `radius_km` of a place, annotated with `distance` (km).
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(place.latitude, place.longitude, radius_km)
+    queryset = queryset.filter(latitude__range=(min_lat, max_lat))
+    if min_lon is not None:
+        queryset = queryset.filter(longitude__range=(min_lon, max_lon))
+    return queryset.annotate(distance=distance_expression(place.latitude, place.longitude)).filter(
+        distance__lte=radius_km
+    )
+
+
+def changed_coordinates(job_model, batch_size=1000):
+    """
+    Recompute latitude/longitude for every job, in pk batches, yielding the
+    jobs of each batch whose coordinates changed (with the new ones set).
+
+    Takes the Job model as an argument so migrations can pass their
+    historical model.
+    """
+    last_pk = 0
+    while True:
+        jobs = list(
+            job_model.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", "posted_by_id", "location", "latitude", "longitude")[:batch_size]
+        )
+        if not jobs:
+            return
+        updates = []
+        for job in jobs:
+            place = geocode(job.location)
+            coordinates = (place.latitude, place.longitude) if place else (None, None)
+            if coordinates != (job.latitude, job.longitude):
+                job.latitude, job.longitude = coordinates
+                updates.append(job)
+        if updates:
+            yield updates
+        last_pk = jobs[-1].pk
+
+
+def backfill_coordinates(batch_size=1000):
+    """
+    Save the recomputed coordinates of every job.
+
+    Changed jobs get a new `updated_at` and go out in `jobs_bulk_changed`,
+    so cached listings and stats see them. Returns the number of jobs whose
+    coordinates changed.
+    """
+    changed = 0
+    for jobs in changed_coordinates(Job, batch_size):
+        bulk_update_jobs(jobs, ["latitude", "longitude"])
+        changed += len(jobs)
+    return changed
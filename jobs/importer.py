@@ -0,0 +1,260 @@
+"""
+Bulk job import from CSV or JSON Lines.
+
+Rows are streamed from the input one at a time, validated with `JobForm`
+(the same rules as posting a job by hand, deadline check included) and
+written with `bulk_create` in batches, one transaction per batch, so memory
+use is bounded by the batch size rather than the file size. Invalid rows are
+reported with their line number and skipped; they never abort the import.
+
+In upsert mode every row carries an `external_ref`, the employer's own id
+for the posting. Rows whose reference already exists for the employer update
+that job in place instead of creating a new one.
+
+Bulk writes bypass the per-instance model signals, so each batch sends
+`jobs_bulk_changed` to keep the search index and cached stats in step.
+
+Uploads larger than INLINE_IMPORT_MAX_BYTES are not imported during the
+request: `queue_import()` stores the file and the `import_jobs_file` task
+imports it in the worker, then notifies the employer with the counts.
+"""
+import csv
+import io
+import json
+import uuid
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+
+from .forms import JobForm
+from .models import Job
+from .signals import jobs_bulk_changed
+
+FORMATS = ("csv", "jsonl")
+
+# Only the first errors are kept with their details; the rest are counted
+MAX_REPORTED_ERRORS = 1000
+
+# Uploads up to this size are imported during the request, larger ones by the worker
+INLINE_IMPORT_MAX_BYTES = 256 * 1024
+
+# Storage directory of uploads waiting for the worker
+IMPORT_UPLOAD_DIR = "imports"
+
+EXTERNAL_REF_MAX_LENGTH = Job._meta.get_field("external_ref").max_length
+
+
+def guess_format(filename):
+    """
+    Return the import format implied by a file name ("csv" unless it looks like JSON Lines).
+    """
+    return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def read_rows(stream, format="csv"):
+    """
+    Yield (line_number, row) for each record in a text stream.
+
+    `row` is a dict of field values, or None when a JSON line can't be
+    parsed into an object. Blank JSON lines are skipped.
+    """
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+class ImportResult:
+    """
+    Counts and per-row errors from an import run.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []  # [(line_number, message), ...], capped at MAX_REPORTED_ERRORS
+
+    def add_error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_number, message))
+
+
+class JobImporter:
+    """
+    Validates rows and writes them as jobs posted by `posted_by`.
+    """
+
+    def __init__(self, posted_by, batch_size=1000, upsert=False):
+        self.posted_by = posted_by
+        self.batch_size = batch_size
+        self.upsert = upsert
+        # Form fields are the columns an import may set; missing ones fall
+        # back to the same defaults the job form starts with
+        self.fields = list(JobForm.base_fields)
+        self.defaults = {
+            name: field.initial for name, field in JobForm.base_fields.items() if field.initial is not None
+        }
+
+    def run(self, rows):
+        """
+        Import (line_number, row) pairs as produced by `read_rows()`.
+        """
+        result = ImportResult()
+        batch = {}
+        for line_number, row in rows:
+            job = self.build_job(line_number, row, result)
+            if job is None:
+                continue
+            # A later row with the same reference replaces an earlier one in
+            # upsert mode and is rejected otherwise (see write_batch)
+            key = job.external_ref or line_number
+            if key in batch and not self.upsert:
+                result.add_error(line_number, "external_ref: Duplicate of an earlier row.")
+                continue
+            batch[key] = (line_number, job)
+            if len(batch) >= self.batch_size:
+                self.write_batch(list(batch.values()), result)
+                batch = {}
+        if batch:
+            self.write_batch(list(batch.values()), result)
+        return result
+
+    def build_job(self, line_number, row, result):
+        """
+        Validate one row, returning an unsaved Job or None (after recording the error).
+        """
+        if row is None:
+            result.add_error(line_number, "Not a valid JSON object.")
+            return None
+
+        external_ref = str(row.get("external_ref") or "").strip()
+        if self.upsert and not external_ref:
+            result.add_error(line_number, "external_ref: This field is required when updating existing jobs.")
+            return None
+        if len(external_ref) > EXTERNAL_REF_MAX_LENGTH:
+            result.add_error(
+                line_number, f"external_ref: Ensure this value has at most {EXTERNAL_REF_MAX_LENGTH} characters."
+            )
+            return None
+
+        data = dict(self.defaults)
+        data.update((name, value) for name, value in row.items() if name in self.fields and value not in (None, ""))
+        form = JobForm(data, instance=Job())
+        if not form.is_valid():
+            result.add_error(
+                line_number,
+                "; ".join(f"{name}: {' '.join(errors)}" for name, errors in form.errors.items()),
+            )
+            return None
+
+        job = form.instance
+        job.posted_by = self.posted_by
+        job.external_ref = external_ref
+        # bulk_create skips Job.save(), which normally does this
+        job.set_derived_fields()
+        return job
+
+    def write_batch(self, rows, result):
+        """
+        Write a batch of validated (line_number, job) rows in one transaction.
+
+        In upsert mode jobs whose reference already exists are updated;
+        otherwise those rows are reported as duplicates and skipped.
+        """
+        with transaction.atomic():
+            references = [job.external_ref for _, job in rows if job.external_ref]
+            existing = dict(
+                Job.objects.filter(posted_by=self.posted_by, external_ref__in=references).values_list(
+                    "external_ref", "pk"
+                )
+            ) if references else {}
+
+            jobs = []
+            for line_number, job in rows:
+                if job.external_ref in existing and not self.upsert:
+                    result.add_error(line_number, "external_ref: You already have a job with this reference.")
+                    continue
+                job.pk = existing.get(job.external_ref)
+                jobs.append(job)
+
+            if self.upsert:
+                # Rows with a pk become INSERT ... ON CONFLICT (id) DO UPDATE of the
+                # form fields only, so counters and the posting date are kept
+                update_fields = self.fields + Job.DERIVED_FIELDS + ["updated_at"]
+                Job.objects.bulk_create(
+                    jobs,
+                    update_conflicts=True,
+                    unique_fields=["pk"],
+                    update_fields=[name for name in update_fields if name not in Job.COUNTER_FIELDS],
+                )
+            else:
+                Job.objects.bulk_create(jobs)
+            jobs_bulk_changed.send(sender=Job, job_ids=[job.pk for job in jobs], posted_by_ids={self.posted_by.pk})
+
+        updated = sum(1 for job in jobs if job.external_ref in existing)
+        result.created += len(jobs) - updated
+        result.updated += updated
+
+
+def import_jobs(stream, posted_by, format="csv", batch_size=1000, upsert=False):
+    """
+    Import jobs from a CSV or JSON Lines text stream. Returns an ImportResult.
+    """
+    return JobImporter(posted_by, batch_size=batch_size, upsert=upsert).run(read_rows(stream, format))
+
+
+def open_upload(file):
+    """
+    Decode an uploaded or stored file as a text stream, without reading it into memory whole.
+    """
+    return io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def queue_import(upload, posted_by, upsert=False):
+    """
+    Store an upload and have the worker import it (see jobs.tasks.import_jobs_file).
+    """
+    from outbox.registry import enqueue
+
+    from .tasks import import_jobs_file
+
+    format = guess_format(upload.name)
+    name = default_storage.save(f"{IMPORT_UPLOAD_DIR}/{uuid.uuid4().hex}.{format}", upload)
+    return enqueue(
+        import_jobs_file,
+        name=name, filename=upload.name, posted_by_id=posted_by.pk, format=format, upsert=upsert,
+    )
+
+
+def import_stored_file(name, filename, posted_by, format="csv", upsert=False):
+    """
+    Import a file stored by `queue_import()`, remove it and notify the employer.
+
+    Returns the ImportResult, or None if the file is gone (already imported).
+    """
+    from notifications.digests import notify
+
+    if not default_storage.exists(name):
+        return None
+    with default_storage.open(name, "rb") as file:
+        result = import_jobs(open_upload(file), posted_by, format, upsert=upsert)
+    default_storage.delete(name)
+
+    message = f"{filename}: {result.created} new and {result.updated} updated job(s)"
+    if result.error_count:
+        message += f", {result.error_count} row(s) skipped"
+    notify(posted_by.pk, "job_import", message, url=reverse("my-posted-jobs"))
+    return result
@@ -0,0 +1,285 @@
+"""
+Keeping the in-memory job indexes (recommendations, search suggestions) current.
+
+Each process holds its own copy of an index, but requests never build one
+and never touch the database for it:
+
+- `build_snapshots()` (the periodic `build_job_indexes` task, or the command
+  of the same name) builds every index from the database and pickles it
+  into `settings.JOB_INDEX_DIR`.
+- `refresh_snapshots()` (the periodic `refresh_job_indexes` task) compares
+  the worker's copy with the jobs version (see jobs.changes). When the
+  version moved, jobs updated since the copy's version (less CATCH_UP_GRACE,
+  for transactions that committed out of order) are re-read and applied one
+  by one; if the active job count then disagrees with the copy, the ids
+  missing from the database are dropped. The caught-up copy replaces the
+  snapshot.
+- Request processes load the latest snapshot, and check at most every
+  SNAPSHOT_CHECK_INTERVAL seconds whether a newer one was written. Without
+  a snapshot they queue a build for the worker and serve an empty index
+  meanwhile.
+
+A lookup therefore costs no query; changes show up within
+JOB_INDEX_REFRESH_INTERVAL plus SNAPSHOT_CHECK_INTERVAL seconds, in every
+process, without signals having to reach them.
+"""
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .changes import jobs_version
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Changes this much older than an index's version are re-read when catching up
+CATCH_UP_GRACE = timedelta(minutes=1)
+
+# A queued build is not queued again for this long (seconds)
+BUILD_QUEUED_KEY = "job-indexes:build-queued"
+BUILD_QUEUED_TIMEOUT = 10 * 60
+
+# Request processes look for a newer snapshot at most this often (seconds)
+SNAPSHOT_CHECK_INTERVAL = 5
+
+
+class LiveIndex:
+    """
+    Base class of an in-memory index over active jobs that can catch up with changes.
+
+    Subclasses name the Job `fields` they read and implement `add()`,
+    `remove()` and `job_ids()`; `load()` may be overridden to bulk-load.
+    """
+    name = None  # Snapshot file name
+    fields = ()
+
+    def __init__(self):
+        self.version = None  # The jobs version the index reflects
+
+    def add(self, job_id, values):
+        raise NotImplementedError
+
+    def remove(self, job_id):
+        raise NotImplementedError
+
+    def job_ids(self):
+        """
+        The ids of the jobs in the index.
+        """
+        raise NotImplementedError
+
+    def load(self, rows):
+        """
+        Add (job_id, values) rows to an empty index.
+        """
+        for job_id, values in rows:
+            self.add(job_id, values)
+
+    def build(self):
+        """
+        Load every active job from the database.
+        """
+        # Read first: changes made while loading are picked up by the next catch-up
+        version = jobs_version()
+        rows = (
+            Job.objects.filter(is_active=True)
+            .values_list("pk", *self.fields)
+            .iterator(chunk_size=2000)
+        )
+        self.load((row[0], row[1:]) for row in rows)
+        self.version = version
+
+    def catch_up(self, version):
+        """
+        Apply the job changes made since the index's version.
+        """
+        changed_at, _ = self.version
+        changed = Job.objects.all()
+        if changed_at is not None:
+            changed = changed.filter(updated_at__gte=changed_at - CATCH_UP_GRACE)
+        for job_id, is_active, *values in changed.values_list("pk", "is_active", *self.fields).iterator():
+            if is_active:
+                self.add(job_id, tuple(values))
+            else:
+                self.remove(job_id)
+
+        active = Job.objects.filter(is_active=True)
+        if active.count() != len(self.job_ids()):
+            # Jobs were deleted
+            for job_id in set(self.job_ids()) - set(active.values_list("pk", flat=True)):
+                self.remove(job_id)
+        self.version = version
+
+
+def snapshot_path(name):
+    return os.path.join(settings.JOB_INDEX_DIR, f"{name}.pickle")
+
+
+def write_snapshot(index):
+    """
+    Atomically replace the snapshot of `index`.
+    """
+    os.makedirs(settings.JOB_INDEX_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=settings.JOB_INDEX_DIR, delete=False) as tmp:
+        pickle.dump(index, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp.name, snapshot_path(index.name))
+
+
+def snapshot_stamp(name):
+    """
+    Return what identifies the current snapshot written under `name`, or None.
+    """
+    try:
+        stat = os.stat(snapshot_path(name))
+    except FileNotFoundError:
+        return None
+    # Snapshots are replaced, never rewritten in place
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def read_snapshot(name):
+    """
+    Return the index pickled under `name`, or None.
+    """
+    try:
+        with open(snapshot_path(name), "rb") as snapshot:
+            return pickle.load(snapshot)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.exception(f"Unreadable {name} index snapshot")
+        return None
+
+
+def queue_build():
+    """
+    Have the worker build the snapshots, unless that was asked for recently.
+    """
+    from outbox.registry import enqueue
+
+    from .tasks import build_job_indexes
+
+    if cache.add(BUILD_QUEUED_KEY, 1, BUILD_QUEUED_TIMEOUT):
+        enqueue(build_job_indexes)
+
+
+class IndexHolder:
+    """
+    This process's copy of one LiveIndex subclass.
+    """
+
+    def __init__(self, index_class):
+        self.index_class = index_class
+        self._index = None
+        self._stamp = None  # The snapshot the copy was loaded from or written to
+        self._snapshot_version = None  # And the jobs version it holds
+        self._next_check = 0
+        self._lock = threading.Lock()
+
+    def get(self, build=False):
+        """
+        Return the index.
+
+        Requests get the latest snapshot without querying the database (an
+        empty index and a queued build without one). The worker (`build`)
+        builds the index if needed and brings it up to date with the database.
+        """
+        with self._lock:
+            if build:
+                return self._catch_up()
+            now = time.monotonic()
+            if now >= self._next_check:
+                self._next_check = now + SNAPSHOT_CHECK_INTERVAL
+                self._load_snapshot()
+                if self._index is None:
+                    queue_build()
+            return self._index if self._index is not None else self.index_class()
+
+    def _load_snapshot(self):
+        stamp = snapshot_stamp(self.index_class.name)
+        if stamp is not None and stamp != self._stamp:
+            index = read_snapshot(self.index_class.name)
+            if index is not None:
+                self._index, self._stamp, self._snapshot_version = index, stamp, index.version
+
+    def _catch_up(self):
+        if self._index is None:
+            self._load_snapshot()
+        if self._index is None:
+            self._index = self.index_class()
+            self._index.build()
+        version = jobs_version()
+        if self._index.version != version:
+            self._index.catch_up(version)
+        return self._index
+
+    def _write_snapshot(self):
+        write_snapshot(self._index)
+        self._stamp = snapshot_stamp(self.index_class.name)
+        self._snapshot_version = self._index.version
+
+    def build_snapshot(self):
+        """
+        Build a fresh index from the database, snapshot it and use it here.
+        """
+        index = self.index_class()
+        index.build()
+        with self._lock:
+            self._index = index
+            self._write_snapshot()
+        return index
+
+    def refresh_snapshot(self):
+        """
+        Bring this process's copy up to date with the database and snapshot
+        it if it changed. Returns whether it did.
+        """
+        with self._lock:
+            index = self._catch_up()
+            if self._stamp is not None and index.version == self._snapshot_version:
+                return False
+            self._write_snapshot()
+            return True
+
+    def reset(self):
+        """
+        Forget this process's copy (the snapshot is kept).
+        """
+        with self._lock:
+            self._index = None
+            self._stamp = self._snapshot_version = None
+            self._next_check = 0
+
+
+def build_snapshots():
+    """
+    Rebuild and snapshot every job index. Returns {name: number of jobs}.
+    """
+    from . import autocomplete, recommendations
+
+    sizes = {}
+    for holder in (recommendations.index_holder, autocomplete.index_holder):
+        sizes[holder.index_class.name] = len(holder.build_snapshot().job_ids())
+    cache.delete(BUILD_QUEUED_KEY)
+    return sizes
+
+
+def refresh_snapshots():
+    """
+    Catch every job index up with the database and snapshot the ones that
+    changed. Returns their names.
+    """
+    from . import autocomplete, recommendations
+
+    return [
+        holder.index_class.name
+        for holder in (recommendations.index_holder, autocomplete.index_holder)
+        if holder.refresh_snapshot()
+    ]
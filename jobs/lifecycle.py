@@ -0,0 +1,178 @@
+"""
+Set-based lifecycle actions on an employer's jobs.
+
+Closing, reopening and extending run as a single UPDATE over an
+ownership-scoped queryset instead of loading and saving jobs one at a time,
+then send one `jobs_bulk_changed` signal so the search index and cached
+stats catch up.
+
+Expired postings are closed by `expire_jobs()` (the `expire_jobs` command,
+or the periodic task the outbox worker runs every
+`settings.JOB_EXPIRY_SWEEP_INTERVAL` seconds), so listings only ever need to
+filter on `is_active`.
+
+Deleting goes through `QuerySet.delete()`, so the delete signals of jobs
+and their applications release resumes and keep counters, rollups, stats
+and the search index in step. Since Django's delete collector loads the
+rows it signals for, large deletes are chunked: applications first, then
+the jobs, at most `chunk_size` rows per transaction, which also keeps
+SQLite's write lock short.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Application, Job
+from .signals import jobs_bulk_changed
+
+# Status filter for an employer's job list -> label
+JOB_STATUSES = [
+    ("active", "Active"),
+    ("expired", "Active, past deadline"),
+    ("closed", "Closed"),
+]
+
+ACTIONS = [
+    ("deactivate", "Close"),
+    ("reactivate", "Reopen"),
+    ("extend", "Extend deadline"),
+    ("delete", "Delete"),
+]
+
+# Rows deleted per transaction when chunking large deletes
+DELETE_CHUNK_SIZE = 500
+
+# Jobs closed per transaction by the expiry sweeper
+EXPIRE_BATCH_SIZE = 500
+
+
+def filter_by_status(queryset, status):
+    """
+    Restrict jobs to one of JOB_STATUSES (anything else leaves them all).
+    """
+    if status == "active":
+        return queryset.filter(is_active=True)
+    if status == "expired":
+        return queryset.filter(is_active=True, application_deadline__lt=timezone.now())
+    if status == "closed":
+        return queryset.filter(is_active=False)
+    return queryset
+
+
+def _affected(queryset):
+    rows = list(queryset.values_list("pk", "posted_by_id"))
+    return [pk for pk, _ in rows], {posted_by_id for _, posted_by_id in rows}
+
+
+def _update(queryset, **values):
+    # QuerySet.update() skips auto_now; the detail page's validators depend on it
+    values.setdefault("updated_at", timezone.now())
+    with transaction.atomic():
+        job_ids, posted_by_ids = _affected(queryset)
+        updated = queryset.update(**values)
+        jobs_bulk_changed.send(
+            sender=Job, job_ids=job_ids, posted_by_ids=posted_by_ids, update_fields=list(values)
+        )
+    return updated
+
+
+def bulk_update_jobs(jobs, fields):
+    """
+    Save `fields` of the loaded `jobs` in one bulk UPDATE, moving their
+    `updated_at` and sending `jobs_bulk_changed`, for backfills of derived fields.
+    """
+    # bulk_update() skips auto_now too
+    now = timezone.now()
+    for job in jobs:
+        job.updated_at = now
+    fields = [*fields, "updated_at"]
+    with transaction.atomic():
+        Job.objects.bulk_update(jobs, fields)
+        jobs_bulk_changed.send(
+            sender=Job,
+            job_ids=[job.pk for job in jobs],
+            posted_by_ids={job.posted_by_id for job in jobs},
+            update_fields=fields,
+        )
+
+
+def deactivate_jobs(queryset):
+    """
+    Close the jobs to new applications. Returns the number of jobs changed.
+    """
+    return _update(queryset.filter(is_active=True), is_active=False)
+
+
+def reactivate_jobs(queryset):
+    """
+    Reopen closed jobs. Returns the number of jobs changed.
+    """
+    return _update(queryset.filter(is_active=False), is_active=True)
+
+
+def extend_deadlines(queryset, days):
+    """
+    Push application deadlines back by `days`; jobs without one are left alone.
+    """
+    return _update(
+        queryset.filter(application_deadline__isnull=False),
+        application_deadline=F("application_deadline") + timedelta(days=days),
+    )
+
+
+def expire_jobs(batch_size=EXPIRE_BATCH_SIZE, now=None):
+    """
+    Close every active job whose application deadline has passed.
+
+    Works in batches of `batch_size` jobs read in deadline order from the
+    (active, deadline) partial index, one UPDATE and one jobs_bulk_changed
+    signal per batch. Returns the number of jobs closed.
+    """
+    now = now or timezone.now()
+    expired = Job.objects.filter(is_active=True, application_deadline__lt=now).order_by("application_deadline")
+    closed = 0
+    while True:
+        job_ids = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not job_ids:
+            return closed
+        closed += deactivate_jobs(Job.objects.filter(pk__in=job_ids))
+
+
+def _delete(queryset):
+    """
+    Delete the jobs with their dependents. Returns the number of jobs deleted.
+    """
+    return queryset.delete()[1].get(Job._meta.label, 0)
+
+
+def delete_jobs(queryset, chunk_size=None):
+    """
+    Delete the jobs and every row that cascades from them.
+
+    Without `chunk_size` everything goes in one transaction. With it, the
+    applications and then the jobs are deleted at most `chunk_size` rows
+    per transaction; an interrupted run leaves some jobs fully deleted and
+    the rest intact (possibly minus some applications).
+    Returns the number of jobs deleted.
+    """
+    if chunk_size is None:
+        with transaction.atomic():
+            return _delete(queryset)
+
+    job_ids = list(queryset.values_list("pk", flat=True))
+    deleted = 0
+    for start in range(0, len(job_ids), chunk_size):
+        chunk = job_ids[start:start + chunk_size]
+        applications = Application.objects.filter(job_id__in=chunk)
+        while True:
+            pks = list(applications.values_list("pk", flat=True)[:chunk_size])
+            if not pks:
+                break
+            with transaction.atomic():
+                Application.objects.filter(pk__in=pks).delete()
+        with transaction.atomic():
+            # Re-apply the ownership scope in case the queryset's rows changed
+            deleted += _delete(queryset.filter(pk__in=chunk))
+    return deleted
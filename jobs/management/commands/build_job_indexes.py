@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from jobs.indexes import build_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuild the snapshots of the in-memory job indexes (see jobs.indexes)."
+
+    def handle(self, *args, **options):
+        sizes = build_snapshots()
+        summary = ", ".join(f"{name}: {size} job(s)" for name, size in sizes.items())
+        self.stdout.write(self.style.SUCCESS(f"Index snapshots rebuilt ({summary})."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from jobs.similar import SIMILAR_JOBS_PER_JOB, build_similar_jobs
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed similar jobs shown on job detail pages (run periodically)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--k", type=int, default=SIMILAR_JOBS_PER_JOB, help="Neighbours kept per job.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Jobs whose neighbours are replaced per transaction.")
+
+    def handle(self, *args, **options):
+        written = build_similar_jobs(k=options["k"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Stored {written} similar job link(s)."))
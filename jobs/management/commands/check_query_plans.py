@@ -0,0 +1,94 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from datetime import timedelta
+
+from jobs.geo import Place, within_radius
+from jobs.models import APPLICANT_RANK, Job, Application
+from users.models import Profile
+
+# "SCAN jobs_job" (or "SCAN TABLE jobs_job" on older SQLite) with no index
+FULL_SCAN_RE = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+
+def canonical_queries():
+    """
+    The hot queries each view runs, keyed by a readable label.
+
+    They mirror the view code with placeholder ids; the plan doesn't depend
+    on the rows existing.
+    """
+    user_id = 0
+    week_ago = timezone.now() - timedelta(days=7)
+    active_jobs = Job.objects.filter(is_active=True)
+    employer_applications = Application.objects.filter(job__posted_by_id=user_id)
+    seeker_applications = Application.objects.filter(applicant_id=user_id)
+
+    return {
+        "job list": active_jobs.order_by("-date_posted", "-id")[:11],
+        "job list by job type": active_jobs.filter(job_type="remote").order_by("-date_posted", "-id")[:11],
+        "job list by industry": active_jobs.filter(industry="tech").order_by("-date_posted", "-id")[:11],
+        "job list by experience": active_jobs.filter(experience_level="mid").order_by("-date_posted", "-id")[:11],
+        "job list by salary": active_jobs.filter(normalized_max__gte=50000, normalized_min__lte=90000)
+        .order_by("-date_posted", "-id")[:11],
+        "job list near a place": within_radius(active_jobs, Place("Dhaka", "BD", 23.81, 90.41), 25)
+        .order_by("distance", "-date_posted", "-id")[:11],
+        "job detail": Job.objects.select_related("posted_by__profile").filter(pk=user_id),
+        "job detail similar jobs": active_jobs.filter(similar_to__job_id=user_id).order_by("similar_to__rank")[:5],
+        "home active job count": active_jobs.values("pk"),
+        "home company count": Profile.objects.filter(role="company").values("pk"),
+        "my posted jobs": Job.objects.filter(posted_by_id=user_id).order_by("-date_posted", "-id")[:11],
+        "my applied jobs": seeker_applications.select_related("job").order_by("-date_applied", "-id")[:11],
+        "job applicants": Application.objects.filter(job_id=user_id)
+        .annotate(score_rank=APPLICANT_RANK)
+        .order_by("-score_rank", "-date_applied", "-id")[:21],
+        "employer recent applications": employer_applications.order_by("-date_applied")[:10],
+        "employer applications last 7 days": employer_applications.filter(date_applied__gte=week_ago).values("pk"),
+        "seeker recommended jobs": active_jobs.exclude(
+            id__in=seeker_applications.values("job_id")
+        ).order_by("-date_posted")[:5],
+        "seeker recent job posts": active_jobs.filter(date_posted__gte=week_ago).order_by("-date_posted")[:5],
+        "chatbot recent jobs": active_jobs.order_by("-date_posted")[:5],
+        "chatbot employer active jobs": Job.objects.filter(posted_by_id=user_id, is_active=True).values("pk"),
+        "expiry sweeper": active_jobs.filter(application_deadline__lt=timezone.now())
+        .order_by("application_deadline")
+        .values("pk")[:500],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN for each view's canonical queries and fail if "
+        "any of them falls back to a full table scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verbose-plans", action="store_true", help="Print the full plan for every query."
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("check_query_plans only understands SQLite query plans.")
+
+        failures = []
+        for label, queryset in canonical_queries().items():
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                details = [row[-1] for row in cursor.fetchall()]
+
+            scans = [detail for detail in details if FULL_SCAN_RE.match(detail)]
+            if scans:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {label}: {'; '.join(scans)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"ok         {label}"))
+            if options["verbose_plans"] or scans:
+                for detail in details:
+                    self.stdout.write(f"    {detail}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} quer{'y' if len(failures) == 1 else 'ies'} fell back to a full scan.")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from jobs.resumes import dedupe_resumes
+
+
+class Command(BaseCommand):
+    help = (
+        "Move resume files stored before deduplication into content-addressed blobs, "
+        "then recount blob references. Run it while no resumes are being uploaded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Blobs recounted per statement.")
+
+    def handle(self, *args, **options):
+        stats = dedupe_resumes(batch_size=options["batch_size"])
+        self.stdout.write(
+            f"Moved {stats['files']} file(s) referenced by {stats['rows']} row(s); "
+            f"{stats['missing']} missing file(s) skipped. Recounted {stats['recounted']} blob(s), "
+            f"removed {stats['removed']} unreferenced."
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Resume storage: {stats['bytes_before']} bytes before, {stats['bytes_after']} after."
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from jobs.lifecycle import EXPIRE_BATCH_SIZE, expire_jobs
+
+
+class Command(BaseCommand):
+    help = "Close active jobs whose application deadline has passed (schedule e.g. every few minutes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=EXPIRE_BATCH_SIZE, help="Jobs closed per transaction."
+        )
+
+    def handle(self, *args, **options):
+        closed = expire_jobs(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Closed {closed} expired job(s)."))
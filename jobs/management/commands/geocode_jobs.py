@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.geo import backfill_coordinates
+
+
+class Command(BaseCommand):
+    help = "Recompute every job's coordinates from its location (run after editing the gazetteer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Jobs read per batch.")
+
+    def handle(self, *args, **options):
+        changed = backfill_coordinates(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated the coordinates of {changed} job(s)."))
@@ -0,0 +1,50 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.importer import FORMATS, guess_format, import_jobs
+
+
+class Command(BaseCommand):
+    help = "Import jobs for an employer from a CSV or JSON Lines file (use - for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - to read standard input.")
+        parser.add_argument("--employer", required=True, help="Username of the employer posting the jobs.")
+        parser.add_argument("--format", choices=FORMATS, help="Input format (default: from the file extension).")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Jobs written per transaction.")
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help="Update the employer's existing jobs with the same external_ref instead of adding duplicates.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            employer = User.objects.select_related("profile").get(username=options["employer"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {options['employer']!r}.")
+        if getattr(getattr(employer, "profile", None), "role", None) != "company":
+            raise CommandError(f"{employer.username} is not a company account.")
+
+        path = options["path"]
+        format = options["format"] or guess_format(path)
+        if path == "-":
+            result = import_jobs(sys.stdin, employer, format, options["batch_size"], options["upsert"])
+        else:
+            try:
+                with open(path, newline="", encoding="utf-8-sig") as stream:
+                    result = import_jobs(stream, employer, format, options["batch_size"], options["upsert"])
+            except OSError as e:
+                raise CommandError(f"Could not read {path}: {e}")
+
+        for line_number, message in result.errors:
+            self.stderr.write(f"Line {line_number}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more error(s).")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} job(s), updated {result.updated}, skipped {result.error_count} invalid row(s)."
+            )
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jobs.fragments import cache_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Report hits and misses of the cached job list fragments (see jobs.fragments)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after reporting.")
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+        self.stdout.write(self.style.SUCCESS(f"{stats['hits']} hit(s), {stats['misses']} miss(es), hit rate {rate}."))
+        if options["reset"]:
+            reset_stats()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.alerts import percolate_new_jobs
+
+
+class Command(BaseCommand):
+    help = "Match newly posted jobs against saved searches and record job alerts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Jobs matched per transaction.")
+
+    def handle(self, *args, **options):
+        jobs, alerts = percolate_new_jobs(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Matched {jobs} new job(s), created {alerts} alert(s)."))
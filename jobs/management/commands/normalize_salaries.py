@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.salary import backfill_normalized_salaries
+
+
+class Command(BaseCommand):
+    help = "Recompute every job's normalized salary range (run after changing CURRENCY_RATES)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Jobs read per batch.")
+
+    def handle(self, *args, **options):
+        changed = backfill_normalized_salaries(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated the salary range of {changed} job(s)."))
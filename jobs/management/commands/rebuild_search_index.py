@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job search index from the Job table."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Search index rebuilt ({backend.__class__.__name__}).")
+        )
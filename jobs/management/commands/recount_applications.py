@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from jobs.counters import recount_applications
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Recompute Job.application_count and Job.last_applied_at from the applications table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Jobs updated per statement.")
+        parser.add_argument("--job", type=int, action="append", dest="job_ids", help="Only recount this job id (repeatable).")
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.all()
+        if options["job_ids"]:
+            jobs = jobs.filter(pk__in=options["job_ids"])
+        updated = recount_applications(jobs, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Recounted applications for {updated} job(s)."))
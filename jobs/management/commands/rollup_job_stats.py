@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from jobs.rollups import recount_applications_since, rollup_applications
+
+
+class Command(BaseCommand):
+    help = "Fold new applications into the per-job daily stats (incremental, resumable)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=50000, help="Application ids processed per transaction."
+        )
+        parser.add_argument(
+            "--recount-days",
+            type=int,
+            default=0,
+            help="Afterwards recompute the application counts of this many recent days from scratch.",
+        )
+
+    def handle(self, *args, **options):
+        processed = rollup_applications(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {processed} new application(s)."))
+        if options["recount_days"] > 0:
+            counted = recount_applications_since(days=options["recount_days"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Recounted {counted} application(s) over the last {options['recount_days']} day(s).")
+            )
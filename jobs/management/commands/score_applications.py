@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.models import Job
+from jobs.ranking import score_job_applications
+
+
+class Command(BaseCommand):
+    help = "Score applications against their job's requirements (see jobs.ranking)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job", type=int, action="append", dest="job_ids", help="Job id to score (repeatable).")
+        parser.add_argument("--all", action="store_true", help="Score applications for every job that has any.")
+        parser.add_argument("--missing-only", action="store_true", help="Only score applications without a score.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Scores written per UPDATE.")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            jobs = Job.objects.filter(application_count__gt=0)
+        elif options["job_ids"]:
+            jobs = Job.objects.filter(pk__in=options["job_ids"])
+        else:
+            raise CommandError("Pass --job ID or --all.")
+
+        total = 0
+        for job in jobs.iterator():
+            scored = score_job_applications(
+                job, batch_size=options["batch_size"], missing_only=options["missing_only"]
+            )
+            total += scored
+            self.stdout.write(f"{job}: {scored} application(s) scored")
+        self.stdout.write(self.style.SUCCESS(f"Scored {total} application(s)."))
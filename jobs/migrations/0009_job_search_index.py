@@ -0,0 +1,53 @@
+from django.db import migrations
+
+FTS_TABLE = "jobs_job_fts"
+FTS_COLUMNS = "title, company, location, requirements, description"
+
+
+def fts5_supported(connection):
+    """
+    Check whether the SQLite build has the FTS5 extension compiled in.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+        # Some builds load FTS5 without advertising the compile option
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(probe)")
+            cursor.execute("DROP TABLE temp.fts5_probe")
+        except Exception:
+            return False
+        return True
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite" or not fts5_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{FTS_COLUMNS}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {FTS_COLUMNS}) SELECT id, {FTS_COLUMNS} FROM jobs_job"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_experience_level_job_industry_alter_job_job_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:50
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_application_counts(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('jobs', 'Application')
+    per_job = Application.objects.filter(job=OuterRef('pk')).order_by().values('job')
+    Job.objects.update(
+        application_count=Coalesce(Subquery(per_job.annotate(n=Count('pk')).values('n')), 0),
+        last_applied_at=Subquery(per_job.annotate(latest=Max('date_applied')).values('latest')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_application_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='last_applied_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_application_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_by', 'application_count'], name='job_poster_popular_idx'),
+        ),
+    ]
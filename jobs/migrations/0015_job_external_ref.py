@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_saved_searches'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='external_ref',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('external_ref', ''), _negated=True), fields=('posted_by', 'external_ref'), name='job_poster_external_ref_uniq'),
+        ),
+    ]
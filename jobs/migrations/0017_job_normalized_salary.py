@@ -0,0 +1,128 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:13
+
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import migrations, models
+
+# A copy of jobs.salary as of this migration, so later changes to the live
+# module don't change what it computes
+
+CURRENCY_SYMBOLS = {'$': 'USD', '€': 'EUR', '£': 'GBP', '৳': 'BDT', '₹': 'INR'}
+CURRENCY_WORDS = {'tk': 'BDT', 'taka': 'BDT', 'dollar': 'USD', 'dollars': 'USD', 'euro': 'EUR', 'euros': 'EUR'}
+PERIODS = [
+    (re.compile(r'\b(?:year|yearly|annum|annual|annually|yr|p\.?a)\b'), Decimal(1) / 12),
+    (re.compile(r'\b(?:week|weekly|wk)\b'), Decimal(52) / 12),
+    (re.compile(r'\b(?:day|daily)\b'), Decimal(22)),
+    (re.compile(r'\b(?:hour|hourly|hr)\b'), Decimal(176)),
+]
+AMOUNT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(k|m|lakhs?|lacs?)?\b')
+SCALES = {'k': 1000, 'm': 1000000, 'lakh': 100000, 'lakhs': 100000, 'lac': 100000, 'lacs': 100000}
+WORD_RE = re.compile(r'[a-z]+')
+CENTS = Decimal('0.01')
+MAX_AMOUNT = Decimal(10) ** 12
+
+
+def currency_rates():
+    rates = {code.upper(): Decimal(str(rate)) for code, rate in settings.CURRENCY_RATES.items()}
+    rates.setdefault(settings.BASE_CURRENCY.upper(), Decimal(1))
+    return rates
+
+
+def to_base(amount, currency, rates):
+    rate = rates.get((currency or settings.BASE_CURRENCY).strip().upper())
+    if amount is None or rate is None:
+        return None
+    converted = Decimal(amount) * rate
+    if not abs(converted) < MAX_AMOUNT:
+        return None
+    return converted.quantize(CENTS)
+
+
+def parse_salary(text, rates):
+    text = (text or '').lower()
+    amounts = []
+    for number, scale in AMOUNT_RE.findall(text):
+        try:
+            amount = Decimal(number.replace(',', ''))
+        except InvalidOperation:
+            continue
+        amounts.append(amount * SCALES.get(scale, 1))
+        if len(amounts) == 2:
+            break
+    if not amounts:
+        return None
+
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), None)
+    for word in WORD_RE.findall(text):
+        if currency is not None:
+            break
+        currency = CURRENCY_WORDS.get(word) or (word.upper() if word.upper() in rates else None)
+    factor = next((factor for pattern, factor in PERIODS if pattern.search(text)), Decimal(1))
+    return min(amounts), max(amounts), currency, factor
+
+
+def normalize_salary(min_salary, max_salary, currency, salary_text, rates):
+    if min_salary is not None or max_salary is not None:
+        low, high, factor = min_salary, max_salary, Decimal(1)
+    else:
+        parsed = parse_salary(salary_text, rates)
+        if parsed is None:
+            return None, None
+        low, high, text_currency, factor = parsed
+        currency = text_currency or currency
+
+    low = high if low is None else low
+    high = low if high is None else high
+    low, high = to_base(low * factor, currency, rates), to_base(high * factor, currency, rates)
+    if low is None:
+        return None, None
+    return min(low, high), max(low, high)
+
+
+def backfill_normalized_salaries(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    rates = currency_rates()
+    fields = ['pk', 'min_salary', 'max_salary', 'currency', 'salary']
+    last_pk = 0
+    while True:
+        jobs = list(Job.objects.filter(pk__gt=last_pk).order_by('pk').only(*fields)[:1000])
+        if not jobs:
+            return
+        for job in jobs:
+            job.normalized_min, job.normalized_max = normalize_salary(
+                job.min_salary, job.max_salary, job.currency, job.salary, rates
+            )
+        Job.objects.bulk_update(jobs, ['normalized_min', 'normalized_max'])
+        last_pk = jobs[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_job_active_deadline_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='normalized_max',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='normalized_min',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.RunPython(backfill_normalized_salaries, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['normalized_max'], name='job_active_salary_max_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['normalized_min'], name='job_active_salary_min_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_coordinates(apps, schema_editor):
+    from jobs.geo import changed_coordinates
+
+    Job = apps.get_model('jobs', 'Job')
+    for jobs in changed_coordinates(Job):
+        Job.objects.bulk_update(jobs, ['latitude', 'longitude'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_job_normalized_salary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_coordinates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['latitude', 'longitude'], name='job_active_geo_idx'),
+        ),
+    ]
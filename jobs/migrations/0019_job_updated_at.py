@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Without a record of earlier edits, a job was last changed when posted
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.update(updated_at=models.F('date_posted'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_job_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
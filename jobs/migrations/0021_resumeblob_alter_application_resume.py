@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:30
+
+import jobs.models
+import jobs.resumes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0020_similar_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveIntegerField()),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='resume',
+            field=models.FileField(default='resumes/sample_resume.pdf', storage=jobs.resumes.resume_storage, upload_to='resumes/', validators=[jobs.models.validate_resume]),
+        ),
+    ]
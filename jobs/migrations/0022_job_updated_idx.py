@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0021_resumeblob_alter_application_resume'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['updated_at'], name='job_updated_idx'),
+        ),
+    ]
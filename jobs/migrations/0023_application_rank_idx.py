@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:58
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0022_job_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='application',
+            name='app_job_score_idx',
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(models.F('job'), models.OrderBy(django.db.models.functions.comparison.Coalesce('match_score', django.db.models.expressions.RawSQL('-1.0', [], output_field=models.FloatField())), descending=True), models.OrderBy(models.F('date_applied'), descending=True), models.OrderBy(models.F('id'), descending=True), name='app_job_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:00
+
+from django.db import migrations, models
+from django.db.models.functions import Length, Substr
+
+
+def truncate_anchors(apps, schema_editor):
+    SavedSearch = apps.get_model('jobs', 'SavedSearch')
+    SavedSearch.objects.annotate(length=Length('anchor')).filter(length__gt=20).update(
+        anchor=Substr('anchor', 1, 20)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0023_application_rank_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(truncate_anchors, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='savedsearch',
+            name='anchor',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+    ]
@@ -1,7 +1,10 @@
 
 from django.contrib import messages
+from django.contrib.messages.storage.cookie import CookieStorage
 from django.shortcuts import redirect, render
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 # Custom mixin to restrict access to certain views to only companies
 class CompanyRequiredMixin(UserPassesTestMixin):
     def test_func(self):
@@ -22,3 +25,35 @@ class CompanyRequiredMixin:
             return render(request, "jobs/denied.html")
         return super().dispatch(request, *args, **kwargs)
 
+
+# Answers anonymous GETs with 304 Not Modified when the page hasn't changed.
+# Views implement get_validators() returning (etag, last_modified timestamp);
+# it runs before the view does any other work, so it must be cheap.
+# Signed-in users always get the full page, since it carries their own
+#   navbar and messages.
+class ConditionalGetMixin:
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ("GET", "HEAD")
+            or request.user.is_authenticated
+            # Pending flash messages are rendered into the page
+            or CookieStorage.cookie_name in request.COOKIES
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            if etag:
+                response.headers["ETag"] = etag
+            if last_modified:
+                response.headers["Last-Modified"] = http_date(last_modified)
+            # Caches may keep the page but must check it's still current
+            patch_cache_control(response, public=True, no_cache=True)
+            patch_vary_headers(response, ("Cookie",))
+        return response
+
+    def get_validators(self):
+        return None, None
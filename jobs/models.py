@@ -1,8 +1,13 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.core.exceptions import ValidationError
 
+from .resumes import resume_storage
+
 
 # Model to store information for job listing
 class Job(models.Model):
@@ -44,8 +49,52 @@ class Job(models.Model):
     salary = models.CharField(max_length=150, default="Nagotiable")  # Salary
     currency = models.CharField(max_length=10, default='BDT')  # Currency
     date_posted = models.DateTimeField(auto_now_add=True)  # Date posted
+    updated_at = models.DateTimeField(auto_now=True)  # Last change; bulk writes set it explicitly (see jobs.lifecycle)
     application_deadline = models.DateTimeField(blank=True, null=True)  # Application deadline
     is_active = models.BooleanField(default=True)  # Is job active
+    application_count = models.PositiveIntegerField(default=0)  # Number of applications (kept in sync by signals)
+    last_applied_at = models.DateTimeField(blank=True, null=True)  # Date of the latest application
+    external_ref = models.CharField(max_length=100, blank=True, default="")  # Employer's own id for imported jobs
+    normalized_min = models.DecimalField(max_digits=14, decimal_places=2, blank=True, null=True, editable=False)  # Monthly pay floor in the base currency, see jobs.salary
+    normalized_max = models.DecimalField(max_digits=14, decimal_places=2, blank=True, null=True, editable=False)  # Monthly pay ceiling in the base currency
+    latitude = models.FloatField(blank=True, null=True, editable=False)  # Geocoded from location, see jobs.geo
+    longitude = models.FloatField(blank=True, null=True, editable=False)  # Geocoded from location
+
+    class Meta:
+        # Indexes are ascending on the date so a backwards scan yields
+        # (date DESC, id DESC), the keyset the listings paginate on. The
+        # listing indexes only cover active jobs; SQLite renders the
+        # is_active filter as a bare column test, which only a partial
+        # index (not a leading is_active column) can serve.
+        indexes = [
+            # Job list, home page and chatbot: active jobs, newest first
+            models.Index(fields=["date_posted"], condition=models.Q(is_active=True), name="job_active_posted_idx"),
+            # Job list facets, each still ordered by date
+            models.Index(fields=["industry", "date_posted"], condition=models.Q(is_active=True), name="job_active_industry_idx"),
+            models.Index(fields=["job_type", "date_posted"], condition=models.Q(is_active=True), name="job_active_type_idx"),
+            models.Index(fields=["experience_level", "date_posted"], condition=models.Q(is_active=True), name="job_active_level_idx"),
+            # Expiry sweeper: active jobs in deadline order (see jobs.lifecycle)
+            models.Index(fields=["application_deadline"], condition=models.Q(is_active=True), name="job_active_deadline_idx"),
+            # Salary range filters (a job matches when its range overlaps the bounds)
+            models.Index(fields=["normalized_max"], condition=models.Q(is_active=True), name="job_active_salary_max_idx"),
+            models.Index(fields=["normalized_min"], condition=models.Q(is_active=True), name="job_active_salary_min_idx"),
+            # Radius search: bounding-box prefilter on the coordinates
+            models.Index(fields=["latitude", "longitude"], condition=models.Q(is_active=True), name="job_active_geo_idx"),
+            # Employer dashboard / my posted jobs
+            models.Index(fields=["posted_by", "date_posted"], name="job_poster_posted_idx"),
+            # Employer dashboard "popular jobs"
+            models.Index(fields=["posted_by", "application_count"], name="job_poster_popular_idx"),
+            # Latest change, the jobs version caches key on (see jobs.changes)
+            models.Index(fields=["updated_at"], name="job_updated_idx"),
+        ]
+        constraints = [
+            # Upsert key for bulk imports (see jobs.importer)
+            models.UniqueConstraint(
+                fields=["posted_by", "external_ref"],
+                condition=~models.Q(external_ref=""),
+                name="job_poster_external_ref_uniq",
+            ),
+        ]
 
     def __str__(self):
         """
@@ -59,6 +108,66 @@ class Job(models.Model):
         """
         return reverse("job-detail", kwargs={"pk": self.pk})
 
+    # Fields computed from other fields on save; bulk writes set them with set_derived_fields()
+    DERIVED_FIELDS = ["normalized_min", "normalized_max", "latitude", "longitude"]
+
+    # Counters maintained with F() updates as applications come and go (see jobs.signals)
+    COUNTER_FIELDS = ["application_count", "last_applied_at"]
+
+    def save(self, *args, **kwargs):
+        """
+        Keeps the normalized salary range and coordinates in step with their source fields.
+
+        Saving an existing job never writes COUNTER_FIELDS: the instance's
+        copies may be stale, and writing them back would undo applications
+        counted since it was loaded.
+        """
+        from .geo import LOCATION_FIELDS
+        from .salary import SALARY_FIELDS
+
+        self.set_derived_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if update_fields & SALARY_FIELDS:
+                update_fields |= {"normalized_min", "normalized_max"}
+            if update_fields & LOCATION_FIELDS:
+                update_fields |= {"latitude", "longitude"}
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
+    def set_derived_fields(self):
+        """
+        Recomputes every field in DERIVED_FIELDS.
+        """
+        self.normalize_salary()
+        self.geocode()
+
+    def normalize_salary(self):
+        """
+        Sets normalized_min/normalized_max from the salary fields (see jobs.salary).
+        """
+        from .salary import normalize_salary
+
+        self.normalized_min, self.normalized_max = normalize_salary(
+            self.min_salary, self.max_salary, self.currency, self.salary
+        )
+
+    def geocode(self):
+        """
+        Sets latitude/longitude from the location (see jobs.geo); None when it isn't a known place.
+        """
+        from .geo import geocode
+
+        place = geocode(self.location)
+        self.latitude, self.longitude = (place.latitude, place.longitude) if place else (None, None)
+
 
 def validate_resume(value):
     """
@@ -70,6 +179,30 @@ def validate_resume(value):
         raise ValidationError("Resume file too large (max 2MB).")
 
 
+class ResumeBlob(models.Model):
+    """
+    A resume file stored once per content and shared by every Application and
+    Profile that uploaded it (see jobs.resumes).
+    """
+    sha256 = models.CharField(max_length=64, unique=True)  # Content hash
+    name = models.CharField(max_length=255, unique=True)  # Storage path
+    size = models.PositiveIntegerField()  # Bytes
+    refcount = models.PositiveIntegerField(default=0)  # Rows pointing at it
+    created_at = models.DateTimeField(auto_now_add=True)  # Date first stored
+
+    def __str__(self):
+        """
+        Returns a string representation of the blob.
+        """
+        return f"{self.name} ({self.refcount} reference(s))"
+
+
+# Sort key for a job's applicants: the match score, with unscored (NULL)
+# applications below every score so the order can be seeked by cursor. The
+# -1.0 is inlined (not a query parameter) so SQLite can match app_job_rank_idx.
+APPLICANT_RANK = Coalesce("match_score", RawSQL("-1.0", [], output_field=models.FloatField()))
+
+
 class Application(models.Model):
     """
     Application model to store job application details.
@@ -79,9 +212,12 @@ class Application(models.Model):
     full_name = models.CharField(max_length=255)  # Applicant full name
     email = models.EmailField()  # Applicant email
     portfolio = models.URLField(max_length=200, blank=True, null=True)  # Applicant portfolio
-    resume = models.FileField(upload_to="resumes/", default="resumes/sample_resume.pdf", validators=[validate_resume])  # Applicant resume
+    resume = models.FileField(
+        upload_to="resumes/", default="resumes/sample_resume.pdf", validators=[validate_resume], storage=resume_storage,
+    )  # Applicant resume, stored once per content (see jobs.resumes)
     cover_letter = models.TextField()  # Cover letter
     date_applied = models.DateTimeField(auto_now_add=True)  # Date applied
+    match_score = models.FloatField(blank=True, null=True)  # Fit against the job requirements (0-1), see jobs.ranking
 
     def __str__(self):
         """
@@ -91,4 +227,153 @@ class Application(models.Model):
 
     class Meta:
         unique_together = ("job", "applicant")  # Ensure unique applications for a job by applicant
+        indexes = [
+            # My applications / job seeker dashboard
+            models.Index(fields=["applicant", "date_applied"], name="app_applicant_applied_idx"),
+            # Applications per job (employer dashboard joins through job__posted_by)
+            models.Index(fields=["job", "date_applied"], name="app_job_applied_idx"),
+            # Applicants of a job, best match first and unscored last (see APPLICANT_RANK)
+            models.Index(
+                "job", APPLICANT_RANK.desc(), F("date_applied").desc(), F("id").desc(), name="app_job_rank_idx"
+            ),
+        ]
+
+
+class JobDailyStats(models.Model):
+    """
+    Per-job, per-day counters rolled up from raw events.
+
+    Applications are added incrementally by the `rollup_job_stats` command;
+    views are flushed in batches from the detail page (see jobs.rollups).
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="daily_stats")  # Job the counters belong to
+    day = models.DateField()  # Day (UTC) the events happened on
+    applications = models.PositiveIntegerField(default=0)  # Applications received that day
+    views = models.PositiveIntegerField(default=0)  # Detail page views that day
 
+    def __str__(self):
+        """
+        Returns a string representation of the daily stats row.
+        """
+        return f"{self.job_id} on {self.day}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "day"], name="unique_job_daily_stats"),
+        ]
+
+
+class Watermark(models.Model):
+    """
+    Progress marker for incremental background processing.
+
+    Each named stream remembers the highest row id it has processed, so the
+    next run only reads newer rows.
+    """
+    name = models.CharField(max_length=100, unique=True)  # Stream name
+    last_id = models.BigIntegerField(default=0)  # Highest processed row id
+    updated_at = models.DateTimeField(auto_now=True)  # Last time the watermark moved
+
+    def __str__(self):
+        """
+        Returns a string representation of the watermark.
+        """
+        return f"{self.name} @ {self.last_id}"
+
+
+class SimilarJob(models.Model):
+    """
+    One precomputed nearest neighbour of a job, rebuilt offline by the
+    `build_similar_jobs` command (see jobs.similar).
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="similar_jobs")  # Job the neighbour belongs to
+    similar = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="similar_to")  # The neighbouring job
+    rank = models.PositiveSmallIntegerField()  # 0 for the closest neighbour
+    score = models.FloatField()  # Similarity (0-1)
+
+    def __str__(self):
+        """
+        Returns a string representation of the neighbour.
+        """
+        return f"{self.similar_id} similar to {self.job_id} (#{self.rank})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "rank"], name="unique_similar_job_rank"),
+        ]
+
+
+class SavedSearch(models.Model):
+    """
+    A job search a user subscribed to; new matching jobs raise JobAlerts.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="saved_searches")  # Subscriber
+    name = models.CharField(max_length=100, blank=True)  # Optional label
+    query = models.CharField(max_length=255, blank=True)  # Free-text search terms
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES, blank=True)  # Job type filter
+    industry = models.CharField(max_length=50, choices=Job.INDUSTRIES, blank=True)  # Industry filter
+    experience_level = models.CharField(max_length=20, choices=Job.EXPERIENCE_LEVELS, blank=True)  # Experience level filter
+    min_salary = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)  # Minimum monthly salary filter (base currency)
+    max_salary = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)  # Maximum monthly salary filter (base currency)
+    anchor = models.CharField(max_length=20, blank=True, editable=False)  # Most selective query term, see jobs.alerts
+    is_active = models.BooleanField(default=True)  # Alerts enabled
+    created_at = models.DateTimeField(auto_now_add=True)  # Date saved
+
+    def __str__(self):
+        """
+        Returns a string representation of the saved search.
+        """
+        return self.name or self.query or "All jobs"
+
+    def save(self, *args, **kwargs):
+        """
+        Keeps the percolator anchor in step with the query.
+        """
+        from .alerts import anchor_term
+
+        self.anchor = anchor_term(self.query)
+        super().save(*args, **kwargs)
+
+    def get_filter_params(self):
+        """
+        Returns the job list GET parameters this search stands for.
+        """
+        params = {
+            "q": self.query,
+            "job_type": self.job_type,
+            "industry": self.industry,
+            "experience_level": self.experience_level,
+            "min_salary": self.min_salary,
+            "max_salary": self.max_salary,
+        }
+        return {key: value for key, value in params.items() if value not in ("", None)}
+
+    class Meta:
+        indexes = [
+            # Percolator lookup: anchor term first, then the facet filters
+            models.Index(
+                fields=["anchor", "job_type", "industry", "experience_level"],
+                condition=models.Q(is_active=True),
+                name="savedsearch_percolate_idx",
+            ),
+        ]
+
+
+class JobAlert(models.Model):
+    """
+    A new job that matched a saved search; users see them as a digest.
+    """
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name="alerts")  # Matching search
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="alerts")  # Matched job
+    created_at = models.DateTimeField(auto_now_add=True)  # Date matched
+
+    def __str__(self):
+        """
+        Returns a string representation of the alert.
+        """
+        return f"{self.job_id} for search {self.saved_search_id}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["saved_search", "job"], name="unique_job_alert"),
+        ]
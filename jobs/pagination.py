@@ -0,0 +1,234 @@
+"""
+Pagination helpers for the job listing views.
+
+Offset pagination (`?page=N`) costs a COUNT(*) over the whole result set plus
+an OFFSET scan that grows with the page number. The cursor (keyset) mode
+used here instead seeks straight to the next row with a `WHERE (date, id) <
+(last_date, last_id)` predicate, so every page costs the same. Offset pages
+still work for ranked search results and old links, but their count is
+capped so deep result sets don't force a full COUNT.
+"""
+import base64
+import binascii
+import json
+from functools import cached_property
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
+
+# Results are counted up to this many rows, beyond that we show "1000+"
+DEFAULT_COUNT_CAP = 1000
+
+
+class InvalidCursor(Exception):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def capped_count(queryset, cap):
+    """
+    Count rows up to `cap`, returning (count, capped).
+
+    The LIMIT is pushed into a subquery so the database stops counting
+    after cap + 1 rows instead of walking the whole result set.
+    """
+    count = queryset.order_by()[: cap + 1].count()
+    return min(count, cap), count > cap
+
+
+class CappedCountPaginator(Paginator):
+    """
+    Offset paginator whose total count stops at `count_cap` rows.
+    """
+    count_cap = DEFAULT_COUNT_CAP
+
+    @cached_property
+    def _capped_count(self):
+        return capped_count(self.object_list, self.count_cap)
+
+    @property
+    def count(self):
+        return self._capped_count[0]
+
+    @property
+    def count_capped(self):
+        return self._capped_count[1]
+
+    is_cursor_paginator = False
+
+
+class CursorPage:
+    """
+    A page of results produced by `CursorPaginator`.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over a queryset ordered by `ordering`.
+
+    `ordering` must end in a unique field (normally `-id`) so the sort is
+    total. Cursors are opaque url-safe tokens holding the ordering values of
+    the boundary row and the direction to read in.
+    """
+    is_cursor_paginator = True
+
+    def __init__(self, queryset, per_page, ordering=("-date_posted", "-id"), count_cap=DEFAULT_COUNT_CAP):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.count_cap = count_cap
+
+    @cached_property
+    def _capped_count(self):
+        if not self.count_cap:
+            return None, False
+        return capped_count(self.queryset, self.count_cap)
+
+    @property
+    def count(self):
+        """
+        Capped number of rows in the whole result set, or None if disabled.
+        """
+        return self._capped_count[0]
+
+    @property
+    def count_capped(self):
+        return self._capped_count[1]
+
+    def _fields(self):
+        return [(field.lstrip("-"), field.startswith("-")) for field in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        values = []
+        for name, _ in self._fields():
+            value = getattr(obj, "pk" if name == "id" else name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        payload = json.dumps({"v": values, "d": direction}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, token):
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values, direction = payload["v"], payload["d"]
+            fields = self._fields()
+            if direction not in ("n", "p") or len(values) != len(fields):
+                raise InvalidCursor(token)
+            values = [self._field(name).to_python(value) for (name, _), value in zip(fields, values)]
+        except (ValueError, KeyError, TypeError, binascii.Error, ValidationError) as exc:
+            raise InvalidCursor(token) from exc
+        return values, direction
+
+    def _field(self, name):
+        """
+        The model field or annotation `name` is ordered by, to parse cursor values with.
+        """
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return self.queryset.model._meta.get_field(name)
+
+    def _seek_filter(self, values, forward):
+        """
+        Build the row-value comparison `(a, b, c) > (x, y, z)` as ORed Qs.
+
+        `forward` reads in ordering direction; otherwise every comparison is
+        flipped to walk backwards from the boundary row.
+        """
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self._fields(), values):
+            after = descending != forward
+            lookup = "gt" if after else "lt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def page(self, cursor=None):
+        """
+        Return the page starting after (or ending before) the cursor row.
+        """
+        queryset = self.queryset
+        direction = "n"
+        if cursor:
+            values, direction = self.decode_cursor(cursor)
+            queryset = queryset.filter(self._seek_filter(values, forward=direction == "n"))
+
+        if direction == "n":
+            rows = list(queryset.order_by(*self.ordering)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            has_next, has_previous = has_more, cursor is not None
+        else:
+            reverse = [field[1:] if field.startswith("-") else f"-{field}" for field in self.ordering]
+            rows = list(queryset.order_by(*reverse)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            has_next, has_previous = True, has_more
+
+        next_cursor = self.encode_cursor(rows[-1], "n") if rows and has_next else None
+        previous_cursor = self.encode_cursor(rows[0], "p") if rows and has_previous else None
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that serves cursor pages unless a `page` number is given.
+
+    Views set `cursor_ordering` to the keyset their queryset is ordered by and
+    may override `use_cursor_pagination()` for orderings that can't be seeked
+    (e.g. relevance-ranked search).
+    """
+    cursor_ordering = ("-date_posted", "-id")
+    cursor_kwarg = "cursor"
+    paginator_class = CappedCountPaginator
+    # Upper bound for result counts; None skips counting on cursor pages
+    count_cap = DEFAULT_COUNT_CAP
+
+    def use_cursor_pagination(self):
+        return self.page_kwarg not in self.request.GET
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        paginator.count_cap = self.count_cap or DEFAULT_COUNT_CAP
+        return paginator
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering, self.count_cap)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid page cursor.")
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator, page = context.get("paginator"), context.get("page_obj")
+        if paginator is not None and not paginator.is_cursor_paginator:
+            context["page_range"] = paginator.get_elided_page_range(page.number, on_each_side=2, on_ends=1)
+        return context
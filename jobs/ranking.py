@@ -0,0 +1,159 @@
+"""
+Candidate ranking: how well each application fits its job.
+
+An application is described by the applicant's profile skills plus whatever
+text can be pulled out of the uploaded resume; the job by its title and
+requirements (the same vectors the recommendation index uses). Both sides
+are weighted by IDF over active job postings, so a match on a specific
+skill ("kubernetes") counts for more than one on a generic word, and the
+cosine similarity is scaled by how well the applicant's experience fits the
+job's level. The result is stored in `Application.match_score` (0-1) so the
+applicants page can sort on an index.
+
+Scores don't depend on the other applications, which makes scoring
+incremental: new applications are scored by a background task as they
+arrive (see jobs.tasks) and `score_job_applications()` only needs to run
+for backfills or after the job's requirements change.
+"""
+import logging
+import math
+import re
+import zipfile
+import zlib
+from functools import lru_cache
+
+from django.core.files.storage import default_storage
+
+from .models import Application
+from .recommendations import experience_fit, experience_level_for, get_index, job_vector
+from .text import term_weights
+
+logger = logging.getLogger(__name__)
+
+# Profile skills are a deliberate summary, so they outweigh resume prose
+SKILLS_WEIGHT = 2.0
+
+PDF_STREAM_RE = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.S)
+PDF_TEXT_RE = re.compile(rb"\((.*?)(?<!\\)\)\s*T[Jj']|\[(.*?)\]\s*TJ", re.S)
+PDF_STRING_RE = re.compile(rb"\((.*?)(?<!\\)\)", re.S)
+XML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _pdf_text(data):
+    """
+    Best-effort text from a PDF: text operators in (deflated) content streams.
+    """
+    chunks = []
+    for stream in PDF_STREAM_RE.findall(data):
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        for single, array in PDF_TEXT_RE.findall(stream):
+            parts = PDF_STRING_RE.findall(array) if array else [single]
+            chunks.append(b"".join(parts).decode("latin-1", "ignore"))
+    return " ".join(chunks)
+
+
+def _docx_text(handle):
+    with zipfile.ZipFile(handle) as archive:
+        xml = archive.read("word/document.xml").decode("utf-8", "ignore")
+    return XML_TAG_RE.sub(" ", xml.replace("</w:p>", "\n"))
+
+
+@lru_cache(maxsize=1024)
+def resume_text(name):
+    """
+    Extract plain text from a stored resume, or "" if it can't be read.
+
+    Only the formats `validate_resume` accepts are handled; legacy .doc
+    files have no text extractor and contribute nothing.
+    """
+    if not name:
+        return ""
+    try:
+        with default_storage.open(name, "rb") as handle:
+            if name.lower().endswith(".docx"):
+                return _docx_text(handle)
+            if name.lower().endswith(".pdf"):
+                return _pdf_text(handle.read())
+    except (OSError, KeyError, zipfile.BadZipFile) as e:
+        logger.warning(f"Could not read resume {name}: {str(e)}")
+    return ""
+
+
+def applicant_vector(skills, resume_name=None):
+    """
+    Sparse vector for an applicant: profile skills plus resume text.
+    """
+    vector = {term: SKILLS_WEIGHT * weight for term, weight in term_weights(skills).items()}
+    for term, weight in term_weights(resume_text(resume_name)).items():
+        vector[term] = vector.get(term, 0.0) + weight
+    return vector
+
+
+def _weighted(vector, idf):
+    weighted = {term: weight * idf(term) for term, weight in vector.items()}
+    norm = math.sqrt(sum(weight * weight for weight in weighted.values()))
+    return {term: weight / norm for term, weight in weighted.items()} if norm else {}
+
+
+class JobScorer:
+    """
+    Scores applicants against one job; reuse it for every application.
+    """
+
+    def __init__(self, job):
+        # Scoring runs in the worker, which may build the index itself
+        self.idf = get_index(build=True).idf
+        self.job_level = job.experience_level
+        self.job_vector = _weighted(job_vector(job.title, job.requirements), self.idf)
+
+    def score(self, skills, experience_years, resume_name=None):
+        candidate = _weighted(applicant_vector(skills, resume_name), self.idf)
+        # Iterate the smaller vector for the dot product
+        small, large = sorted((candidate, self.job_vector), key=len)
+        similarity = sum(weight * large.get(term, 0.0) for term, weight in small.items())
+        return round(similarity * experience_fit(experience_level_for(experience_years or 0), self.job_level), 4)
+
+
+def score_application(application):
+    """
+    Score a single application and store the result.
+    """
+    profile = getattr(application.applicant, "profile", None)
+    scorer = JobScorer(application.job)
+    score = scorer.score(
+        profile.skills if profile else "",
+        profile.experience_years if profile else 0,
+        application.resume.name,
+    )
+    Application.objects.filter(pk=application.pk).update(match_score=score)
+    return score
+
+
+def score_job_applications(job, batch_size=1000, missing_only=False):
+    """
+    Score every application for `job`, writing scores back in batches.
+
+    Returns the number of applications scored.
+    """
+    scorer = JobScorer(job)
+    applications = Application.objects.filter(job=job)
+    if missing_only:
+        applications = applications.filter(match_score__isnull=True)
+    rows = applications.values_list(
+        "pk", "resume", "applicant__profile__skills", "applicant__profile__experience_years"
+    ).order_by("pk")
+
+    scored, batch = 0, []
+    for pk, resume, skills, experience_years in rows.iterator(chunk_size=batch_size):
+        batch.append(Application(pk=pk, match_score=scorer.score(skills, experience_years, resume)))
+        if len(batch) >= batch_size:
+            Application.objects.bulk_update(batch, ["match_score"])
+            scored += len(batch)
+            batch = []
+    if batch:
+        Application.objects.bulk_update(batch, ["match_score"])
+        scored += len(batch)
+    return scored
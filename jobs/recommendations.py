@@ -0,0 +1,151 @@
+"""
+Skill-based job recommendations for job seekers.
+
+Active jobs are kept in memory as sparse term vectors (title + requirements,
+see jobs.text) with an inverted index from term to the jobs that use it.
+Scoring a seeker walks only the posting lists of their skill terms, so a
+top-N lookup touches the handful of jobs that share a term with the profile
+instead of every active job. IDF is applied at query time, which lets the
+index be updated one job at a time.
+
+Each process keeps its own copy, loaded from a snapshot the worker builds
+and kept current with the database as described in jobs.indexes.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from .indexes import IndexHolder, LiveIndex
+from .models import Job
+from .text import term_weights
+
+# Title terms count double: "Python Developer" says more than a long
+# requirements list that mentions Python once
+TITLE_WEIGHT = 2.0
+
+EXPERIENCE_ORDER = ["entry", "mid", "senior"]
+
+
+def experience_level_for(years):
+    """
+    Map years of experience to the closest Job.EXPERIENCE_LEVELS code.
+    """
+    if years >= 5:
+        return "senior"
+    if years >= 2:
+        return "mid"
+    return "entry"
+
+
+def experience_fit(seeker_level, job_level):
+    """
+    Score multiplier for how well a job's level suits the seeker.
+    """
+    try:
+        distance = abs(EXPERIENCE_ORDER.index(seeker_level) - EXPERIENCE_ORDER.index(job_level))
+    except ValueError:
+        return 1.0
+    return (1.0, 0.7, 0.4)[distance]
+
+
+def job_vector(title, requirements):
+    """
+    Sparse vector for a job: requirement terms plus boosted title terms.
+    """
+    vector = Counter(term_weights(requirements))
+    for term, weight in term_weights(title).items():
+        vector[term] += TITLE_WEIGHT * weight
+    return dict(vector)
+
+
+class JobVectorIndex(LiveIndex):
+    """
+    In-memory sparse vectors for active jobs with a term -> jobs index.
+    """
+    name = "job-vectors"
+    fields = ("title", "requirements", "experience_level")
+
+    def __init__(self):
+        super().__init__()
+        self.postings = defaultdict(dict)  # term -> {job_id: weight}
+        self.vectors = {}  # job_id -> {term: weight}
+        self.levels = {}  # job_id -> experience level
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def job_ids(self):
+        return self.vectors.keys()
+
+    def add(self, job_id, values):
+        title, requirements, experience_level = values
+        self.remove(job_id)
+        vector = job_vector(title, requirements)
+        self.vectors[job_id] = vector
+        self.levels[job_id] = experience_level
+        for term, weight in vector.items():
+            self.postings[term][job_id] = weight
+
+    def remove(self, job_id):
+        vector = self.vectors.pop(job_id, None)
+        self.levels.pop(job_id, None)
+        for term in vector or ():
+            posting = self.postings[term]
+            posting.pop(job_id, None)
+            if not posting:
+                del self.postings[term]
+
+    def idf(self, term):
+        return math.log((len(self.vectors) + 1) / (len(self.postings.get(term, ())) + 1)) + 1.0
+
+    def score(self, query_vector, experience_level=None, exclude=(), limit=5):
+        """
+        Return [(job_id, score), ...] for the best matching jobs.
+        """
+        scores = defaultdict(float)
+        for term, weight in query_vector.items():
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            term_weight = weight * self.idf(term)
+            for job_id, job_weight in posting.items():
+                scores[job_id] += term_weight * job_weight
+
+        if experience_level:
+            for job_id in scores:
+                scores[job_id] *= experience_fit(experience_level, self.levels[job_id])
+
+        candidates = ((job_id, score) for job_id, score in scores.items() if job_id not in exclude)
+        return heapq.nlargest(limit, candidates, key=lambda item: item[1])
+
+
+index_holder = IndexHolder(JobVectorIndex)
+
+
+def get_index(build=False):
+    """
+    Return this process's copy of the index (see IndexHolder.get()).
+    """
+    return index_holder.get(build)
+
+
+def recommend_jobs(profile, exclude_ids=(), limit=5):
+    """
+    Return up to `limit` active jobs best matching a seeker's profile.
+
+    Jobs are ranked by IDF-weighted overlap between the profile's skills and
+    each job's title/requirements, scaled by how well the job's experience
+    level fits `profile.experience_years`. Returns an empty list when the
+    profile has no usable skills.
+    """
+    query_vector = term_weights(profile.skills)
+    if not query_vector:
+        return []
+    ranked = get_index().score(
+        query_vector,
+        experience_level=experience_level_for(profile.experience_years),
+        exclude=set(exclude_ids),
+        limit=limit,
+    )
+    jobs = Job.objects.filter(is_active=True).in_bulk([job_id for job_id, _ in ranked])
+    return [jobs[job_id] for job_id, _ in ranked if job_id in jobs]
@@ -0,0 +1,267 @@
+"""
+Content-addressed resume storage.
+
+Applicants send the same file with application after application. Instead
+of a copy per upload, every resume is stored once under its SHA-256
+(`resumes/sha256/ab/abcdef....pdf`) and described by a ResumeBlob row that
+counts the Application and Profile rows pointing at it:
+
+- `ResumeStorage._save()` hashes the upload while streaming it to a temporary
+  file, then either moves it into place or, if the blob already exists,
+  throws the copy away. Either way the blob gains a reference.
+- `acquire()` adds a reference to a stored resume without any upload, so an
+  application can point at the applicant's profile resume.
+- `ResumeStorage.delete()` (and `release()`) drops a reference; the file is
+  removed once the transaction dropping the last one commits.
+
+Each step changes the refcount with a single conditional UPDATE, so
+concurrent uploads and releases of the same blob are ordered by the
+database: an upload that finds its blob deleted under it starts over.
+
+The rows' own signals release replaced and deleted resumes. Writes that
+skip signals (QuerySet.update(), raw SQL) can leave references behind, which
+only keeps files around; `manage.py dedupe_resumes` recounts them and also
+moves files stored before this scheme into it.
+
+Names outside `resumes/sha256/` (the placeholder default and files not yet
+deduplicated) are plain files and behave as before.
+"""
+import hashlib
+import os
+import tempfile
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+BLOB_PREFIX = "resumes/sha256/"
+TMP_DIR = "resumes/tmp"
+
+# Tries at taking a reference to a blob that concurrent uploads and releases keep changing
+CLAIM_ATTEMPTS = 3
+
+# Models whose `resume` field is stored here
+RESUME_MODELS = [("jobs", "Application"), ("users", "Profile")]
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_PREFIX)
+
+
+def blob_name(sha256, extension):
+    return f"{BLOB_PREFIX}{sha256[:2]}/{sha256}{extension.lower()}"
+
+
+class ResumeStorage(FileSystemStorage):
+    """
+    FileSystemStorage that deduplicates by content and reference-counts blobs.
+    """
+
+    def _save(self, name, content):
+        from .models import ResumeBlob
+
+        tmp_dir = self.path(TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest, size = hashlib.sha256(), 0
+        with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+            for chunk in content.chunks():
+                digest.update(chunk)
+                tmp.write(chunk)
+                size += len(chunk)
+        try:
+            sha256 = digest.hexdigest()
+            for _ in range(CLAIM_ATTEMPTS):
+                try:
+                    with transaction.atomic():
+                        blob = ResumeBlob.objects.get_or_create(
+                            sha256=sha256,
+                            defaults={"name": blob_name(sha256, os.path.splitext(name)[1]), "size": size},
+                        )[0]
+                        # Matches nothing if a concurrent release deleted the row since
+                        # it was read; the reference is only taken on a live row
+                        if ResumeBlob.objects.filter(pk=blob.pk).update(refcount=F("refcount") + 1):
+                            self._place(tmp.name, blob.name)
+                            return blob.name
+                except IntegrityError:
+                    # A concurrent upload of the same file created the row first
+                    pass
+            raise IntegrityError(f"Could not store resume blob {sha256}.")
+        finally:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+
+    def _place(self, tmp_name, name):
+        """
+        Move the uploaded copy into place, unless the blob's file is already there.
+        """
+        path = self.path(name)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_name, path)
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+
+    def delete(self, name):
+        if is_blob(name):
+            release(name)
+        else:
+            super().delete(name)
+
+
+def resume_storage():
+    """
+    The storage of Application.resume and Profile.resume (a callable, so migrations don't pin an instance).
+    """
+    return _storage
+
+
+_storage = ResumeStorage()
+
+
+def acquire(name):
+    """
+    Add a reference to the stored resume `name`. Returns the blob name to point at.
+
+    A file from before deduplication is copied into a blob first.
+    """
+    from .models import ResumeBlob
+
+    if is_blob(name):
+        with transaction.atomic():
+            if ResumeBlob.objects.filter(name=name).update(refcount=F("refcount") + 1):
+                return name
+    with _storage.open(name) as content:
+        return _storage.save(name, content)
+
+
+def release(name):
+    """
+    Drop a reference to the blob `name`, removing it with the last one. Other names are left alone.
+    """
+    from .models import ResumeBlob
+
+    if not is_blob(name):
+        return
+    with transaction.atomic():
+        ResumeBlob.objects.filter(name=name, refcount__gt=0).update(refcount=F("refcount") - 1)
+        if ResumeBlob.objects.filter(name=name, refcount=0).delete()[0]:
+            remove_file_on_commit(name)
+
+
+def remove_file_on_commit(name):
+    """
+    Remove the file of the deleted blob `name` once the deletion commits.
+
+    A rolled-back deletion keeps its file, and a blob stored again in the
+    meantime (the same content uploaded anew) keeps the file it now uses.
+    """
+    from .models import ResumeBlob
+
+    def remove():
+        if not ResumeBlob.objects.filter(name=name).exists():
+            FileSystemStorage.delete(_storage, name)
+
+    transaction.on_commit(remove)
+
+
+def remember_resume(instance):
+    """
+    Note the resume a row was loaded with (post_init), to release it once replaced.
+    """
+    if "resume" not in instance.get_deferred_fields():
+        instance._stored_resume = instance.resume.name
+
+
+def release_replaced_resume(instance):
+    """
+    After a save, release the resume the row pointed at before, if it changed.
+    """
+    if "resume" in instance.get_deferred_fields():
+        return
+    previous = getattr(instance, "_stored_resume", None)
+    current = instance.resume.name
+    if previous and previous != current:
+        release(previous)
+    instance._stored_resume = current
+
+
+def _resume_models():
+    return [apps.get_model(app_label, model_name) for app_label, model_name in RESUME_MODELS]
+
+
+def _blob_bytes():
+    from .models import ResumeBlob
+
+    return ResumeBlob.objects.aggregate(total=Sum("size"))["total"] or 0
+
+
+def dedupe_resumes(batch_size=1000):
+    """
+    Move resume files stored before deduplication into blobs, then recount references.
+
+    Every row naming a file is repointed at its blob and the old file is
+    removed. Returns a dict of counts and the resume bytes on disk before and after.
+    """
+    from .models import ResumeBlob
+
+    models = _resume_models()
+    placeholders = {model._meta.get_field("resume").default for model in models} | {""}
+    legacy = set()
+    for model in models:
+        names = model._default_manager.exclude(resume__startswith=BLOB_PREFIX).values_list("resume", flat=True)
+        legacy.update(names.distinct().iterator())
+    legacy -= placeholders
+
+    stats = {"files": 0, "missing": 0, "rows": 0, "bytes_before": _blob_bytes()}
+    for name in sorted(legacy):
+        if not _storage.exists(name):
+            stats["missing"] += 1
+            continue
+        stats["bytes_before"] += _storage.size(name)
+        with _storage.open(name) as content:
+            stored = _storage.save(name, content)  # one reference
+        rows = sum(model._default_manager.filter(resume=name).update(resume=stored) for model in models)
+        ResumeBlob.objects.filter(name=stored).update(refcount=F("refcount") + rows - 1)
+        FileSystemStorage.delete(_storage, name)
+        stats["files"] += 1
+        stats["rows"] += rows
+
+    stats.update(recount_references(batch_size))
+    stats["bytes_after"] = _blob_bytes()
+    return stats
+
+
+def recount_references(batch_size=1000):
+    """
+    Reset every blob's refcount from the rows pointing at it and remove unreferenced blobs.
+
+    Run it while no resumes are being uploaded. Returns {"recounted": n, "removed": n}.
+    """
+    from .models import ResumeBlob
+
+    references = Counter()
+    for model in _resume_models():
+        counts = (
+            model._default_manager.filter(resume__startswith=BLOB_PREFIX)
+            .values_list("resume")
+            .annotate(rows=Count("pk"))
+            .order_by()
+        )
+        for name, rows in counts.iterator():
+            references[name] += rows
+
+    recounted, unreferenced = [], []
+    for blob in ResumeBlob.objects.only("name", "refcount").iterator(chunk_size=batch_size):
+        if not references[blob.name]:
+            unreferenced.append(blob.name)
+        elif blob.refcount != references[blob.name]:
+            blob.refcount = references[blob.name]
+            recounted.append(blob)
+    ResumeBlob.objects.bulk_update(recounted, ["refcount"], batch_size=batch_size)
+    for name in unreferenced:
+        with transaction.atomic():
+            ResumeBlob.objects.filter(name=name).delete()
+            remove_file_on_commit(name)
+    return {"recounted": len(recounted), "removed": len(unreferenced)}
@@ -0,0 +1,229 @@
+"""
+Daily rollups of per-job activity.
+
+`JobDailyStats` holds one row per (job, day). Applications are folded in by
+`rollup_applications()` (run from the `rollup_job_stats` command), which only
+reads rows past its watermark, so each run costs the size of the new data no
+matter how big the applications table gets. Detail page views are buffered
+in process and flushed in small batches.
+
+Dashboards read their 7/30/90-day windows from the rollup and add the few
+applications newer than the watermark, so the numbers stay exact between
+runs without scanning the raw table.
+
+Deleted applications are subtracted as they go: the Application post_delete
+signal calls `subtract_application()`, which takes an application the
+rollup already counted back out of its day. (Jobs take their daily rows
+with them, so cascades from a job delete need nothing.) A delete racing a
+rollup of the same id window can still slip through, as can rows removed
+without signals, so `recount_applications_since()` (`rollup_job_stats
+--recount-days N`) recomputes the last days from the raw table to repair
+any drift.
+"""
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Application, Job, JobDailyStats, Watermark
+
+APPLICATIONS_WATERMARK = "job-daily-stats:applications"
+
+# Dashboard windows, in days
+WINDOWS = (7, 30, 90)
+
+
+def get_watermark(name):
+    """
+    Return the last processed id for a stream (0 if it never ran).
+    """
+    return Watermark.objects.filter(name=name).values_list("last_id", flat=True).first() or 0
+
+
+def _add_to_daily_stats(field, counts):
+    """
+    Add `counts` {(job_id, day): n} to the `field` counter of each row.
+
+    Missing rows are inserted first (ignoring ones created concurrently) so
+    every increment can be a plain `UPDATE ... SET field = field + n`.
+    """
+    JobDailyStats.objects.bulk_create(
+        [JobDailyStats(job_id=job_id, day=day) for job_id, day in counts],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+    for (job_id, day), n in counts.items():
+        JobDailyStats.objects.filter(job_id=job_id, day=day).update(**{field: F(field) + n})
+
+
+def rollup_applications(batch_size=50000):
+    """
+    Fold applications newer than the watermark into the daily stats.
+
+    Works through id windows of `batch_size` rows; each window is grouped by
+    (job, day) in the database and committed together with the watermark,
+    so an interrupted run resumes where it stopped. Returns the number of
+    applications processed.
+    """
+    latest_id = Application.objects.aggregate(latest=Max("pk"))["latest"] or 0
+    processed = 0
+    last_id = get_watermark(APPLICATIONS_WATERMARK)
+    while last_id < latest_id:
+        upper = min(last_id + batch_size, latest_id)
+        groups = (
+            Application.objects.filter(pk__gt=last_id, pk__lte=upper)
+            .annotate(day=TruncDate("date_applied"))
+            .values("job_id", "day")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        counts = {(row["job_id"], row["day"]): row["n"] for row in groups}
+        with transaction.atomic():
+            _add_to_daily_stats("applications", counts)
+            Watermark.objects.update_or_create(
+                name=APPLICATIONS_WATERMARK, defaults={"last_id": upper}
+            )
+        processed += sum(counts.values())
+        last_id = upper
+    return processed
+
+
+def subtract_application(application):
+    """
+    Take a deleted application out of the daily stats, if the rollup had counted it.
+    """
+    if application.pk > get_watermark(APPLICATIONS_WATERMARK):
+        return
+    day = timezone.localdate(application.date_applied)
+    JobDailyStats.objects.filter(job_id=application.job_id, day=day, applications__gt=0).update(
+        applications=F("applications") - 1
+    )
+
+
+def recount_applications_since(days=7):
+    """
+    Recompute the rolled-up application counts of the last `days` days.
+
+    Only applications up to the watermark are counted, as in the rollup.
+    Returns the number of applications counted.
+    """
+    start = timezone.now().date() - timedelta(days=days - 1)
+    with transaction.atomic():
+        groups = (
+            Application.objects.filter(
+                pk__lte=get_watermark(APPLICATIONS_WATERMARK), date_applied__date__gte=start
+            )
+            .annotate(day=TruncDate("date_applied"))
+            .values("job_id", "day")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        counts = {(row["job_id"], row["day"]): row["n"] for row in groups}
+        JobDailyStats.objects.filter(day__gte=start).exclude(applications=0).update(applications=0)
+        _add_to_daily_stats("applications", counts)
+    return sum(counts.values())
+
+
+def application_window_counts(windows=WINDOWS, **job_filter):
+    """
+    Count applications in the trailing day windows for the filtered jobs.
+
+    `job_filter` uses Job field lookups, e.g. `posted_by_id=user.pk`.
+    Returns {"last_7_days": n, ...}; a window of N days covers today and
+    the N - 1 days before it (UTC).
+    """
+    today = timezone.now().date()
+    starts = {f"last_{days}_days": today - timedelta(days=days - 1) for days in windows}
+    job_lookup = {f"job__{key}": value for key, value in job_filter.items()}
+
+    rolled = JobDailyStats.objects.filter(
+        day__gte=min(starts.values()), **job_lookup
+    ).aggregate(**{name: Sum("applications", filter=Q(day__gte=start)) for name, start in starts.items()})
+
+    # Applications the rollup hasn't reached yet; a small tail read by pk
+    tail = Application.objects.filter(
+        pk__gt=get_watermark(APPLICATIONS_WATERMARK), **job_lookup
+    ).aggregate(**{name: Count("pk", filter=Q(date_applied__date__gte=start)) for name, start in starts.items()})
+
+    return {name: (rolled[name] or 0) + tail[name] for name in starts}
+
+
+def daily_application_series(days=30, **job_filter):
+    """
+    Return [(day, applications), ...] for the last `days` days, oldest first.
+    """
+    today = timezone.now().date()
+    start = today - timedelta(days=days - 1)
+    job_lookup = {f"job__{key}": value for key, value in job_filter.items()}
+
+    totals = Counter(
+        dict(
+            JobDailyStats.objects.filter(day__gte=start, **job_lookup)
+            .values("day")
+            .annotate(n=Sum("applications"))
+            .values_list("day", "n")
+        )
+    )
+    tail = (
+        Application.objects.filter(
+            pk__gt=get_watermark(APPLICATIONS_WATERMARK), date_applied__date__gte=start, **job_lookup
+        )
+        .annotate(day=TruncDate("date_applied"))
+        .values("day")
+        .annotate(n=Count("pk"))
+        .values_list("day", "n")
+    )
+    totals.update(dict(tail))
+    return [(start + timedelta(days=offset), totals[start + timedelta(days=offset)]) for offset in range(days)]
+
+
+class ViewCounter:
+    """
+    In-process buffer for job detail views.
+
+    Views are counted in memory and written to `JobDailyStats` once
+    `flush_every` views or `flush_interval` seconds have accumulated, which
+    turns one write per page view into one small batch per interval.
+    Buffered counts are lost if the process dies, which is acceptable for a
+    view counter.
+    """
+
+    def __init__(self, flush_every=200, flush_interval=30):
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    def record(self, job_id):
+        with self._lock:
+            self._pending[(job_id, timezone.now().date())] += 1
+            due = (
+                sum(self._pending.values()) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        # Skip jobs deleted since they were viewed
+        existing = set(
+            Job.objects.filter(pk__in={job_id for job_id, _ in pending}).values_list("pk", flat=True)
+        )
+        pending = {key: n for key, n in pending.items() if key[0] in existing}
+        if pending:
+            with transaction.atomic():
+                _add_to_daily_stats("views", pending)
+
+
+view_counter = ViewCounter()
@@ -0,0 +1,159 @@
+"""
+Salary normalization.
+
+Jobs describe pay two ways: structured `min_salary`/`max_salary` amounts in
+`currency`, and the free-text `salary` field ("50k-70k BDT/month", "$2,000",
+"Negotiable"). `normalize_salary()` reduces either to a monthly range in
+`settings.BASE_CURRENCY`, converted with `settings.CURRENCY_RATES`, and
+`Job.save()` stores it in `normalized_min`/`normalized_max` so salary
+filters become plain indexed range comparisons.
+
+Jobs written in bulk go through `Job.set_derived_fields()` explicitly; after
+changing the rate table, rerun the `normalize_salaries` command.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+
+from .lifecycle import bulk_update_jobs
+from .models import Job
+
+# Job fields the normalized range is derived from
+SALARY_FIELDS = {"min_salary", "max_salary", "currency", "salary"}
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "৳": "BDT", "₹": "INR"}
+
+# Currency names written out, besides the ISO codes in the rate table
+CURRENCY_WORDS = {"tk": "BDT", "taka": "BDT", "dollar": "USD", "dollars": "USD", "euro": "EUR", "euros": "EUR"}
+
+# Multipliers that turn a stated amount into a monthly one
+PERIODS = [
+    (re.compile(r"\b(?:year|yearly|annum|annual|annually|yr|p\.?a)\b"), Decimal(1) / 12),
+    (re.compile(r"\b(?:week|weekly|wk)\b"), Decimal(52) / 12),
+    (re.compile(r"\b(?:day|daily)\b"), Decimal(22)),
+    (re.compile(r"\b(?:hour|hourly|hr)\b"), Decimal(176)),
+]
+
+AMOUNT_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k|m|lakhs?|lacs?)?\b")
+SCALES = {"k": 1000, "m": 1000000, "lakh": 100000, "lakhs": 100000, "lac": 100000, "lacs": 100000}
+WORD_RE = re.compile(r"[a-z]+")
+
+CENTS = Decimal("0.01")
+
+# Converted amounts must be below this to fit normalized_min/normalized_max
+# (14 digits, 2 of them decimals); larger ones are treated as unknown
+MAX_AMOUNT = Decimal(10) ** 12
+
+
+def currency_rates():
+    """
+    Return {currency code: value of one unit in the base currency}.
+    """
+    rates = {code.upper(): Decimal(str(rate)) for code, rate in settings.CURRENCY_RATES.items()}
+    rates.setdefault(settings.BASE_CURRENCY.upper(), Decimal(1))
+    return rates
+
+
+def parse_currency(value):
+    """
+    Return a known currency code from user input, defaulting to the base currency.
+    """
+    code = (value or "").strip().upper()
+    return code if code in currency_rates() else settings.BASE_CURRENCY.upper()
+
+
+def to_base(amount, currency, rates=None):
+    """
+    Convert an amount to the base currency, or None for an unknown currency
+    or a result too large to store (see MAX_AMOUNT).
+    """
+    rate = (rates or currency_rates()).get((currency or settings.BASE_CURRENCY).strip().upper())
+    if amount is None or rate is None:
+        return None
+    converted = Decimal(amount) * rate
+    if not abs(converted) < MAX_AMOUNT:
+        return None
+    return converted.quantize(CENTS)
+
+
+def parse_salary(text, rates=None):
+    """
+    Parse free-text pay into (low, high, currency, monthly_factor).
+
+    `currency` is None when the text doesn't name one. Returns None when no
+    amount is found ("Negotiable", "Competitive").
+    """
+    text = (text or "").lower()
+    amounts = []
+    for number, scale in AMOUNT_RE.findall(text):
+        try:
+            amount = Decimal(number.replace(",", ""))
+        except InvalidOperation:
+            continue
+        amounts.append(amount * SCALES.get(scale, 1))
+        if len(amounts) == 2:
+            break
+    if not amounts:
+        return None
+
+    codes = rates or currency_rates()
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), None)
+    for word in WORD_RE.findall(text):
+        if currency is not None:
+            break
+        currency = CURRENCY_WORDS.get(word) or (word.upper() if word.upper() in codes else None)
+    factor = next((factor for pattern, factor in PERIODS if pattern.search(text)), Decimal(1))
+    return min(amounts), max(amounts), currency, factor
+
+
+def normalize_salary(min_salary, max_salary, currency, salary_text):
+    """
+    Return the monthly (low, high) pay in the base currency, or (None, None).
+
+    Structured amounts win over the free text. A single known bound is used
+    for both ends so range filters still see the job.
+    """
+    rates = currency_rates()
+    if min_salary is not None or max_salary is not None:
+        low, high, factor = min_salary, max_salary, Decimal(1)
+    else:
+        parsed = parse_salary(salary_text, rates)
+        if parsed is None:
+            return None, None
+        low, high, text_currency, factor = parsed
+        currency = text_currency or currency
+
+    low = high if low is None else low
+    high = low if high is None else high
+    low, high = to_base(low * factor, currency, rates), to_base(high * factor, currency, rates)
+    if low is None:
+        return None, None
+    return min(low, high), max(low, high)
+
+
+def backfill_normalized_salaries(batch_size=1000):
+    """
+    Recompute normalized_min/normalized_max for every job, in pk batches.
+
+    Changed jobs get a new `updated_at` and go out in `jobs_bulk_changed`,
+    so cached listings and stats see them. Returns the number of jobs whose
+    range changed.
+    """
+    changed, last_pk = 0, 0
+    fields = ["pk", "posted_by_id", "min_salary", "max_salary", "currency", "salary", "normalized_min", "normalized_max"]
+    while True:
+        jobs = list(Job.objects.filter(pk__gt=last_pk).order_by("pk").only(*fields)[:batch_size])
+        if not jobs:
+            return changed
+        updates = []
+        for job in jobs:
+            normalized = normalize_salary(job.min_salary, job.max_salary, job.currency, job.salary)
+            if normalized != (job.normalized_min, job.normalized_max):
+                job.normalized_min, job.normalized_max = normalized
+                updates.append(job)
+        if updates:
+            bulk_update_jobs(updates, ["normalized_min", "normalized_max"])
+        changed += len(updates)
+        last_pk = jobs[-1].pk
+
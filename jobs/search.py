@@ -0,0 +1,200 @@
+"""
+Full-text search for job listings.
+
+Views never talk to the search engine directly; they ask for the configured
+backend through `get_search_backend()` and call `search()` (filter + rank) or
+`filter()` (filter only) on a Job queryset. That keeps the engine swappable:
+SQLite gets an FTS5 index with BM25 ranking, other databases fall back to the
+plain `icontains` backend until a native one is plugged in via the
+`JOB_SEARCH_BACKEND` setting.
+"""
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+# Fields that take part in search, most important first
+SEARCH_FIELDS = ("title", "company", "location", "requirements", "description")
+
+# Keep pathological queries from turning into huge MATCH expressions
+MAX_QUERY_TERMS = 8
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def parse_query(query):
+    """
+    Split a raw search string into lower-cased terms.
+    """
+    if not query:
+        return []
+    return [term.lower() for term in TOKEN_RE.findall(query)][:MAX_QUERY_TERMS]
+
+
+class BaseSearchBackend:
+    """
+    Interface every search backend implements.
+    """
+
+    def index_job(self, job):
+        """Add or refresh a single job in the index."""
+
+    def index_jobs(self, jobs):
+        """Add or refresh several jobs in the index."""
+        for job in jobs:
+            self.index_job(job)
+
+    def remove_job(self, job_id):
+        """Drop a job from the index."""
+
+    def remove_jobs(self, job_ids):
+        """Drop several jobs from the index."""
+        for job_id in job_ids:
+            self.remove_job(job_id)
+
+    def rebuild(self):
+        """Rebuild the whole index from the Job table."""
+
+    def filter(self, queryset, query):
+        """Restrict the queryset to jobs matching the query."""
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        """Restrict the queryset to matching jobs, best matches first."""
+        raise NotImplementedError
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """
+    Database-agnostic backend built on `icontains` lookups.
+
+    Every term must appear in at least one search field. Results keep the
+    queryset's own ordering since there is no relevance score to sort by.
+    """
+
+    def filter(self, queryset, query):
+        for term in parse_query(query):
+            term_filter = Q()
+            for field in SEARCH_FIELDS:
+                term_filter |= Q(**{f"{field}__icontains": term})
+            queryset = queryset.filter(term_filter)
+        return queryset
+
+    def search(self, queryset, query):
+        return self.filter(queryset, query)
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    SQLite FTS5 backend.
+
+    Jobs are mirrored into the `jobs_job_fts` virtual table (rowid = job id),
+    every term is matched as a prefix and results are ranked with BM25 using
+    per-column weights so a hit in the title counts more than one buried in
+    the description.
+    """
+    table = "jobs_job_fts"
+
+    # BM25 weights, in the same order as SEARCH_FIELDS
+    weights = (10.0, 6.0, 4.0, 2.0, 1.0)
+
+    def match_expression(self, query):
+        """
+        Build an FTS5 MATCH expression: all terms required, each as a prefix.
+        """
+        terms = parse_query(query)
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def index_job(self, job):
+        self.index_jobs([job])
+
+    def index_jobs(self, jobs):
+        rows = [
+            (job.pk, *(getattr(job, field) or "" for field in SEARCH_FIELDS))
+            for job in jobs
+        ]
+        if not rows:
+            return
+        columns = ", ".join(SEARCH_FIELDS)
+        placeholders = ", ".join(["%s"] * (len(SEARCH_FIELDS) + 1))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s", [(row[0],) for row in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, {columns}) VALUES ({placeholders})", rows
+            )
+
+    def remove_job(self, job_id):
+        self.remove_jobs([job_id])
+
+    def remove_jobs(self, job_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s", [(job_id,) for job_id in job_ids]
+            )
+
+    def rebuild(self):
+        columns = ", ".join(SEARCH_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, {columns}) SELECT id, {columns} FROM jobs_job"
+            )
+            # Merge the index b-trees so queries touch as few pages as possible
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+
+    def filter(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return queryset
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [expression]
+            )
+        )
+
+    def search(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return queryset
+        weights = ", ".join(str(weight) for weight in self.weights)
+        db_table = queryset.model._meta.db_table
+        # Join the FTS table directly so MATCH drives the query and bm25()
+        # is available for ordering (lower bm25 means a better match).
+        return queryset.extra(
+            select={"search_rank": f"bm25({self.table}, {weights})"},
+            tables=[self.table],
+            where=[f"{self.table}.rowid = {db_table}.id", f"{self.table} MATCH %s"],
+            params=[expression],
+        ).order_by("search_rank", "-date_posted")
+
+
+def fts5_table_exists():
+    """
+    Return True when the FTS5 index table has been created by the migrations.
+    """
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        return SQLiteFTS5Backend.table in connection.introspection.table_names(cursor)
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    """
+    Return the configured search backend instance.
+
+    `settings.JOB_SEARCH_BACKEND` may name a backend class by dotted path;
+    otherwise FTS5 is used when available and the simple backend elsewhere.
+    """
+    backend_path = getattr(settings, "JOB_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+    if fts5_table_exists():
+        return SQLiteFTS5Backend()
+    return SimpleSearchBackend()
@@ -0,0 +1,159 @@
+# jobs/signals.py
+from django.db.models import F
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import Signal, receiver
+from .models import Job, Application
+from .search import SEARCH_FIELDS, get_search_backend
+from outbox.registry import enqueue, enqueue_many
+from . import resumes, rollups, tasks
+
+# Job fields the applicant match scores depend on
+SCORING_FIELDS = {"title", "requirements", "experience_level"}
+
+# Sent (with sender=Job) after jobs are written in bulk: bulk_create,
+# bulk_update and QuerySet.update() skip the per-instance signals below.
+# Arguments:
+#   job_ids        ids of the affected jobs
+#   posted_by_ids  ids of their posters
+#   update_fields  fields that changed, or None when whole rows were written
+jobs_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Job)
+def update_job_search_index(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the search index in step with the job's searchable fields.
+    """
+    if update_fields and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    get_search_backend().index_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_search_index(sender, instance, **kwargs):
+    """
+    Drop a deleted job from the search index.
+    """
+    get_search_backend().remove_job(instance.pk)
+
+
+@receiver(post_save, sender=Application)
+def count_new_application(sender, instance, created, **kwargs):
+    """
+    Bump the job's stored application counter when an application is made.
+    """
+    if not created:
+        return
+    Job.objects.filter(pk=instance.job_id).update(
+        application_count=F("application_count") + 1,
+        last_applied_at=instance.date_applied,
+    )
+
+
+@receiver(post_delete, sender=Application)
+def uncount_deleted_application(sender, instance, origin=None, **kwargs):
+    """
+    Decrement the job's stored application counter when an application goes.
+    """
+    if isinstance(origin, Job) or getattr(origin, "model", None) is Job:
+        # Cascading from a job delete; the counter goes with the job
+        return
+    Job.objects.filter(pk=instance.job_id, application_count__gt=0).update(
+        application_count=F("application_count") - 1
+    )
+
+
+@receiver(post_delete, sender=Application)
+def subtract_deleted_application(sender, instance, origin=None, **kwargs):
+    """
+    Take a deleted application out of the daily stats it was rolled up into.
+    """
+    if isinstance(origin, Job) or getattr(origin, "model", None) is Job:
+        # Cascading from a job delete; the job's daily stats go with it
+        return
+    rollups.subtract_application(instance)
+
+
+@receiver(post_init, sender=Application)
+def remember_application_resume(sender, instance, **kwargs):
+    """
+    Note the application's stored resume, to release it if it gets replaced.
+    """
+    resumes.remember_resume(instance)
+
+
+@receiver(post_save, sender=Application)
+def release_replaced_application_resume(sender, instance, **kwargs):
+    """
+    Drop the reference to a resume the application no longer points at.
+    """
+    resumes.release_replaced_resume(instance)
+
+
+@receiver(post_delete, sender=Application)
+def release_deleted_application_resume(sender, instance, **kwargs):
+    """
+    Drop the deleted application's reference to its resume.
+    """
+    resumes.release(instance.resume.name)
+
+
+@receiver(post_save, sender=Application)
+def score_new_application(sender, instance, created, **kwargs):
+    """
+    Queue scoring of a new application; the task commits with the application.
+    """
+    if created:
+        enqueue(tasks.score_application, application_id=instance.pk)
+
+
+def scoring_values(job):
+    """
+    The job's loaded scoring field values (deferred ones are left out).
+    """
+    deferred = job.get_deferred_fields()
+    return {name: getattr(job, name) for name in SCORING_FIELDS if name not in deferred}
+
+
+@receiver(post_init, sender=Job)
+def remember_scoring_values(sender, instance, **kwargs):
+    """
+    Note the scoring fields a job was loaded with, to rescore only when they change.
+    """
+    instance._scoring_values = scoring_values(instance)
+
+
+@receiver(post_save, sender=Job)
+def rescore_job_applications(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Rescore a job's applicants after its title, requirements or level change.
+    """
+    previous, current = instance._scoring_values, scoring_values(instance)
+    instance._scoring_values = current
+    if created or not instance.application_count:
+        return
+    if update_fields and not set(update_fields) & SCORING_FIELDS:
+        return
+    if all(previous.get(name, value) == value for name, value in current.items()):
+        return
+    enqueue(tasks.score_job_applications, job_id=instance.pk)
+
+
+@receiver(jobs_bulk_changed, sender=Job)
+def update_bulk_search_index(sender, job_ids, update_fields=None, **kwargs):
+    """
+    Bring the search index in step with jobs written in bulk.
+    """
+    if not update_fields or set(update_fields) & set(SEARCH_FIELDS):
+        get_search_backend().index_jobs(Job.objects.filter(pk__in=job_ids).only(*SEARCH_FIELDS))
+
+
+@receiver(jobs_bulk_changed, sender=Job)
+def rescore_bulk_job_applications(sender, job_ids, update_fields=None, **kwargs):
+    """
+    Rescore applicants of bulk-updated jobs whose scoring fields may have changed.
+    """
+    if update_fields and not set(update_fields) & SCORING_FIELDS:
+        return
+    job_ids = Job.objects.filter(pk__in=job_ids, application_count__gt=0).values_list("pk", flat=True)
+    enqueue_many(tasks.score_job_applications, [{"job_id": job_id} for job_id in job_ids])
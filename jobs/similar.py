@@ -0,0 +1,144 @@
+"""
+Precomputed "similar jobs" for the job detail page.
+
+`build_similar_jobs()` (the `build_similar_jobs` command, run periodically)
+turns every active job into a TF-IDF vector over its title and requirements
+(see jobs.recommendations.job_vector), finds its nearest neighbours by
+cosine similarity and stores the top `k` as SimilarJob rows. The detail page
+then reads those ids with one indexed query instead of searching per request.
+
+Neighbours are found through an inverted index from term to jobs, walking
+only each job's most distinctive terms and skipping terms so common that
+they say nothing about similarity. Jobs in the same industry get a boost.
+"""
+import heapq
+import math
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Job, SimilarJob
+from .recommendations import job_vector
+
+BUILT_AT_KEY = "similar-jobs:built-at"
+
+# Neighbours kept per job
+SIMILAR_JOBS_PER_JOB = 5
+
+# Terms of a job walked when looking for neighbours, most distinctive first
+MAX_QUERY_TERMS = 12
+
+# Terms used by more than this share of jobs (and by more than
+# MIN_SKIPPED_POSTING jobs) are too common to count as evidence
+MAX_TERM_SHARE = 0.05
+MIN_SKIPPED_POSTING = 100
+
+# Score multiplier for neighbours in the same industry
+SAME_INDUSTRY_BOOST = 1.25
+
+# Weakest similarity worth showing
+MIN_SIMILARITY = 0.05
+
+
+def similar_jobs_built_at():
+    """
+    Return the Unix time the neighbours were last rebuilt (when first asked, if unknown).
+
+    Kept in the shared cache; if the entry is lost, the new value only makes
+    clients fetch the detail pages again.
+    """
+    return cache.get_or_set(BUILT_AT_KEY, int(time.time()), None)
+
+
+def tfidf_vectors(rows):
+    """
+    Return ({job_id: unit TF-IDF vector}, {term: [(job_id, weight), ...]}).
+    """
+    vectors = {job_id: job_vector(title, requirements) for job_id, title, requirements in rows}
+    document_frequency = defaultdict(int)
+    for vector in vectors.values():
+        for term in vector:
+            document_frequency[term] += 1
+
+    total = len(vectors)
+    idf = {term: math.log((total + 1) / (count + 1)) + 1.0 for term, count in document_frequency.items()}
+    postings = defaultdict(list)
+    for job_id, vector in vectors.items():
+        weighted = {term: weight * idf[term] for term, weight in vector.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weighted.values())) or 1.0
+        vectors[job_id] = {term: weight / norm for term, weight in weighted.items()}
+        for term, weight in vectors[job_id].items():
+            postings[term].append((job_id, weight))
+    return vectors, postings
+
+
+def nearest_neighbours(vectors, postings, industries, k=SIMILAR_JOBS_PER_JOB):
+    """
+    Yield (job_id, [(neighbour_id, score), ...]) for every job, best neighbour first.
+    """
+    max_posting = max(MIN_SKIPPED_POSTING, int(len(vectors) * MAX_TERM_SHARE))
+    for job_id, vector in vectors.items():
+        scores = defaultdict(float)
+        terms = heapq.nlargest(MAX_QUERY_TERMS, vector.items(), key=lambda item: item[1])
+        for term, weight in terms:
+            posting = postings[term]
+            if len(posting) > max_posting:
+                continue
+            for other_id, other_weight in posting:
+                scores[other_id] += weight * other_weight
+        scores.pop(job_id, None)
+
+        industry = industries[job_id]
+        candidates = (
+            (other_id, min(1.0, score * (SAME_INDUSTRY_BOOST if industries[other_id] == industry else 1.0)))
+            for other_id, score in scores.items()
+        )
+        best = heapq.nlargest(k, candidates, key=lambda item: item[1])
+        yield job_id, [(other_id, score) for other_id, score in best if score >= MIN_SIMILARITY]
+
+
+def build_similar_jobs(k=SIMILAR_JOBS_PER_JOB, batch_size=1000):
+    """
+    Recompute the neighbours of every active job. Returns the number of SimilarJob rows written.
+
+    Rows are replaced `batch_size` jobs per transaction; rows of jobs that
+    are no longer active are dropped at the end.
+    """
+    rows = list(Job.objects.filter(is_active=True).values_list("pk", "title", "requirements", "industry"))
+    industries = {job_id: industry for job_id, _, _, industry in rows}
+    vectors, postings = tfidf_vectors((job_id, title, requirements) for job_id, title, requirements, _ in rows)
+
+    written, batch = 0, []
+
+    def flush():
+        with transaction.atomic():
+            SimilarJob.objects.filter(job_id__in=[job_id for job_id, _ in batch]).delete()
+            created = SimilarJob.objects.bulk_create(
+                SimilarJob(job_id=job_id, similar_id=other_id, rank=rank, score=score)
+                for job_id, neighbours in batch
+                for rank, (other_id, score) in enumerate(neighbours)
+            )
+        return len(created)
+
+    for entry in nearest_neighbours(vectors, postings, industries, k):
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            written += flush()
+            batch = []
+    if batch:
+        written += flush()
+
+    SimilarJob.objects.exclude(job__is_active=True).delete()
+    cache.set(BUILT_AT_KEY, int(time.time()), None)
+    return written
+
+
+def get_similar_jobs(job, limit=SIMILAR_JOBS_PER_JOB):
+    """
+    Return the job's precomputed neighbours that are still active, closest first.
+    """
+    return list(
+        Job.objects.filter(similar_to__job=job, is_active=True).order_by("similar_to__rank")[:limit]
+    )
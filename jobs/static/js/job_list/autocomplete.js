@@ -0,0 +1,68 @@
+// Search box suggestions from the job autocomplete endpoint.
+// Every input with data-autocomplete-url gets a <datalist> filled as the user types.
+class JobAutocomplete {
+    constructor(input) {
+        this.input = input;
+        // May already carry parameters, e.g. ?field=location
+        this.url = new URL(input.dataset.autocompleteUrl, window.location.origin);
+        this.delay = 120;
+        this.timer = null;
+        this.controller = null;
+        this.cache = new Map();
+
+        this.list = document.createElement('datalist');
+        this.list.id = `${input.name}-suggestions-${Math.random().toString(36).slice(2)}`;
+        input.after(this.list);
+        input.setAttribute('list', this.list.id);
+        input.setAttribute('autocomplete', 'off');
+
+        input.addEventListener('input', () => this.schedule());
+    }
+
+    schedule() {
+        clearTimeout(this.timer);
+        this.timer = setTimeout(() => this.fetchSuggestions(), this.delay);
+    }
+
+    async fetchSuggestions() {
+        const query = this.input.value.trim();
+        if (query.length < 2) {
+            this.render([]);
+            return;
+        }
+        if (this.cache.has(query)) {
+            this.render(this.cache.get(query));
+            return;
+        }
+        // Only the latest keystroke's request matters
+        this.controller?.abort();
+        this.controller = new AbortController();
+        const url = new URL(this.url);
+        url.searchParams.set('q', query);
+        try {
+            const response = await fetch(url, {
+                signal: this.controller.signal,
+                headers: { 'Accept': 'application/json' },
+            });
+            if (!response.ok) return;
+            const data = await response.json();
+            this.cache.set(query, data.suggestions);
+            this.render(data.suggestions);
+        } catch (error) {
+            if (error.name !== 'AbortError') console.error('Autocomplete failed:', error);
+        }
+    }
+
+    render(suggestions) {
+        this.list.replaceChildren(...suggestions.map(suggestion => {
+            const option = document.createElement('option');
+            option.value = suggestion.value;
+            option.label = `${suggestion.field} · ${suggestion.count} job${suggestion.count === 1 ? '' : 's'}`;
+            return option;
+        }));
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('input[data-autocomplete-url]').forEach(input => new JobAutocomplete(input));
+});
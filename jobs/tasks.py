@@ -0,0 +1,79 @@
+"""
+Background tasks for the jobs app, run by the outbox worker.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User
+
+from outbox.registry import task
+
+from . import indexes, ranking
+from .models import Application, Job
+
+logger = logging.getLogger(__name__)
+
+
+@task()
+def score_application(application_id):
+    """
+    Score a new application against its job.
+    """
+    application = (
+        Application.objects.select_related("job", "applicant__profile").filter(pk=application_id).first()
+    )
+    if application is not None:  # Withdrawn before the worker got to it
+        ranking.score_application(application)
+
+
+@task()
+def score_job_applications(job_id):
+    """
+    Rescore every applicant of a job after its title, requirements or level changed.
+    """
+    job = Job.objects.filter(pk=job_id).first()
+    if job is not None:
+        ranking.score_job_applications(job)
+
+
+@task(every=getattr(settings, "JOB_EXPIRY_SWEEP_INTERVAL", None))
+def expire_jobs():
+    """
+    Close active jobs whose application deadline has passed.
+    """
+    from . import lifecycle  # lifecycle imports the signals, which import this module
+
+    closed = lifecycle.expire_jobs()
+    if closed:
+        logger.info(f"Closed {closed} expired job(s).")
+
+
+@task(every=getattr(settings, "JOB_INDEX_REBUILD_INTERVAL", None))
+def build_job_indexes():
+    """
+    Rebuild the snapshots of the in-memory job indexes that processes start from.
+    """
+    sizes = indexes.build_snapshots()
+    logger.info(f"Built job index snapshots: {sizes}.")
+
+
+@task(every=getattr(settings, "JOB_INDEX_REFRESH_INTERVAL", None))
+def refresh_job_indexes():
+    """
+    Catch the in-memory job indexes up with the database and snapshot them for requests.
+    """
+    refreshed = indexes.refresh_snapshots()
+    if refreshed:
+        logger.info(f"Refreshed job index snapshots: {', '.join(refreshed)}.")
+
+
+@task()
+def import_jobs_file(name, filename, posted_by_id, format="csv", upsert=False):
+    """
+    Import a job file uploaded too large to import during the request.
+    """
+    from . import importer  # importer imports the signals, which import this module
+
+    posted_by = User.objects.filter(pk=posted_by_id).first()
+    if posted_by is not None:
+        importer.import_stored_file(name, filename, posted_by, format, upsert=upsert)
@@ -0,0 +1,23 @@
+"""
+Factories shared by the apps' test modules.
+"""
+from django.contrib.auth.models import User
+
+from .models import Job
+
+
+def make_user(username, role="applicant"):
+    user = User.objects.create_user(username, email=f"{username}@example.com", password="pass")
+    if role != user.profile.role:
+        user.profile.role = role
+        user.profile.save()
+    return user
+
+
+def make_job(posted_by, **fields):
+    values = {
+        "title": "Python Developer", "company": "Acme", "description": "-", "requirements": "Python",
+        "location": "Dhaka", "posted_by": posted_by,
+    }
+    values.update(fields)
+    return Job.objects.create(**values)
@@ -1,3 +1,1000 @@
-from django.test import TestCase
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.models import Sum
+from django.http import QueryDict
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from outbox.models import Task
+from outbox.registry import queue_scheduled
+from outbox.worker import claim_tasks, run_task
+from notifications.models import Notification
+from users.stats import EmployerStats
+
+from . import autocomplete, recommendations, tasks
+from .alerts import ANCHOR_BATCH_SIZE, ANCHOR_LENGTH, job_prefixes, matching_searches, percolate_new_jobs
+from .applications import claim_submission, submit_application
+from .autocomplete import AUTOCOMPLETE_FIELDS, correct_query, suggest
+from .changes import jobs_version
+from .counters import recount_applications
+from .facets import compute_facet_counts
+from .fragments import cache_stats, fragment_cache_key, fragment_stats, reset_stats
+from .fuzzy import SIMILARITY_THRESHOLD, TrigramIndex
+from .geo import bounding_box, geocode, haversine, within_radius
+from .importer import IMPORT_UPLOAD_DIR, JobImporter, import_jobs
+from .indexes import SNAPSHOT_CHECK_INTERVAL, IndexHolder, build_snapshots, refresh_snapshots, snapshot_stamp
+from .lifecycle import deactivate_jobs, delete_jobs, expire_jobs
+from .management.commands.check_query_plans import FULL_SCAN_RE
+from .models import Application, Job, JobAlert, JobDailyStats, ResumeBlob, SavedSearch, SimilarJob
+from .pagination import CursorPaginator, InvalidCursor, capped_count
+from .recommendations import JobVectorIndex, recommend_jobs
+from .resumes import BLOB_PREFIX, recount_references, release, resume_storage
+from .salary import normalize_salary, to_base
+from .rollups import (
+    ViewCounter, application_window_counts, daily_application_series, recount_applications_since, rollup_applications,
+)
+from .similar import build_similar_jobs, get_similar_jobs
+from .search import SQLiteFTS5Backend, SimpleSearchBackend, get_search_backend
+from .testing import make_job, make_user
+
+
+def run_queued_tasks():
+    """
+    Run the queued outbox tasks here, as the worker would.
+
+    The worker closes its connection after each task; like the test client
+    does around requests, that is disabled so the test's transaction stays open.
+    """
+    with mock.patch("outbox.worker.close_old_connections"):
+        return [run_task(claimed) for claimed in claim_tasks(100)]
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+
+    def search(self, query):
+        return list(get_search_backend().search(Job.objects.filter(is_active=True), query))
+
+    def test_fts5_backend_is_used(self):
+        self.assertIsInstance(get_search_backend(), SQLiteFTS5Backend)
+
+    def test_terms_match_as_prefixes(self):
+        job = make_job(self.employer, title="Backend Developer")
+        self.assertEqual(self.search("dev"), [job])
+        self.assertEqual(self.search("backe devel"), [job])
+        self.assertEqual(self.search("frontend"), [])
+
+    def test_title_matches_rank_first(self):
+        in_description = make_job(self.employer, title="Engineer", description="Some Django work")
+        in_title = make_job(self.employer, title="Django Engineer")
+        self.assertEqual(self.search("django"), [in_title, in_description])
+
+    def test_index_follows_saves_and_deletes(self):
+        job = make_job(self.employer, title="Data Analyst")
+        job.title = "Data Scientist"
+        job.save()
+        self.assertEqual(self.search("analyst"), [])
+        self.assertEqual(self.search("scientist"), [job])
+        job.delete()
+        self.assertEqual(self.search("scientist"), [])
+
+    def test_rebuild(self):
+        job = make_job(self.employer, title="Data Analyst")
+        Job.objects.filter(pk=job.pk).update(title="Data Scientist")
+        get_search_backend().rebuild()
+        self.assertEqual(self.search("scientist"), [job])
+
+    def test_simple_backend_requires_every_term(self):
+        job = make_job(self.employer, title="Python Developer", location="Dhaka")
+        make_job(self.employer, title="Python Developer", location="Chittagong")
+        backend = SimpleSearchBackend()
+        self.assertEqual(list(backend.filter(Job.objects.all(), "python dhaka")), [job])
+
+    def test_job_list_search(self):
+        job = make_job(self.employer, title="Django Engineer")
+        make_job(self.employer, title="Accountant", requirements="Excel")
+        response = self.client.get(reverse("job-list"), {"q": "django", "exact": "1"})
+        self.assertEqual(list(response.context["object_list"]), [job])
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        employer = make_user("employer", role="company")
+        self.jobs = [make_job(employer, title=f"Job {n}") for n in range(25)]
+        # Equal dates leave the id to break ties
+        Job.objects.filter(pk__in=[job.pk for job in self.jobs[10:15]]).update(date_posted=self.jobs[10].date_posted)
+        self.ordered = list(Job.objects.order_by("-date_posted", "-id"))
+
+    def test_pages_walk_forwards_and_backwards(self):
+        paginator = CursorPaginator(Job.objects.all(), 10)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([job for page in pages for job in page], self.ordered)
+        self.assertFalse(pages[0].has_previous())
+
+        previous = paginator.page(pages[2].previous_cursor)
+        self.assertEqual(list(previous), list(pages[1]))
+        self.assertTrue(previous.has_next())
+
+    def test_count_is_capped(self):
+        paginator = CursorPaginator(Job.objects.all(), 10, count_cap=20)
+        self.assertEqual((paginator.count, paginator.count_capped), (20, True))
+        self.assertEqual(capped_count(Job.objects.all(), 100), (25, False))
+
+    def test_invalid_cursor(self):
+        paginator = CursorPaginator(Job.objects.all(), 10)
+        for token in ("garbage", "eyJ2IjpbMV0sImQiOiJuIn0"):
+            with self.assertRaises(InvalidCursor):
+                paginator.page(token)
+        response = self.client.get(reverse("job-list"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_job_list_pages(self):
+        response = self.client.get(reverse("job-list"))
+        page = response.context["page_obj"]
+        self.assertEqual(list(page), self.ordered[:10])
+        response = self.client.get(reverse("job-list"), {"cursor": page.next_cursor})
+        self.assertEqual(list(response.context["page_obj"]), self.ordered[10:20])
+
+    def test_numbered_pages_still_work(self):
+        response = self.client.get(reverse("job-list"), {"page": 3})
+        self.assertEqual(list(response.context["page_obj"]), self.ordered[20:])
+        self.assertEqual(response.context["paginator"].count, 25)
+
+
+class QueryPlanTests(TestCase):
+    def test_canonical_queries_use_indexes(self):
+        out = io.StringIO()
+        call_command("check_query_plans", stdout=out)
+        self.assertNotIn("FULL SCAN", out.getvalue())
+
+    def test_full_scan_is_reported(self):
+        self.assertTrue(FULL_SCAN_RE.match("SCAN jobs_job"))
+        self.assertFalse(FULL_SCAN_RE.match("SEARCH jobs_job USING INDEX job_active_posted_idx (is_active=?)"))
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        employer = make_user("employer", role="company")
+        make_job(employer, job_type="remote", industry="tech")
+        make_job(employer, job_type="remote", industry="finance")
+        make_job(employer, job_type="full-time", industry="tech")
+        make_job(employer, job_type="full-time", industry="tech", is_active=False)
+
+    def test_counts_ignore_their_own_selection(self):
+        counts = compute_facet_counts(Job.objects.filter(is_active=True), {"job_type": "remote", "industry": ""})
+        # Other job types are still counted...
+        self.assertEqual(counts["job_type"]["remote"], 2)
+        self.assertEqual(counts["job_type"]["full-time"], 1)
+        # ...while other facets honour the job type
+        self.assertEqual(counts["industry"]["tech"], 1)
+        self.assertEqual(counts["industry"]["finance"], 1)
+
+    def test_one_query(self):
+        with self.assertNumQueries(1):
+            compute_facet_counts(Job.objects.all(), {})
+
+    def test_job_list_facets(self):
+        response = self.client.get(reverse("job-list"), {"industry": "tech"})
+        options = {option["value"]: option for option in response.context["facets"]["industry"]}
+        self.assertEqual(options["tech"]["count"], 2)
+        self.assertTrue(options["tech"]["selected"])
+        self.assertEqual(options["finance"]["count"], 1)
+        job_types = {option["value"]: option["count"] for option in response.context["facets"]["job_type"]}
+        self.assertEqual(job_types["remote"], 1)
+
+
+class ApplicationCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+        self.job = make_job(self.employer)
+
+    def apply(self, username):
+        return Application.objects.create(job=self.job, applicant=make_user(username))
+
+    def test_counts_follow_applications(self):
+        first = self.apply("first")
+        self.apply("second")
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 2)
+        first.delete()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 1)
+
+    def test_saving_a_stale_job_keeps_the_count(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        self.apply("seeker")
+        stale.title = "Senior Python Developer"
+        stale.save()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.title, "Senior Python Developer")
+        self.assertEqual(self.job.application_count, 1)
+        self.assertIsNotNone(self.job.last_applied_at)
+
+    def test_edit_view_keeps_the_count(self):
+        self.apply("seeker")
+        self.client.force_login(self.employer)
+        data = {
+            "title": "Lead Developer", "company": "Acme", "description": "-", "requirements": "Python",
+            "location": "Dhaka", "job_type": "full-time", "industry": "tech", "experience_level": "entry",
+            "salary": "Negotiable", "currency": "BDT",
+        }
+        response = self.client.post(reverse("job-update", args=[self.job.pk]), data)
+        self.assertEqual(response.status_code, 302)
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.title, self.job.application_count), ("Lead Developer", 1))
+
+    def test_upsert_import_keeps_the_count(self):
+        self.job.external_ref = "ref-1"
+        self.job.save()
+        self.apply("seeker")
+        rows = [(1, {"external_ref": "ref-1", "title": "Imported", "company": "Acme", "description": "-",
+                     "requirements": "Python", "location": "Dhaka"})]
+        result = JobImporter(self.employer, upsert=True).run(rows)
+        self.assertEqual((result.updated, result.error_count), (1, 0))
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.title, self.job.application_count), ("Imported", 1))
+
+    def test_recount(self):
+        self.apply("seeker")
+        Job.objects.filter(pk=self.job.pk).update(application_count=7)
+        recount_applications(Job.objects.all())
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 1)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        employer = make_user("employer", role="company")
+        self.job = make_job(employer)
+        self.applications = [
+            Application.objects.create(job=self.job, applicant=make_user(f"seeker{n}")) for n in range(3)
+        ]
+
+    def rolled_up(self):
+        return JobDailyStats.objects.filter(job=self.job).aggregate(n=Sum("applications"))["n"] or 0
+
+    def test_rollup_is_incremental(self):
+        self.assertEqual(rollup_applications(), 3)
+        self.assertEqual(rollup_applications(), 0)
+        self.assertEqual(self.rolled_up(), 3)
+        self.assertEqual(application_window_counts(pk=self.job.pk)["last_7_days"], 3)
+
+    def test_deleted_applications_are_subtracted(self):
+        rollup_applications()
+        self.applications[0].delete()
+        self.assertEqual(self.rolled_up(), 2)
+        self.assertEqual(application_window_counts(pk=self.job.pk)["last_7_days"], 2)
+        self.assertEqual(daily_application_series(days=1, pk=self.job.pk)[0][1], 2)
+
+    def test_unrolled_deletes_only_leave_the_tail(self):
+        self.applications[0].delete()
+        self.assertEqual(rollup_applications(), 2)
+        self.assertEqual(self.rolled_up(), 2)
+
+    def test_recount_repairs_drift(self):
+        rollup_applications()
+        # A delete that skips the signals
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM jobs_application WHERE id = %s", [self.applications[0].pk])
+        self.assertEqual(self.rolled_up(), 3)
+        self.assertEqual(recount_applications_since(days=7), 2)
+        self.assertEqual(self.rolled_up(), 2)
+
+    def test_views_are_buffered(self):
+        counter = ViewCounter(flush_every=2, flush_interval=3600)
+        counter.record(self.job.pk)
+        self.assertFalse(JobDailyStats.objects.filter(job=self.job, views__gt=0).exists())
+        counter.record(self.job.pk)
+        self.assertEqual(JobDailyStats.objects.get(job=self.job).views, 2)
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        fragment_stats.flush()
+        reset_stats()
+        self.employer = make_user("employer", role="company")
+        self.job = make_job(self.employer, title="Django Engineer")
+
+    def test_save_invalidates_the_fragment(self):
+        key = fragment_cache_key(QueryDict())
+        self.assertContains(self.client.get(reverse("job-list")), "Django Engineer")
+        self.job.title = "Flask Engineer"
+        self.job.save()
+        self.assertNotEqual(fragment_cache_key(QueryDict()), key)
+        self.assertContains(self.client.get(reverse("job-list")), "Flask Engineer")
+
+    def test_bulk_changes_and_deletes_invalidate_the_fragment(self):
+        other = make_job(self.employer)
+        keys = {fragment_cache_key(QueryDict())}
+        deactivate_jobs(Job.objects.filter(pk=self.job.pk))
+        keys.add(fragment_cache_key(QueryDict()))
+        other.delete()
+        keys.add(fragment_cache_key(QueryDict()))
+        self.assertEqual(len(keys), 3)
+
+    def test_jobs_version_reads_the_latest_change_from_the_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(jobs_version(), (self.job.updated_at, 1))
+        self.assertEqual(len(queries), 2)
+        latest = next(query["sql"] for query in queries if "MAX(" in query["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {latest}")
+            plan = [row[-1] for row in cursor.fetchall()]
+        # SQLite's min/max optimization: one index lookup, not a scan
+        self.assertEqual(plan, ["SEARCH jobs_job USING COVERING INDEX job_updated_idx"])
+
+    def test_hits_and_misses_are_shared(self):
+        self.client.get(reverse("job-list"))
+        self.client.get(reverse("job-list"))
+        fragment_stats.flush()
+        self.assertEqual(cache_stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+        out = io.StringIO()
+        call_command("job_list_cache_stats", "--reset", stdout=out)
+        self.assertIn("1 hit(s), 1 miss(es), hit rate 50.0%", out.getvalue())
+        self.assertEqual(cache_stats()["hits"], 0)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+        self.job = make_job(self.employer)
+        self.other = make_job(self.employer, title="Data Analyst")
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_unchanged_list_is_not_modified(self):
+        url = reverse("job-list")
+        response = self.client.get(url)
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertNotIn("Last-Modified", response)
+        with self.assertNumQueries(2):
+            # Just the jobs version (latest change and count)
+            self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+    def test_cached_fragment_costs_three_queries(self):
+        self.client.get(reverse("job-list"))
+        with self.assertNumQueries(3):
+            # The jobs version (two queries) and the cached fragment
+            self.client.get(reverse("job-list"))
+
+    def test_changes_are_served(self):
+        url = reverse("job-list")
+        response = self.client.get(url)
+        self.job.title = "Senior Python Developer"
+        self.job.save()
+        response = self.revalidate(url, response)
+        self.assertContains(response, "Senior Python Developer")
+        self.other.delete()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_validators_come_from_the_database(self):
+        url = reverse("job-list")
+        response = self.client.get(url)
+        # Another process changed the jobs, and this one's cache knows nothing of it
+        cache.clear()
+        Job.objects.filter(pk=self.other.pk).update(is_active=False, updated_at=timezone.now())
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_signed_in_users_get_fresh_pages(self):
+        self.client.force_login(self.employer)
+        response = self.client.get(reverse("job-list"))
+        self.assertNotIn("ETag", response)
+
+    def test_job_detail(self):
+        url = self.job.get_absolute_url()
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+        self.job.save()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+
+class ExpiryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        employer = make_user("employer", role="company")
+        past, future = timezone.now() - timedelta(days=1), timezone.now() + timedelta(days=1)
+        self.expired = make_job(employer, application_deadline=past)
+        self.open = make_job(employer, application_deadline=future)
+
+    def test_expire_jobs(self):
+        self.assertEqual(expire_jobs(batch_size=1), 1)
+        self.assertFalse(Job.objects.get(pk=self.expired.pk).is_active)
+        self.assertTrue(Job.objects.get(pk=self.open.pk).is_active)
+
+    def test_sweep_runs_as_a_periodic_task(self):
+        # The other periodic tasks run too; keep their index snapshots out of the tree
+        self.enterContext(override_settings(JOB_INDEX_DIR=self.enterContext(tempfile.TemporaryDirectory())))
+        queue_scheduled()
+        self.assertTrue(all(run_queued_tasks()))
+        self.assertFalse(Job.objects.get(pk=self.expired.pk).is_active)
+
+    def test_no_sweeper_thread_at_startup(self):
+        self.assertNotIn("job-expiry-sweeper", [thread.name for thread in threading.enumerate()])
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.enterContext(override_settings(JOB_INDEX_DIR=self.enterContext(tempfile.TemporaryDirectory())))
+        recommendations.index_holder.reset()
+        self.addCleanup(recommendations.index_holder.reset)
+        self.employer = make_user("employer", role="company")
+        self.django = make_job(self.employer, title="Django Developer", requirements="Python Django")
+        self.accountant = make_job(self.employer, title="Accountant", requirements="Excel")
+        self.seeker = make_user("seeker")
+        self.seeker.profile.skills = "Python, Django"
+        self.seeker.profile.experience_years = 1
+
+    def recommended(self):
+        return recommend_jobs(self.seeker.profile)
+
+    def test_without_a_snapshot_a_build_is_queued(self):
+        self.assertEqual(self.recommended(), [])
+        self.recommended()
+        self.assertEqual(Task.objects.filter(name=tasks.build_job_indexes.task_name).count(), 1)
+        tasks.build_job_indexes()
+        self.assertEqual(self.recommended(), [self.django])
+
+    def test_processes_start_from_the_snapshot(self):
+        call_command("build_job_indexes", stdout=io.StringIO())
+        recommendations.index_holder.reset()
+        with self.assertNumQueries(1):
+            # Just the recommended jobs
+            self.assertEqual(self.recommended(), [self.django])
+
+    def test_the_worker_catches_up_with_changes_from_other_processes(self):
+        build_snapshots()
+        flask = make_job(self.employer, title="Flask Developer", requirements="Python")
+        tasks.refresh_job_indexes()
+        self.assertEqual(self.recommended(), [self.django, flask])
+
+        # Written elsewhere: no signal reaches this process
+        Job.objects.filter(pk=self.django.pk).update(is_active=False, updated_at=timezone.now())
+        tasks.refresh_job_indexes()
+        self.assertEqual(self.recommended(), [flask])
+        Job.objects.filter(pk=flask.pk).delete()
+        tasks.refresh_job_indexes()
+        self.assertEqual(self.recommended(), [])
+        self.assertEqual(set(recommendations.get_index().job_ids()), {self.accountant.pk})
+
+    def test_unchanged_jobs_are_not_snapshotted_again(self):
+        build_snapshots()
+        stamp = snapshot_stamp(JobVectorIndex.name)
+        self.assertEqual(refresh_snapshots(), [])
+        self.assertEqual(snapshot_stamp(JobVectorIndex.name), stamp)
+
+    def test_requests_reload_newer_snapshots_without_queries(self):
+        build_snapshots()
+        recommendations.index_holder.reset()
+        with self.assertNumQueries(0):
+            index = recommendations.get_index()
+
+        # Another process catches up and snapshots the change
+        make_job(self.employer, title="Flask Developer", requirements="Python")
+        other = IndexHolder(JobVectorIndex)
+        other.refresh_snapshot()
+        with self.assertNumQueries(0):
+            self.assertIs(recommendations.get_index(), index)
+        with mock.patch("jobs.indexes.time.monotonic", return_value=time.monotonic() + SNAPSHOT_CHECK_INTERVAL):
+            with self.assertNumQueries(0):
+                self.assertEqual(len(recommendations.get_index().job_ids()), 3)
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.enterContext(override_settings(JOB_INDEX_DIR=self.enterContext(tempfile.TemporaryDirectory())))
+        autocomplete.index_holder.reset()
+        self.addCleanup(autocomplete.index_holder.reset)
+        self.employer = make_user("employer", role="company")
+        self.python = make_job(self.employer, title="Python Developer", location="Dhaka")
+        make_job(self.employer, title="Python Developer", location="Chittagong")
+        make_job(self.employer, title="Data Analyst", company="Devices Ltd")
+
+    def test_suggestions(self):
+        build_snapshots()
+        self.assertEqual(suggest("dev")["title"], [("Python Developer", 2)])
+        self.assertEqual(suggest("dev")["company"], [("Devices Ltd", 1)])
+        self.assertEqual(suggest("d"), {field: [] for field in AUTOCOMPLETE_FIELDS})
+        response = self.client.get(reverse("job-autocomplete"), {"q": "chit", "field": "location"})
+        self.assertEqual(response.json()["suggestions"], [{"value": "Chittagong", "field": "location", "count": 1}])
+
+    def test_without_a_snapshot_nothing_is_built_on_the_request(self):
+        self.assertEqual(suggest("dev")["title"], [])
+        self.assertTrue(Task.objects.filter(name=tasks.build_job_indexes.task_name).exists())
+
+    def test_the_worker_catches_up_with_changes_from_other_processes(self):
+        build_snapshots()
+        Job.objects.filter(pk=self.python.pk).update(title="Python Engineer", updated_at=timezone.now())
+        self.assertEqual(suggest("python")["title"], [("Python Developer", 2)])
+        tasks.refresh_job_indexes()
+        self.assertEqual(sorted(suggest("python")["title"]), [("Python Developer", 1), ("Python Engineer", 1)])
+        Job.objects.filter(pk=self.python.pk).delete()
+        tasks.refresh_job_indexes()
+        self.assertEqual(suggest("python")["title"], [("Python Developer", 1)])
+
+    def test_suggestions_cost_no_queries(self):
+        build_snapshots()
+        autocomplete.index_holder.reset()
+        with self.assertNumQueries(0):
+            suggest("dev")
+
+    def test_spelling_correction(self):
+        build_snapshots()
+        self.assertEqual(correct_query("python devloper"), "python developer")
+        self.assertIsNone(correct_query("python dev"))
+        response = self.client.get(reverse("job-list"), {"q": "devloper"})
+        self.assertEqual(response.context["corrected_from"], "devloper")
+        self.assertEqual(len(response.context["object_list"]), 2)
+
+
+class TrigramIndexTests(TestCase):
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.load(["developer", "developer", "devops", "designer", "accountant"])
+
+    def test_similar_words(self):
+        matches = self.index.similar("devloper")
+        self.assertEqual(matches[0][0], "developer")
+        self.assertGreaterEqual(matches[0][1], SIMILARITY_THRESHOLD)
+        self.assertEqual(self.index.similar("xyz"), [])
+
+    def test_prefixes(self):
+        self.assertTrue(self.index.has_prefix("dev"))
+        self.assertFalse(self.index.has_prefix("devx"))
+
+    def test_discard_keeps_counts(self):
+        self.index.discard("developer")
+        self.assertTrue(self.index.has_prefix("developer"))
+        self.index.discard("developer")
+        self.assertFalse(self.index.has_prefix("developer"))
+        self.assertNotIn("developer", [word for word, _ in self.index.similar("devloper")])
+
+    def test_incremental_add_matches_load(self):
+        index = TrigramIndex()
+        for word in ["developer", "developer", "devops", "designer", "accountant"]:
+            index.add(word)
+        self.assertEqual(index.similar("desiner"), self.index.similar("desiner"))
+        self.assertEqual(index.sorted_words, self.index.sorted_words)
+
+
+class ApplicantRankingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+        self.job = make_job(self.employer)
+        scores = [0.9, None, 0.5, 0.9, None, 0.1, 0.5]
+        for n, score in enumerate(scores * 4):
+            Application.objects.create(job=self.job, applicant=make_user(f"seeker{n}"), match_score=score)
+        self.ordered = sorted(
+            Application.objects.filter(job=self.job),
+            key=lambda application: (application.match_score or -1, application.date_applied, application.pk),
+            reverse=True,
+        )
+
+    def test_every_applicant_is_reachable_by_cursor(self):
+        self.client.force_login(self.employer)
+        url = reverse("job-applicants", args=[self.job.pk])
+        page = self.client.get(url).context["page_obj"]
+        seen = list(page)
+        while page.has_next():
+            page = self.client.get(url, {"cursor": page.next_cursor}).context["page_obj"]
+            seen.extend(page)
+        self.assertEqual(seen, self.ordered)
+        self.assertIsNone(seen[-1].match_score)
+
+    def test_saving_without_scoring_changes_does_not_rescore(self):
+        Task.objects.all().delete()
+        job = Job.objects.get(pk=self.job.pk)
+        job.salary = "Negotiable"
+        job.save()
+        self.assertFalse(Task.objects.filter(name=tasks.score_job_applications.task_name).exists())
+        job.requirements = "Python, Django"
+        job.save()
+        self.assertEqual(Task.objects.filter(name=tasks.score_job_applications.task_name).count(), 1)
+
+
+class SavedSearchAlertTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+        self.seeker = make_user("seeker")
+
+    def search(self, query, **fields):
+        return SavedSearch.objects.create(user=self.seeker, query=query, **fields)
+
+    def test_anchor_is_capped(self):
+        search = self.search("internationalization specialist")
+        self.assertEqual(search.anchor, "internationalization"[:ANCHOR_LENGTH])
+
+    def test_matches_across_anchor_batches(self):
+        words = [f"{n:04d}skill" for n in range(ANCHOR_BATCH_SIZE // 2)]
+        job = make_job(self.employer, description=" ".join(words), job_type="remote")
+        self.assertGreater(len(job_prefixes(job)), ANCHOR_BATCH_SIZE)
+        first, last, anywhere = self.search("0000skill python"), self.search(words[-1]), self.search("")
+        self.search(words[-1], job_type="contract")
+        self.search("internationalization")
+        matched = {search_id for search_id, _ in matching_searches(job)}
+        self.assertEqual(matched, {first.pk, last.pk, anywhere.pk})
+
+    def test_long_terms_must_match_in_full(self):
+        job = make_job(self.employer, description="internationalization")
+        matching = self.search("internationalization")
+        self.search("internationalizations")
+        self.assertEqual([search_id for search_id, _ in matching_searches(job)], [matching.pk])
+
+    def test_percolate_new_jobs(self):
+        search = self.search("python")
+        job = make_job(self.employer)
+        make_job(self.employer, title="Accountant", requirements="Excel")
+        self.assertEqual(percolate_new_jobs(), (2, 1))
+        self.assertTrue(JobAlert.objects.filter(saved_search=search, job=job).exists())
+        self.assertEqual(percolate_new_jobs(), (0, 0))
+
+
+class JobImportTests(TestCase):
+    CSV = (
+        "title,company,description,requirements,location,external_ref\n"
+        "Python Developer,Acme,-,Python,Dhaka,ref-1\n"
+        ",Acme,-,Python,Dhaka,ref-2\n"
+        "Data Analyst,Acme,-,SQL,Dhaka,ref-3\n"
+    )
+
+    def setUp(self):
+        cache.clear()
+        self.media = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=self.media))
+        self.employer = make_user("employer", role="company")
+        self.client.force_login(self.employer)
+
+    def upload(self):
+        return SimpleUploadedFile("jobs.csv", self.CSV.encode(), content_type="text/csv")
+
+    def test_each_row_is_validated_on_its_own(self):
+        result = import_jobs(io.StringIO(self.CSV), self.employer)
+        self.assertEqual((result.created, result.error_count), (2, 1))
+        self.assertEqual(result.errors[0][0], 3)
+        self.assertIn("title", result.errors[0][1])
+
+    def test_small_upload_is_imported_in_the_request(self):
+        response = self.client.post(reverse("job-import"), {"file": self.upload()})
+        self.assertEqual(response.context["result"].created, 2)
+        self.assertEqual(Job.objects.filter(posted_by=self.employer).count(), 2)
+
+    def test_large_upload_is_imported_by_the_worker(self):
+        with mock.patch("jobs.views.INLINE_IMPORT_MAX_BYTES", 10):
+            response = self.client.post(reverse("job-import"), {"file": self.upload()})
+        self.assertRedirects(response, reverse("job-import"))
+        self.assertFalse(Job.objects.exists())
+
+        self.assertTrue(all(run_queued_tasks()))
+        self.assertEqual(Job.objects.filter(posted_by=self.employer).count(), 2)
+        notification = Notification.objects.get(recipient=self.employer, kind="job_import")
+        self.assertEqual(notification.message, "jobs.csv: 2 new and 0 updated job(s), 1 row(s) skipped")
+        self.assertEqual(os.listdir(os.path.join(self.media, IMPORT_UPLOAD_DIR)), [])
+
+
+class DeleteJobsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.enterContext(override_settings(MEDIA_ROOT=self.enterContext(tempfile.TemporaryDirectory())))
+        self.employer = make_user("employer", role="company")
+        self.jobs = [make_job(self.employer) for _ in range(3)]
+        self.kept = make_job(self.employer, title="Kept")
+        self.seeker = make_user("seeker")
+        for job in self.jobs + [self.kept]:
+            Application.objects.create(
+                job=job, applicant=self.seeker, resume=SimpleUploadedFile("cv.pdf", b"%PDF-1.4 cv"),
+            )
+
+    def test_chunked_delete_runs_the_delete_signals(self):
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.refcount, 4)
+        self.assertEqual(EmployerStats(self.employer).get()["total_applications"], 4)
+
+        deleted = delete_jobs(Job.objects.filter(pk__in=[job.pk for job in self.jobs]), chunk_size=2)
+        self.assertEqual(deleted, 3)
+        self.assertEqual(list(Job.objects.all()), [self.kept])
+        self.assertEqual(Application.objects.count(), 1)
+        blob.refresh_from_db()
+        self.assertEqual(blob.refcount, 1)
+        self.kept.refresh_from_db()
+        self.assertEqual(self.kept.application_count, 1)
+        self.assertEqual(EmployerStats(self.employer).get()["total_applications"], 1)
+
+    def test_last_reference_removes_the_file(self):
+        blob = ResumeBlob.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_jobs(Job.objects.all())
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertFalse(os.path.exists(os.path.join(settings.MEDIA_ROOT, blob.name)))
+
+
+class SalaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+
+    def test_normalize_salary(self):
+        self.assertEqual(normalize_salary(None, None, "BDT", "50k-70k BDT/month"), (Decimal(50000), Decimal(70000)))
+        self.assertEqual(normalize_salary(None, None, "BDT", "$1,200 a year"), (Decimal(12200), Decimal(12200)))
+        self.assertEqual(normalize_salary(Decimal(100), None, "USD", "Negotiable"), (Decimal(12200), Decimal(12200)))
+        self.assertEqual(normalize_salary(None, None, "BDT", "Negotiable"), (None, None))
+        self.assertEqual(normalize_salary(None, None, "BDT", "1" + "0" * 40), (None, None))
+
+    def test_to_base_rejects_amounts_too_large_to_store(self):
+        self.assertEqual(to_base(Decimal("100"), "USD"), Decimal("12200.00"))
+        self.assertIsNone(to_base(Decimal("1e30"), "BDT"))
+        self.assertIsNone(to_base(Decimal("100"), "XYZ"))
+
+    def test_job_list_filters_in_the_base_currency(self):
+        make_job(self.employer, title="Cheap", min_salary=20000, max_salary=30000)
+        make_job(self.employer, title="Dear", min_salary=200000, max_salary=300000)
+        response = self.client.get(reverse("job-list"), {"min_salary": "1000", "currency": "USD"})
+        self.assertEqual([job.title for job in response.context["page_obj"]], ["Dear"])
+        response = self.client.get(reverse("job-list"), {"min_salary": "1e30"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["page_obj"]), 2)
+
+    def test_backfill_invalidates_cached_listings(self):
+        make_job(self.employer, title="Remote Developer", min_salary=100, max_salary=100, currency="USD")
+        query = {"min_salary": "15000"}
+        self.assertNotContains(self.client.get(reverse("job-list"), query), "Remote Developer")
+        key = fragment_cache_key(QueryDict("min_salary=15000"))
+
+        with override_settings(CURRENCY_RATES={**settings.CURRENCY_RATES, "USD": 200}):
+            call_command("normalize_salaries", stdout=io.StringIO())
+        self.assertNotEqual(fragment_cache_key(QueryDict("min_salary=15000")), key)
+        self.assertContains(self.client.get(reverse("job-list"), query), "Remote Developer")
+
+    def test_save_search_drops_bounds_it_cannot_store(self):
+        self.client.force_login(make_user("seeker"))
+        self.client.post(reverse("save-search"), {"min_salary": "1e30", "max_salary": "500", "currency": "USD"})
+        search = SavedSearch.objects.get()
+        self.assertEqual((search.min_salary, search.max_salary), (None, Decimal("61000.00")))
+
+
+class GeoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+
+    def test_geocode(self):
+        self.assertEqual(geocode("Gulshan, Dhaka").name, "Gulshan")
+        self.assertEqual(geocode("Chattogram / Remote").name, "Chittagong")
+        self.assertEqual(geocode("Senior role in Dhaka city centre").name, "Dhaka")
+        self.assertIsNone(geocode("Remote"))
+
+    def test_haversine_and_bounding_box(self):
+        dhaka, chittagong = geocode("Dhaka"), geocode("Chittagong")
+        distance = haversine(dhaka.latitude, dhaka.longitude, chittagong.latitude, chittagong.longitude)
+        self.assertAlmostEqual(distance, 213, delta=5)
+        min_lat, max_lat, min_lon, max_lon = bounding_box(dhaka.latitude, dhaka.longitude, 25)
+        self.assertLess(min_lat, dhaka.latitude)
+        self.assertGreater(max_lon, dhaka.longitude)
+        self.assertEqual(bounding_box(89.9, 0, 50)[2:], (None, None))
+
+    def test_jobs_are_geocoded_on_save(self):
+        job = make_job(self.employer, location="Banani, Dhaka")
+        self.assertEqual((job.latitude, job.longitude), (23.7937, 90.4066))
+        job.location = "Remote"
+        job.save()
+        job.refresh_from_db()
+        self.assertIsNone(job.latitude)
+
+    def test_within_radius(self):
+        near = make_job(self.employer, location="Gulshan")
+        farther = make_job(self.employer, location="Gazipur")
+        make_job(self.employer, location="Sylhet")
+        make_job(self.employer, location="Remote")
+        jobs = within_radius(Job.objects.all(), geocode("Dhaka"), 25).order_by("distance")
+        self.assertEqual(list(jobs), [near, farther])
+        self.assertLess(jobs[0].distance, 5)
+
+    def test_job_list_near_a_place(self):
+        make_job(self.employer, title="Near", location="Gulshan")
+        make_job(self.employer, title="Far", location="Sylhet")
+        response = self.client.get(reverse("job-list"), {"near": "Dhaka", "radius": "50"})
+        self.assertEqual([job.title for job in response.context["page_obj"]], ["Near"])
+
+
+    def test_backfill_invalidates_cached_listings(self):
+        job = make_job(self.employer, title="Gulshan Cashier", location="Gulshan")
+        # Coordinates gone stale, as after editing the gazetteer
+        Job.objects.filter(pk=job.pk).update(latitude=None, longitude=None)
+        query = {"near": "Dhaka", "radius": "50"}
+        self.assertNotContains(self.client.get(reverse("job-list"), query), "Gulshan Cashier")
+        key = fragment_cache_key(QueryDict("near=Dhaka&radius=50"))
+
+        call_command("geocode_jobs", stdout=io.StringIO())
+        self.assertNotEqual(fragment_cache_key(QueryDict("near=Dhaka&radius=50")), key)
+        self.assertContains(self.client.get(reverse("job-list"), query), "Gulshan Cashier")
+
+class SimilarJobsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = employer = make_user("employer", role="company")
+        self.python = make_job(employer, title="Python Developer", requirements="Python Django REST", industry="tech")
+        self.django = make_job(employer, title="Django Developer", requirements="Python Django", industry="tech")
+        self.data = make_job(employer, title="Data Engineer", requirements="Python Spark SQL", industry="finance")
+        self.nurse = make_job(employer, title="Nurse", requirements="Patient care", industry="healthcare")
+
+    def test_neighbours_best_first(self):
+        self.assertGreater(build_similar_jobs(), 0)
+        similar = get_similar_jobs(self.python)
+        self.assertEqual(similar[0], self.django)
+        self.assertNotIn(self.python, similar)
+        self.assertNotIn(self.nurse, similar)
+
+    def test_inactive_jobs_are_left_out(self):
+        build_similar_jobs()
+        deactivate_jobs(Job.objects.filter(pk=self.django.pk))
+        self.assertNotIn(self.django, get_similar_jobs(self.python))
+        build_similar_jobs()
+        self.assertFalse(SimilarJob.objects.filter(job=self.django).exists())
+        self.assertFalse(SimilarJob.objects.filter(job=self.python, similar=self.django).exists())
+
+    def test_detail_page_shows_neighbours(self):
+        build_similar_jobs()
+        response = self.client.get(reverse("job-detail", args=[self.python.pk]))
+        self.assertEqual(response.context["similar_jobs"][0], self.django)
+
+    def test_detail_page_revalidates_when_what_it_shows_changes(self):
+        build_similar_jobs()
+        url = reverse("job-detail", args=[self.python.pk])
+        response = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+        self.django.title = "Senior Django Developer"
+        self.django.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertContains(response, "Senior Django Developer")
+
+        self.employer.profile.company_name = "Acme Ltd"
+        self.employer.profile.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertContains(response, "Acme Ltd")
+
+        self.data.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
+
+
+class ConcurrentApplyTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.job = make_job(make_user("employer", role="company"))
+        self.applicants = [make_user(f"seeker{n}") for n in range(8)]
+
+    def apply(self, user):
+        try:
+            application = Application(
+                job=self.job, applicant=user, full_name=user.username, email=user.email, cover_letter="-",
+            )
+            return submit_application(application)
+        finally:
+            connections.close_all()
+
+    def test_each_applicant_applies_once(self):
+        submits = [user for user in self.applicants for _ in range(3)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(4) as pool:
+            outcomes = list(pool.map(self.apply, submits))
+        elapsed = time.perf_counter() - started
+        # Reported rather than asserted: it depends on the machine
+        sys.stderr.write(
+            f"\n{len(submits)} concurrent submit(s) in {elapsed:.2f}s ({len(submits) / elapsed:.0f} applies/s) "
+        )
+        self.assertEqual(outcomes.count(True), len(self.applicants))
+        self.assertEqual(Application.objects.filter(job=self.job).count(), len(self.applicants))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, len(self.applicants))
+
+    def test_idempotency_key_is_claimed_once(self):
+        key = "0f8fad5b-d9cb-469f-a165-70867728950e"
+        self.assertTrue(claim_submission(1, self.job.pk, key))
+        self.assertFalse(claim_submission(1, self.job.pk, key))
+        self.assertTrue(claim_submission(1, self.job.pk, "not-a-key"))
+        self.assertTrue(claim_submission(1, self.job.pk, "not-a-key"))
+
+
+class ResumeStorageTests(TestCase):
+    def setUp(self):
+        self.enterContext(override_settings(MEDIA_ROOT=self.enterContext(tempfile.TemporaryDirectory())))
+        self.storage = resume_storage()
+
+    def store(self, name="cv.pdf", content=b"%PDF-1.4 cv"):
+        return self.storage.save(f"resumes/{name}", SimpleUploadedFile(name, content))
+
+    def test_same_content_is_stored_once(self):
+        first, second = self.store(), self.store("other.pdf")
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith(BLOB_PREFIX))
+        self.assertEqual(ResumeBlob.objects.get().refcount, 2)
+        self.assertNotEqual(self.store(content=b"%PDF-1.4 another"), first)
+
+    def test_file_is_removed_when_the_last_release_commits(self):
+        name = self.store()
+        self.store()
+        release(name)
+        self.assertEqual(ResumeBlob.objects.get().refcount, 1)
+        with self.captureOnCommitCallbacks() as callbacks:
+            release(name)
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertTrue(self.storage.exists(name))
+        for callback in callbacks:
+            callback()
+        self.assertFalse(self.storage.exists(name))
+
+    def test_rolled_back_release_keeps_the_file(self):
+        name = self.store()
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    release(name)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(ResumeBlob.objects.get().refcount, 1)
+        self.assertTrue(self.storage.exists(name))
+
+    def test_blob_stored_again_keeps_its_file(self):
+        name = self.store()
+        with self.captureOnCommitCallbacks() as callbacks:
+            release(name)
+        self.assertEqual(self.store(), name)
+        for callback in callbacks:
+            callback()
+        self.assertTrue(self.storage.exists(name))
+
+    def test_concurrently_created_row_is_reused(self):
+        name = self.store()
+        get_or_create = ResumeBlob.objects.get_or_create
+        attempts = []
+
+        def racing_get_or_create(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) == 1:
+                raise IntegrityError("UNIQUE constraint failed: jobs_resumeblob.sha256")
+            return get_or_create(**kwargs)
+
+        with mock.patch.object(ResumeBlob.objects, "get_or_create", side_effect=racing_get_or_create):
+            self.assertEqual(self.store(), name)
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(ResumeBlob.objects.get().refcount, 2)
+
+    def test_recount_references(self):
+        name = self.store()
+        ResumeBlob.objects.update(refcount=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            # No row points at the blob
+            self.assertEqual(recount_references(), {"recounted": 0, "removed": 1})
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertFalse(self.storage.exists(name))
@@ -0,0 +1,49 @@
+"""
+Text normalization shared by the matching features.
+
+Job requirements, profile skills and resumes are all reduced to the same
+vocabulary of lower-cased terms so they can be compared directly.
+"""
+import math
+import re
+from collections import Counter
+
+# Keeps tech-style terms intact: c++, c#, node.js, .net
+TERM_RE = re.compile(r"[a-z0-9.+#]*[a-z0-9+#]")
+
+STOPWORDS = frozenset(
+    """
+    a about above after all also an and any are as at be been being both but by can
+    could did do does doing for from had has have having how i if in into is it its
+    just may more most must no not of on or other our out over own per plus should so
+    some such than that the their them then there these they this those through to
+    too under until up very was we were what when where which while who will with
+    within would you your years year experience experienced knowledge strong good
+    excellent ability skills skill working work plus etc using use able team
+    """.split()
+)
+
+
+def terms(text):
+    """
+    Return the list of meaningful terms in `text` (duplicates kept).
+    """
+    if not text:
+        return []
+    found = []
+    for term in TERM_RE.findall(text.lower()):
+        term = term.strip(".")
+        # Drop stopwords, single characters and bare numbers like "3+"
+        if len(term) > 1 and term not in STOPWORDS and any(char.isalpha() for char in term):
+            found.append(term)
+    return found
+
+
+def term_weights(text):
+    """
+    Sublinear term frequencies, L2-normalized: {term: weight}.
+    """
+    counts = Counter(terms(text))
+    weights = {term: 1.0 + math.log(count) for term, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    return {term: weight / norm for term, weight in weights.items()} if norm else {}
@@ -1,31 +1,50 @@
 from django.urls import path
 from .views import (
     JobListView,
+    job_autocomplete,
     JobDetailView,
     JobCreateView,
+    JobImportView,
     JobUpdateView,
     JobDeleteView,
     apply_job,
     MyAppliedJobsView,
-    MyPostedJobsView
+    MyPostedJobsView,
+    bulk_job_action,
+    JobApplicantsView,
+    save_search,
+    SavedSearchListView,
+    delete_saved_search,
 )
 
 # Define URL patterns for job views
 urlpatterns = [
     # URL pattern for listing jobs
     path('', JobListView.as_view(), name='job-list'),
+    # URL pattern for search box suggestions (JSON)
+    path('autocomplete/', job_autocomplete, name='job-autocomplete'),
     # URL pattern for displaying job details
     path('job/<int:pk>/', JobDetailView.as_view(), name='job-detail'),
     # URL pattern for creating new job
     path('job/new/', JobCreateView.as_view(), name='job-create'),
+    # URL pattern for importing jobs in bulk from a file
+    path('job/import/', JobImportView.as_view(), name='job-import'),
     # URL pattern for updating job details
     path('job/<int:pk>/update/', JobUpdateView.as_view(), name='job-update'),
     # URL pattern for deleting job
     path('job/<int:pk>/delete/', JobDeleteView.as_view(), name='job-delete'),
+    # URL pattern for an employer to review a job's applicants
+    path('job/<int:pk>/applicants/', JobApplicantsView.as_view(), name='job-applicants'),
     # URL pattern for applying to a job
     path('job/<int:pk>/apply/', apply_job, name='apply-job'),
     # URL pattern for displaying user's applied jobs
     path('my-applications/', MyAppliedJobsView.as_view(), name='my-applied-jobs'),
     # URL pattern for displaying user's posted jobs
     path('my-posted-jobs/', MyPostedJobsView.as_view(), name='my-posted-jobs'),
+    # URL pattern for bulk actions on the user's posted jobs
+    path('my-posted-jobs/bulk/', bulk_job_action, name='bulk-job-action'),
+    # URL patterns for saved searches and their job alerts
+    path('saved-searches/', SavedSearchListView.as_view(), name='saved-searches'),
+    path('saved-searches/new/', save_search, name='save-search'),
+    path('saved-searches/<int:pk>/delete/', delete_saved_search, name='delete-saved-search'),
 ]
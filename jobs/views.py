@@ -1,5 +1,7 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse
 from django.views.generic import (
+    View,
     ListView,
     DetailView,
     CreateView,
@@ -7,61 +9,277 @@ from django.views.generic import (
     DeleteView,
 )
 
-from .mixins import CompanyRequiredMixin
-from .models import Job, Application
-from .forms import JobForm, ApplicantForm
-from django.urls import reverse_lazy
+from .mixins import CompanyRequiredMixin, ConditionalGetMixin
+from .models import APPLICANT_RANK, Job, Application, SavedSearch, JobAlert, SimilarJob
+from .forms import JobForm, ApplicantForm, JobImportForm, BulkJobActionForm
+from .applications import (
+    APPLY_JOB_FIELDS,
+    claim_submission,
+    new_idempotency_key,
+    release_submission,
+    submit_application,
+)
+from .importer import (
+    INLINE_IMPORT_MAX_BYTES, MAX_REPORTED_ERRORS, guess_format, import_jobs, open_upload, queue_import,
+)
+from .lifecycle import (
+    DELETE_CHUNK_SIZE,
+    JOB_STATUSES,
+    deactivate_jobs,
+    delete_jobs,
+    extend_deadlines,
+    filter_by_status,
+    reactivate_jobs,
+)
+from .pagination import KeysetPaginationMixin
+from .facets import FACETS, get_facets
+from .search import get_search_backend
+from .rollups import view_counter
+from .salary import currency_rates, parse_currency, to_base
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, geocode, within_radius
+from .autocomplete import AUTOCOMPLETE_FIELDS, correct_query, suggest
+from .similar import get_similar_jobs, similar_jobs_built_at
+from .resumes import acquire as acquire_resume
+from .changes import jobs_version, version_token
+from .fragments import fragment_cache_key, fragment_etag, get_fragment, set_fragment
+from django.template.loader import render_to_string
+from django.urls import reverse, reverse_lazy
+from django.utils.safestring import mark_safe
+from django.utils.http import urlencode
+from django.views.decorators.http import require_POST
+from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count, Q
+from django.db.models import Count, Max
 from django.utils import timezone
+from decimal import Decimal, InvalidOperation
+
+
+def parse_decimal(value):
+    """
+    Parse a query-string number, returning None for blank or invalid input.
+    """
+    try:
+        number = Decimal((value or "").strip())
+    except InvalidOperation:
+        return None
+    return number if number.is_finite() else None
+
+
+def saved_salary_bound(value, currency):
+    """
+    Convert a salary bound to the base currency for a saved search; None
+    when blank, invalid or too large for the SavedSearch salary fields.
+    """
+    amount = to_base(parse_decimal(value), currency)
+    field = SavedSearch._meta.get_field("min_salary")
+    limit = Decimal(10) ** (field.max_digits - field.decimal_places)
+    return amount if amount is not None and abs(amount) < limit else None
 
 
 # View for job listings
-class JobListView(ListView):
+class JobListView(ConditionalGetMixin, KeysetPaginationMixin, ListView):
     model = Job
     template_name = "jobs/job_list.html"
+    # Filters, results and pagination; cached per query string (see jobs.fragments)
+    results_template_name = "jobs/job_results.html"
     paginate_by = 10
-    ordering = ["-date_posted"]
+    ordering = ["-date_posted", "-id"]
     context_object_name = "object_list"
 
-    def get_queryset(self):
-        queryset = Job.objects.filter(is_active=True).order_by("-date_posted")
-
-        # Get search parameters
-        query = self.request.GET.get("q")
-        job_type = self.request.GET.get("job_type")
-        industry = self.request.GET.get("industry")
-        experience_level = self.request.GET.get("experience_level")
-        min_salary = self.request.GET.get("min_salary")
-        max_salary = self.request.GET.get("max_salary")
-
-        # Apply filters
-        if query:
-            queryset = queryset.filter(
-                Q(title__icontains=query)
-                | Q(company__icontains=query)
-                | Q(location__icontains=query)
-            )
-        if job_type:
-            queryset = queryset.filter(job_type=job_type)
-        if industry:
-            queryset = queryset.filter(industry=industry)
-        if experience_level:
-            queryset = queryset.filter(experience_level=experience_level)
-        if min_salary:
-            queryset = queryset.filter(min_salary__gte=min_salary)
-        if max_salary:
-            queryset = queryset.filter(max_salary__lte=max_salary)
+    def get_validators(self):
+        # The page changes exactly when its fragment's key does. No
+        # Last-Modified: deleting a job changes the page but not the latest
+        # change time, so only the ETag can tell.
+        self.jobs_version = jobs_version()
+        self.fragment_key = fragment_cache_key(self.request.GET, self.jobs_version)
+        return fragment_etag(self.fragment_key), None
+
+    def get(self, request, *args, **kwargs):
+        if not hasattr(self, "fragment_key"):
+            # Signed-in users skip the validators
+            self.jobs_version = jobs_version()
+            self.fragment_key = fragment_cache_key(request.GET, self.jobs_version)
+        key = self.fragment_key
+        entry = get_fragment(key)
+        if entry is None:
+            self.object_list = self.get_queryset()
+            context = self.get_context_data()
+            entry = {
+                "html": render_to_string(self.results_template_name, context, request),
+                "search_query": context["search_query"],
+            }
+            set_fragment(key, entry)
+        # The page around the fragment is rendered per user
+        return render(
+            request,
+            self.template_name,
+            {"results": mark_safe(entry["html"]), "search_query": entry["search_query"]},
+        )
+
+    # Radius choices offered with a location, in kilometres
+    radius_choices = [5, 10, 25, 50, 100, 250]
+
+    def use_cursor_pagination(self):
+        # Relevance-ranked and nearest-first results can't be seeked by
+        # date, so they keep numbered pages
+        params = self.get_filter_params()
+        return super().use_cursor_pagination() and not params["q"] and self.near_place is None
+
+    def get_filter_params(self):
+        """
+        Normalized search and filter values from the query string.
+        """
+        if not hasattr(self, "_filter_params"):
+            get = self.request.GET
+            params = {"q": " ".join(get.get("q", "").split())}
+            for field in FACETS:
+                params[field] = get.get(field, "").strip()
+            # Salary bounds are entered in `currency` and compared in the base currency
+            params["currency"] = parse_currency(get.get("currency"))
+            for field in ("min_salary", "max_salary"):
+                amount = parse_decimal(get.get(field))
+                # Bounds too large to convert are ignored like invalid ones
+                params[field] = amount if to_base(amount, params["currency"]) is not None else None
+            # Radius search around a place from the gazetteer
+            params["near"] = " ".join(get.get("near", "").split())
+            radius = parse_decimal(get.get("radius"))
+            params["radius"] = int(min(max(radius, 1), MAX_RADIUS_KM)) if radius is not None else DEFAULT_RADIUS_KM
+            self.near_place = geocode(params["near"]) if params["near"] else None
+            # Search with the typo-corrected text unless the user asked for exact terms
+            self.corrected_from = None
+            if params["q"] and not get.get("exact"):
+                corrected = self.correct_search(params["q"])
+                if corrected:
+                    self.corrected_from, params["q"] = params["q"], corrected
+            self._filter_params = params
+        return self._filter_params
+
+    def correct_search(self, query):
+        """
+        Return a spelling-corrected query when `query` alone matches no active job.
+        """
+        if get_search_backend().filter(Job.objects.filter(is_active=True), query).exists():
+            return None
+        return correct_query(query)
+
+    def get_base_queryset(self, ranked=False):
+        """
+        Active jobs matching the search text, salary bounds and radius.
+
+        Facet filters are left out so the facet counts can be computed from
+        this queryset; `ranked` orders search results by relevance, or by
+        distance when searching near a place.
+        """
+        params = self.get_filter_params()
+        queryset = Job.objects.filter(is_active=True).order_by("-date_posted", "-id")
+
+        if params["q"]:
+            backend = get_search_backend()
+            if ranked:
+                # Ranked full-text search; best matches come first
+                queryset = backend.search(queryset, params["q"])
+            else:
+                queryset = backend.filter(queryset, params["q"])
+        # A job matches when its normalized monthly range overlaps the bounds
+        if params["min_salary"] is not None:
+            queryset = queryset.filter(normalized_max__gte=to_base(params["min_salary"], params["currency"]))
+        if params["max_salary"] is not None:
+            queryset = queryset.filter(normalized_min__lte=to_base(params["max_salary"], params["currency"]))
+        if self.near_place is not None:
+            queryset = within_radius(queryset, self.near_place, params["radius"])
+            if ranked:
+                queryset = queryset.order_by("distance", "-date_posted", "-id")
 
         return queryset
 
+    def get_queryset(self):
+        params = self.get_filter_params()
+        queryset = self.get_base_queryset(ranked=True)
+        for field in FACETS:
+            if params[field]:
+                queryset = queryset.filter(**{field: params[field]})
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        params = self.get_filter_params()
+        selected = {field: params[field] for field in FACETS}
+        signature = {**params, "q": params["q"].lower(), "jobs": version_token(self.jobs_version)}
+        context["facets"] = get_facets(self.get_base_queryset(), selected, signature)
+        context["search_query"] = params["q"]
+        context["currencies"] = sorted(currency_rates())
+        context["currency"] = params["currency"]
+        context["corrected_from"] = self.corrected_from
+        context["near_place"] = self.near_place
+        context["radius"] = params["radius"]
+        context["radius_choices"] = self.radius_choices
+        return context
+
+
+# JSON suggestions for the job search boxes, served from memory
+def job_autocomplete(request):
+    query = request.GET.get("q", "")[:100]
+    field = request.GET.get("field")
+    fields = (field,) if field in AUTOCOMPLETE_FIELDS else AUTOCOMPLETE_FIELDS
+    try:
+        limit = min(max(int(request.GET.get("limit", 8)), 1), 20)
+    except ValueError:
+        limit = 8
+    suggestions = sorted(
+        (
+            {"value": value, "field": field, "count": count}
+            for field, matches in suggest(query, fields, limit).items()
+            for value, count in matches
+        ),
+        key=lambda suggestion: -suggestion["count"],
+    )[:limit]
+    response = JsonResponse({"query": query, "suggestions": suggestions})
+    # Suggestions only change as jobs are posted; let browsers reuse them briefly
+    response["Cache-Control"] = "public, max-age=60"
+    return response
+
 
 # View for job details
-class JobDetailView(DetailView):
+class JobDetailView(ConditionalGetMixin, DetailView):
     model = Job
     template_name = 'jobs/job_detail.html'
 
+    def get_queryset(self):
+        # The poster and their profile come in the same query
+        return Job.objects.select_related("posted_by__profile")
+
+    def get_validators(self):
+        stamps = (
+            Job.objects.filter(pk=self.kwargs["pk"])
+            .values_list("updated_at", "posted_by__profile__updated_at")
+            .first()
+        )
+        if stamps is None:
+            return None, None
+        # The page also shows the poster's profile and the similar jobs, which
+        # change with those jobs and when the neighbours are rebuilt
+        neighbours = SimilarJob.objects.filter(job_id=self.kwargs["pk"]).aggregate(
+            changed_at=Max("similar__updated_at"), count=Count("pk")
+        )
+        built_at = similar_jobs_built_at()
+        times = [stamp.timestamp() if stamp else 0 for stamp in (*stamps, neighbours["changed_at"])]
+        return (
+            f'"job-{self.kwargs["pk"]}-{"-".join(map(str, times))}-{neighbours["count"]}-{built_at}"',
+            max(int(max(times)), built_at),
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["similar_jobs"] = get_similar_jobs(self.object)
+        return context
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        # Buffered; written to the daily stats in batches
+        view_counter.record(self.object.pk)
+        return response
+
 
 # View for creating a job, requires login
 class JobCreateView(LoginRequiredMixin, CompanyRequiredMixin, CreateView):
@@ -76,6 +294,31 @@ class JobCreateView(LoginRequiredMixin, CompanyRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+# View for uploading many jobs at once from a CSV or JSON Lines file
+class JobImportView(LoginRequiredMixin, CompanyRequiredMixin, View):
+    template_name = "jobs/job_import.html"
+
+    def get(self, request):
+        return render(request, self.template_name, {"form": JobImportForm()})
+
+    def post(self, request):
+        form = JobImportForm(request.POST, request.FILES)
+        context = {"form": form}
+        if form.is_valid():
+            upload, upsert = form.cleaned_data["file"], form.cleaned_data["upsert"]
+            if upload.size > INLINE_IMPORT_MAX_BYTES:
+                queue_import(upload, request.user, upsert=upsert)
+                messages.info(
+                    request, f"{upload.name} is being imported. You'll be notified when it's done."
+                )
+                return redirect("job-import")
+            result = import_jobs(open_upload(upload.file), request.user, guess_format(upload.name), upsert=upsert)
+            context.update(result=result, max_reported_errors=MAX_REPORTED_ERRORS)
+            if result.created or result.updated:
+                messages.success(request, f"Imported {result.created} new and updated {result.updated} job(s).")
+        return render(request, self.template_name, context)
+
+
 # View for updating a job, requires login and ownership
 class JobUpdateView(
     LoginRequiredMixin, UserPassesTestMixin, CompanyRequiredMixin, UpdateView
@@ -104,43 +347,60 @@ class JobDeleteView(
 
 
 # Function-based view for applying to a job
+@login_required
 def apply_job(request, pk):
-    job = get_object_or_404(Job, pk=pk)
+    job = get_object_or_404(Job.objects.only(*APPLY_JOB_FIELDS), pk=pk)
 
     if request.user.profile.role != "applicant":
         messages.error(request, "Only applicants can apply for jobs.")
         return redirect("job-detail", pk=job.pk)
 
-    if Application.objects.filter(job=job, applicant=request.user).exists():
-        messages.error(request, "You have already applied for this job.")
-        return redirect("job-detail", pk=job.pk)
-
     if not job.is_active or (job.application_deadline and job.application_deadline < timezone.now()):
         messages.error(request, "This job is no longer accepting applications.")
         return redirect('job-detail', pk=job.pk)
 
+    profile_resume = request.user.profile.resume.name
     if request.method == "POST":
-        form = ApplicantForm(request.POST, request.FILES)
+        key = request.POST.get("idempotency_key")
+        if not claim_submission(request.user.pk, job.pk, key):
+            # A retry of a submit that already went through (or is in flight)
+            messages.info(request, "We already received this application.")
+            return redirect("job-detail", pk=job.pk)
+
+        form = ApplicantForm(request.POST, request.FILES, profile_resume=profile_resume)
         if form.is_valid():
             # Save the application with the associated job and applicant
             application = form.save(commit=False)
             application.job = job
             application.applicant = request.user
-            application.save()
-            messages.success(request, "Application submitted!")
+            if form.cleaned_data.get("use_profile_resume"):
+                application.resume = acquire_resume(profile_resume)
+            if submit_application(application):
+                messages.success(request, "Application submitted!")
+            else:
+                messages.error(request, "You have already applied for this job.")
             return redirect("job-detail", pk=job.pk)
+        # Let the corrected form be sent again with the same key
+        release_submission(request.user.pk, job.pk, key)
+        key = key or new_idempotency_key()
     else:
-        form = ApplicantForm()
-    context = {"form": form, "job": job}
+        # Only to spare a pointless form; the unique constraint decides on submit
+        if Application.objects.filter(job=job, applicant=request.user).exists():
+            messages.error(request, "You have already applied for this job.")
+            return redirect("job-detail", pk=job.pk)
+        form = ApplicantForm(profile_resume=profile_resume)
+        key = new_idempotency_key()
+    context = {"form": form, "job": job, "idempotency_key": key}
     return render(request, "jobs/apply_job.html", context)
 
 
 # View for listing jobs posted by the current user
-class MyAppliedJobsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class MyAppliedJobsView(LoginRequiredMixin, UserPassesTestMixin, KeysetPaginationMixin, ListView):
     model = Application
     template_name = "jobs/my_applied_jobs.html"
     context_object_name = "applications" 
     paginate_by = 10
+    cursor_ordering = ("-date_applied", "-id")
 
     def test_func(self):
         # Ensure the user is an applicant
@@ -153,11 +413,11 @@ class MyAppliedJobsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         return (
             Application.objects.filter(applicant=self.request.user)
             .select_related("job")
-            .order_by("-date_applied")
+            .order_by("-date_applied", "-id")
         )
 
 
-class MyPostedJobsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class MyPostedJobsView(LoginRequiredMixin, UserPassesTestMixin, KeysetPaginationMixin, ListView):
     model = Job
     template_name = "jobs/my_posted_jobs.html"
     context_object_name = "posted_jobs"
@@ -171,11 +431,130 @@ class MyPostedJobsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         )
 
     def get_queryset(self):
-        # This annotates each job with the number of applications it has received.
+        # Each job carries its own application_count, so no join is needed.
+        jobs = Job.objects.filter(posted_by=self.request.user).order_by("-date_posted", "-id")
+        return filter_by_status(jobs, self.request.GET.get("status", ""))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["statuses"] = JOB_STATUSES
+        context["status"] = self.request.GET.get("status", "")
+        context["bulk_form"] = BulkJobActionForm(initial={"status": context["status"]})
+        return context
+
+
+# Apply a lifecycle action to selected jobs, or to every job matching a status filter
+@login_required
+@require_POST
+def bulk_job_action(request):
+    if request.user.profile.role != "company":
+        messages.error(request, "Only companies can perform this action.")
+        return render(request, "jobs/denied.html")
+
+    form = BulkJobActionForm(request.POST)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            messages.error(request, " ".join(errors))
+        return redirect("my-posted-jobs")
+
+    # Every action is scoped to the user's own jobs
+    jobs = Job.objects.filter(posted_by=request.user)
+    if form.cleaned_data["select_all"]:
+        jobs = filter_by_status(jobs, form.cleaned_data["status"])
+    else:
+        job_ids = [int(pk) for pk in request.POST.getlist("job_ids") if pk.isdigit()]
+        if not job_ids:
+            messages.error(request, "Select at least one job.")
+            return redirect("my-posted-jobs")
+        jobs = jobs.filter(pk__in=job_ids)
+
+    action = form.cleaned_data["action"]
+    if action == "deactivate":
+        count = deactivate_jobs(jobs)
+        messages.success(request, f"Closed {count} job(s).")
+    elif action == "reactivate":
+        count = reactivate_jobs(jobs)
+        messages.success(request, f"Reopened {count} job(s).")
+    elif action == "extend":
+        count = extend_deadlines(jobs, form.cleaned_data["days"])
+        messages.success(request, f"Extended the deadline of {count} job(s) by {form.cleaned_data['days']} day(s).")
+    else:
+        count = delete_jobs(jobs, chunk_size=DELETE_CHUNK_SIZE)
+        messages.success(request, f"Deleted {count} job(s).")
+
+    status = form.cleaned_data["status"]
+    return redirect(f"{reverse('my-posted-jobs')}?{urlencode({'status': status})}" if status else "my-posted-jobs")
+
+
+# View for an employer to review the applicants of one of their jobs
+class JobApplicantsView(LoginRequiredMixin, CompanyRequiredMixin, KeysetPaginationMixin, ListView):
+    model = Application
+    template_name = "jobs/job_applicants.html"
+    context_object_name = "applications"
+    paginate_by = 20
+    # Best match first, unscored last (see APPLICANT_RANK and its index)
+    cursor_ordering = ("-score_rank", "-date_applied", "-id")
+
+    def get_queryset(self):
+        self.job = get_object_or_404(Job, pk=self.kwargs["pk"], posted_by=self.request.user)
         return (
-            Job.objects.filter(posted_by=self.request.user)
-            .annotate(application_count=Count("applications"))
-            .order_by("-date_posted")
+            Application.objects.filter(job=self.job)
+            .select_related("applicant")
+            .annotate(score_rank=APPLICANT_RANK)
+            .order_by(*self.cursor_ordering)
         )
-        
-        
\ No newline at end of file
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["job"] = self.job
+        return context
+
+
+# Save the current job list filters as a saved search
+@login_required
+@require_POST
+def save_search(request):
+    # Saved salary bounds are kept in the base currency
+    currency = parse_currency(request.POST.get("currency"))
+    params = {
+        "query": " ".join(request.POST.get("q", "").split())[:255],
+        "min_salary": saved_salary_bound(request.POST.get("min_salary"), currency),
+        "max_salary": saved_salary_bound(request.POST.get("max_salary"), currency),
+    }
+    for field in FACETS:
+        value = request.POST.get(field, "")
+        params[field] = value if value in dict(FACETS[field]) else ""
+    saved_search = SavedSearch.objects.create(
+        user=request.user, name=request.POST.get("name", "")[:100], **params
+    )
+    messages.success(request, "Search saved. We'll alert you when new jobs match it.")
+    return redirect(f"{reverse('job-list')}?{urlencode(saved_search.get_filter_params())}")
+
+
+# View for listing the current user's saved searches and their recent alerts
+class SavedSearchListView(LoginRequiredMixin, ListView):
+    model = SavedSearch
+    template_name = "jobs/saved_searches.html"
+    context_object_name = "saved_searches"
+
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user).order_by("-created_at")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["alerts"] = (
+            JobAlert.objects.filter(saved_search__user=self.request.user, job__is_active=True)
+            .select_related("job", "saved_search")
+            .order_by("-created_at")[:50]
+        )
+        context["base_currency"] = parse_currency(None)
+        return context
+
+
+@login_required
+@require_POST
+def delete_saved_search(request, pk):
+    saved_search = get_object_or_404(SavedSearch, pk=pk, user=request.user)
+    saved_search.delete()
+    messages.success(request, "Saved search removed.")
+    return redirect("saved-searches")
@@ -0,0 +1,146 @@
+"""
+Email digests of queued notifications.
+
+Events (a new application, a new job matching a saved search) are stored as
+Notification rows, written in the same transaction as the event. Instead of
+one email per event, `send_digests()` (the `send_notification_digests`
+command) coalesces everything pending for a recipient into a single email
+once their oldest notification of some kind has waited that kind's cadence
+(`settings.NOTIFICATION_CADENCE`).
+
+Recipients are processed `batch_size` at a time, in recipient order: their
+notifications are streamed, only the first MAX_DIGEST_ITEMS lines per kind
+are kept, and the batch's emails go out through one shared connection with
+`send_messages()`. Memory therefore stays bounded however many
+notifications are pending. A batch is marked sent only after its emails were
+handed to the backend; if sending fails, the batch is retried on the next
+run.
+"""
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Notification
+
+# Default cadence (seconds) for kinds missing from settings.NOTIFICATION_CADENCE
+DEFAULT_CADENCE = 60 * 60
+
+# Lines listed per kind in one digest; the rest are summarized as "...and N more"
+MAX_DIGEST_ITEMS = 20
+
+# Recipients whose digests are built and sent together
+DIGEST_BATCH_SIZE = 500
+
+
+def notify(recipient_id, kind, message, url=""):
+    """
+    Queue a notification for the recipient's next digest.
+    """
+    return Notification.objects.create(recipient_id=recipient_id, kind=kind, message=message[:255], url=url)
+
+
+def notify_many(notifications):
+    """
+    Queue unsaved Notification instances in one INSERT.
+    """
+    for notification in notifications:
+        notification.message = notification.message[:255]
+    return Notification.objects.bulk_create(notifications, batch_size=1000)
+
+
+def cadence(kind):
+    return getattr(settings, "NOTIFICATION_CADENCE", {}).get(kind, DEFAULT_CADENCE)
+
+
+def due_filter(now):
+    """
+    Q for pending notifications that have waited their kind's cadence.
+    """
+    due = Q(pk__in=[])
+    for kind, _ in Notification.KINDS:
+        due |= Q(kind=kind, created_at__lte=now - timedelta(seconds=cadence(kind)))
+    return due
+
+
+def build_digest(rows):
+    """
+    Group one recipient's (recipient_id, pk, kind, message, url) rows into
+    digest sections. Returns (sections, largest pk seen).
+    """
+    labels = dict(Notification.KINDS)
+    sections, last_pk = {}, 0
+    for _, pk, kind, message, url in rows:
+        last_pk = max(last_pk, pk)
+        section = sections.setdefault(kind, {"title": labels.get(kind, kind), "items": [], "total": 0})
+        section["total"] += 1
+        if len(section["items"]) < MAX_DIGEST_ITEMS:
+            section["items"].append({"message": message, "url": url})
+    for section in sections.values():
+        section["more"] = section["total"] - len(section["items"])
+    return [sections[kind] for kind, _ in Notification.KINDS if kind in sections], last_pk
+
+
+def digest_subject(sections):
+    parts = [f"{section['total']} {section['title'][0].lower()}{section['title'][1:]}" for section in sections]
+    return "JobBoard: " + "; ".join(parts)
+
+
+def digest_message(user, sections):
+    body = render_to_string(
+        "notifications/digest_email.txt",
+        {"user": user, "sections": sections, "site_url": getattr(settings, "SITE_URL", "")},
+    )
+    return EmailMessage(digest_subject(sections), body, to=[user.email])
+
+
+def send_digests(batch_size=DIGEST_BATCH_SIZE, now=None, connection=None):
+    """
+    Email every recipient with due notifications their digest. Returns the number of emails sent.
+
+    Recipients without an email address have their notifications marked
+    sent without an email.
+    """
+    now = now or timezone.now()
+    pending = Notification.objects.filter(sent_at__isnull=True)
+    due = pending.filter(due_filter(now))
+    connection = connection or get_connection()
+    sent, last_recipient_id = 0, 0
+
+    # One connection (e.g. one SMTP session) for the whole run
+    with connection:
+        while True:
+            recipient_ids = list(
+                due.filter(recipient_id__gt=last_recipient_id)
+                .order_by("recipient_id")
+                .values_list("recipient_id", flat=True)
+                .distinct()[:batch_size]
+            )
+            if not recipient_ids:
+                return sent
+            last_recipient_id = recipient_ids[-1]
+            users = User.objects.only("username", "first_name", "email").in_bulk(recipient_ids)
+
+            rows = (
+                pending.filter(recipient_id__in=recipient_ids)
+                .order_by("recipient_id", "pk")
+                .values_list("recipient_id", "pk", "kind", "message", "url")
+                .iterator(chunk_size=2000)
+            )
+            messages, last_pk = [], 0
+            for recipient_id, group in groupby(rows, key=lambda row: row[0]):
+                sections, group_last_pk = build_digest(group)
+                last_pk = max(last_pk, group_last_pk)
+                user = users.get(recipient_id)
+                if user is not None and user.email:
+                    messages.append(digest_message(user, sections))
+
+            if messages:
+                sent += connection.send_messages(messages) or 0
+            # Notifications queued after the rows were read have larger ids and wait for the next run
+            pending.filter(recipient_id__in=recipient_ids, pk__lte=last_pk).update(sent_at=now)
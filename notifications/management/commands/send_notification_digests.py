@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from notifications.digests import DIGEST_BATCH_SIZE, send_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Email every user whose pending notifications are due one digest of "
+        "everything pending for them. Run it every few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=DIGEST_BATCH_SIZE,
+            help="Recipients whose digests are built and sent together.",
+        )
+
+    def handle(self, *args, **options):
+        sent = send_digests(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} digest email(s)."))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('application', 'New applications'), ('job_alert', 'New jobs matching your saved searches'), ('job_import', 'Finished job imports')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class Notification(models.Model):
+    """
+    One event for a user, waiting to go out in their next email digest
+    (see notifications.digests).
+    """
+    KINDS = [
+        ("application", "New applications"),
+        ("job_alert", "New jobs matching your saved searches"),
+        ("job_import", "Finished job imports"),
+    ]
+
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notifications")  # User to tell
+    kind = models.CharField(max_length=20, choices=KINDS)  # Event type; decides the digest cadence
+    message = models.CharField(max_length=255)  # One line of the digest
+    url = models.CharField(max_length=255, blank=True)  # Site path the line links to
+    created_at = models.DateTimeField(auto_now_add=True)  # Date of the event
+    sent_at = models.DateTimeField(blank=True, null=True)  # Date it went out in a digest
+
+    def __str__(self):
+        """
+        Returns a string representation of the notification.
+        """
+        return f"{self.get_kind_display()} for {self.recipient_id}: {self.message}"
+
+    class Meta:
+        indexes = [
+            # Digest runs: pending notifications per recipient, by kind and age
+            models.Index(
+                fields=["recipient", "kind", "created_at"],
+                condition=models.Q(sent_at__isnull=True),
+                name="notification_pending_idx",
+            ),
+        ]
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.urls import reverse
+
+from jobs.models import Application
+
+from .digests import notify
+
+
+@receiver(post_save, sender=Application)
+def notify_employer_of_application(sender, instance, created, **kwargs):
+    """
+    Queue a digest line for the employer when someone applies to their job.
+    """
+    if not created:
+        return
+    job = instance.job
+    notify(
+        job.posted_by_id,
+        "application",
+        f"{instance.full_name} applied for {job.title}",
+        reverse("job-applicants", args=[job.pk]),
+    )
@@ -0,0 +1,84 @@
+import io
+from datetime import timedelta
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Application
+from jobs.testing import make_job, make_user
+
+from .digests import MAX_DIGEST_ITEMS, notify, notify_many, send_digests
+from .models import Notification
+
+CADENCE = {"application": 15 * 60, "job_alert": 24 * 60 * 60, "job_import": 0}
+
+
+@override_settings(NOTIFICATION_CADENCE=CADENCE)
+class DigestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user("employer")
+        self.now = timezone.now()
+
+    def later(self, **delta):
+        return self.now + timedelta(**delta)
+
+    def test_application_queues_a_notification(self):
+        job = make_job(self.user)
+        seeker = make_user("seeker")
+        Application.objects.create(job=job, applicant=seeker, full_name="Sam Seeker")
+        notification = Notification.objects.get(recipient=self.user)
+        self.assertEqual(notification.kind, "application")
+        self.assertEqual(notification.message, "Sam Seeker applied for Python Developer")
+
+    def test_pending_notifications_go_out_together_once_due(self):
+        notify(self.user.pk, "application", "First applied", "/a/1/")
+        notify(self.user.pk, "job_alert", "Python Developer at Acme", "/j/1/")
+        self.assertEqual(send_digests(now=self.later(minutes=5)), 0)
+
+        # The application cadence is up; the waiting job alert rides along
+        self.assertEqual(send_digests(now=self.later(minutes=16)), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ["employer@example.com"])
+        self.assertEqual(message.subject, "JobBoard: 1 new applications; 1 new jobs matching your saved searches")
+        self.assertIn("First applied", message.body)
+        self.assertIn("Python Developer at Acme", message.body)
+        self.assertFalse(Notification.objects.filter(sent_at__isnull=True).exists())
+
+        self.assertEqual(send_digests(now=self.later(days=2)), 0)
+
+    def test_long_sections_are_summarized(self):
+        notify_many([
+            Notification(recipient=self.user, kind="job_import", message=f"import {n}")
+            for n in range(MAX_DIGEST_ITEMS + 3)
+        ])
+        self.assertEqual(send_digests(now=self.later(seconds=1)), 1)
+        body = mail.outbox[0].body
+        self.assertIn(f"import {MAX_DIGEST_ITEMS - 1}", body)
+        self.assertNotIn(f"import {MAX_DIGEST_ITEMS}\n", body)
+        self.assertIn("...and 3 more.", body)
+
+    def test_recipients_are_batched(self):
+        others = [make_user(f"user{n}") for n in range(4)]
+        for user in [self.user, *others]:
+            notify(user.pk, "job_import", "done")
+        self.assertEqual(send_digests(batch_size=2, now=timezone.now() + timedelta(seconds=1)), 5)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), sorted(
+            user.email for user in [self.user, *others]
+        ))
+
+    def test_recipient_without_email_is_marked_sent(self):
+        self.user.email = ""
+        self.user.save()
+        notify(self.user.pk, "job_import", "done")
+        self.assertEqual(send_digests(now=self.later(seconds=1)), 0)
+        self.assertIsNotNone(Notification.objects.get().sent_at)
+
+    def test_command(self):
+        notify(self.user.pk, "job_import", "done")
+        call_command("send_notification_digests", stdout=io.StringIO())
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import Schedule, Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "available_at", "created_at", "finished_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("created_at", "finished_at")
+
+
+@admin.register(Schedule)
+class ScheduleAdmin(admin.ModelAdmin):
+    list_display = ("name", "next_run_at", "last_run_at")
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class OutboxConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'outbox'
+
+    def ready(self):
+        # Task functions register themselves when each app's tasks module is imported
+        from django.utils.module_loading import autodiscover_modules
+
+        autodiscover_modules("tasks")
@@ -0,0 +1,31 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from outbox.worker import LEASE_SECONDS, Worker
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks (see outbox.worker) until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=4, help="Tasks run in parallel.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Tasks claimed per query (default: twice the concurrency).")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when no task is due.")
+        parser.add_argument("--lease", type=int, default=LEASE_SECONDS, help="Seconds a claimed task is reserved for this worker.")
+        parser.add_argument("--until-empty", action="store_true", help="Exit once no task is due instead of waiting for more.")
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            concurrency=options["concurrency"],
+            batch_size=options["batch_size"],
+            poll_interval=options["poll_interval"],
+            lease_seconds=options["lease"],
+        )
+        # Finish the tasks in hand on Ctrl-C / SIGTERM rather than abandoning their leases
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: worker.stop())
+        stats = worker.run(until_empty=options["until_empty"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Ran {stats['succeeded']} task(s) successfully, {stats['failed']} failed.")
+        )
@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """
+    A unit of background work, written in the same transaction as the change
+    that caused it and run later by `manage.py run_worker` (see outbox.worker).
+    """
+    STATUSES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    name = models.CharField(max_length=200)  # Registered task name, see outbox.registry
+    payload = models.JSONField(default=dict, blank=True)  # Keyword arguments for the task function
+    status = models.CharField(max_length=10, choices=STATUSES, default="pending")  # Lifecycle state
+    attempts = models.PositiveSmallIntegerField(default=0)  # Runs started so far
+    max_attempts = models.PositiveSmallIntegerField(default=5)  # Runs allowed before giving up
+    available_at = models.DateTimeField(default=timezone.now)  # When it may be claimed next; the lease expiry while running
+    lease_token = models.CharField(max_length=32, blank=True)  # Identifies the claim currently holding it
+    last_error = models.TextField(blank=True)  # Traceback of the latest failed run
+    created_at = models.DateTimeField(auto_now_add=True)  # Date queued
+    finished_at = models.DateTimeField(blank=True, null=True)  # Date it succeeded or gave up
+
+    def __str__(self):
+        """
+        Returns a string representation of the task.
+        """
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    class Meta:
+        indexes = [
+            # Worker claims: due pending tasks and expired running leases. Not a
+            # partial index: SQLite can't match a status IN (...) condition
+            # against the query's bound parameters.
+            models.Index(fields=["status", "available_at"], name="task_status_available_idx"),
+        ]
+
+
+class Schedule(models.Model):
+    """
+    When a periodic task (`@task(every=...)`) is next queued, shared by all workers.
+    """
+    name = models.CharField(max_length=200, unique=True)  # Registered task name
+    next_run_at = models.DateTimeField(default=timezone.now)  # When the next run is queued
+    last_run_at = models.DateTimeField(blank=True, null=True)  # When a run was last queued
+
+    def __str__(self):
+        """
+        Returns a string representation of the schedule.
+        """
+        return f"{self.name} @ {self.next_run_at:%Y-%m-%d %H:%M:%S}"
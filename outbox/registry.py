@@ -0,0 +1,109 @@
+"""
+Task functions and queueing.
+
+A task is a plain function decorated with `@task()` in an app's `tasks`
+module (imported at startup by OutboxConfig). `enqueue()` writes a Task row
+for it; called inside a transaction, the task commits or rolls back with the
+change that caused it, so there is never work queued for a change that didn't
+happen, or a change whose work got lost.
+
+Payloads are stored as JSON, so pass ids rather than model instances, and
+write tasks so that running one twice is harmless: a worker that dies
+mid-task has its lease expire and the task runs again.
+
+`@task(every=seconds)` also makes a task periodic: the workers queue a run
+(without arguments) every `every` seconds, see `queue_scheduled()`. The
+next run time lives in a Schedule row that a worker claims with a
+conditional UPDATE before queueing, so however many workers run, each
+period queues one run. This replaces cron and in-process timer threads.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Schedule, Task
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+_registry = {}
+
+
+def task(name=None, max_attempts=DEFAULT_MAX_ATTEMPTS, every=None):
+    """
+    Register a function as a task, by default under "<module>.<function name>".
+
+    With `every` (seconds) the workers also run it periodically.
+    """
+    def decorator(func):
+        func.task_name = name or f"{func.__module__}.{func.__name__}"
+        func.max_attempts = max_attempts
+        func.every = every
+        _registry[func.task_name] = func
+        return func
+
+    return decorator
+
+
+def get_task(name):
+    """
+    Return the function registered under `name`, or None.
+    """
+    return _registry.get(name)
+
+
+def periodic_tasks():
+    """
+    Return {name: function} for the registered tasks with an `every` interval.
+    """
+    return {name: func for name, func in _registry.items() if func.every}
+
+
+def _build(func, payload, delay=None):
+    return Task(
+        name=func.task_name,
+        payload=payload,
+        max_attempts=func.max_attempts,
+        available_at=timezone.now() + (delay or timedelta()),
+    )
+
+
+def enqueue(func, delay=None, **payload):
+    """
+    Queue a run of a task function with keyword arguments `payload`.
+
+    `delay` (a timedelta) postpones the first run.
+    """
+    queued = _build(func, payload, delay)
+    queued.save()
+    return queued
+
+
+def enqueue_many(func, payloads, delay=None):
+    """
+    Queue one run of a task function per payload dict, in one INSERT.
+    """
+    return Task.objects.bulk_create([_build(func, payload, delay) for payload in payloads])
+
+
+def queue_scheduled(now=None):
+    """
+    Queue a run of every periodic task that is due. Returns the tasks queued.
+
+    A due Schedule row is moved to its next run time with an UPDATE that
+    only matches while it is still due, in the same transaction as the
+    queued task, so concurrent workers can't queue the same period twice.
+    """
+    now = now or timezone.now()
+    periodic = periodic_tasks()
+    Schedule.objects.bulk_create([Schedule(name=name, next_run_at=now) for name in periodic], ignore_conflicts=True)
+    queued = []
+    for schedule in Schedule.objects.filter(name__in=periodic, next_run_at__lte=now):
+        func = periodic[schedule.name]
+        with transaction.atomic():
+            claimed = Schedule.objects.filter(pk=schedule.pk, next_run_at=schedule.next_run_at).update(
+                next_run_at=now + timedelta(seconds=func.every), last_run_at=now
+            )
+            if claimed:
+                queued.append(enqueue(func))
+    return queued
@@ -0,0 +1,126 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from jobs.tasks import expire_jobs
+
+from .models import Schedule, Task
+from .registry import enqueue, enqueue_many, periodic_tasks, queue_scheduled, task
+from .worker import BACKOFF_BASE, BACKOFF_MAX, Worker, claim_tasks, purge_finished, retry_delay, run_task
+
+calls = []
+
+
+@task(name="outbox.tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task(name="outbox.tests.fail", max_attempts=2)
+def fail():
+    raise ValueError("boom")
+
+
+class ScheduleTests(TestCase):
+    def test_periodic_tasks_are_registered(self):
+        self.assertIs(periodic_tasks()[expire_jobs.task_name], expire_jobs)
+
+    def test_one_run_per_period(self):
+        now = timezone.now()
+        self.assertIn(expire_jobs.task_name, [queued.name for queued in queue_scheduled(now)])
+        # Other workers checking within the period queue nothing
+        self.assertEqual(queue_scheduled(now), [])
+        soon = now + timedelta(seconds=expire_jobs.every - 1)
+        self.assertNotIn(expire_jobs.task_name, [queued.name for queued in queue_scheduled(soon)])
+        self.assertEqual(Task.objects.filter(name=expire_jobs.task_name).count(), 1)
+
+        later = now + timedelta(seconds=expire_jobs.every)
+        self.assertIn(expire_jobs.task_name, [queued.name for queued in queue_scheduled(later)])
+        schedule = Schedule.objects.get(name=expire_jobs.task_name)
+        self.assertEqual(schedule.next_run_at, later + timedelta(seconds=expire_jobs.every))
+
+
+class WorkerTests(TestCase):
+    def setUp(self):
+        calls.clear()
+        # The worker closes its connection after each task; keep the test's transaction
+        self.enterContext(mock.patch("outbox.worker.close_old_connections"))
+
+    def test_enqueue_rolls_back_with_the_transaction(self):
+        try:
+            with transaction.atomic():
+                enqueue(record, value=1)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertFalse(Task.objects.exists())
+
+    def test_claimed_tasks_are_leased_once(self):
+        enqueue_many(record, [{"value": n} for n in range(3)])
+        enqueue(record, delay=timedelta(hours=1), value=99)
+        claimed = claim_tasks(2)
+        self.assertEqual([queued.payload["value"] for queued in claimed], [0, 1])
+        self.assertEqual(len(claim_tasks(10)), 1)
+        self.assertEqual(claim_tasks(10), [])
+
+    def test_expired_lease_is_claimed_again(self):
+        enqueue(record, value=1)
+        first = claim_tasks(1, lease_seconds=-1)[0]
+        second = claim_tasks(1)[0]
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(second.attempts, 2)
+        self.assertNotEqual(second.lease_token, first.lease_token)
+        # The first claim's late outcome is not recorded over the second's
+        run_task(first)
+        self.assertEqual(Task.objects.get(pk=first.pk).status, "running")
+
+    def test_run_task(self):
+        enqueue(record, value=1)
+        self.assertTrue(run_task(claim_tasks(1)[0]))
+        self.assertEqual(calls, [1])
+        done = Task.objects.get()
+        self.assertEqual(done.status, "done")
+        self.assertIsNotNone(done.finished_at)
+
+    def test_failed_task_is_retried_then_given_up(self):
+        enqueue(fail)
+        self.assertFalse(run_task(claim_tasks(1)[0]))
+        retried = Task.objects.get()
+        self.assertEqual((retried.status, retried.attempts), ("pending", 1))
+        self.assertIn("ValueError: boom", retried.last_error)
+        self.assertGreater(retried.available_at, timezone.now())
+
+        Task.objects.update(available_at=timezone.now())
+        self.assertFalse(run_task(claim_tasks(1)[0]))
+        self.assertEqual(Task.objects.get().status, "failed")
+
+    def test_retry_delay(self):
+        self.assertTrue(BACKOFF_BASE / 2 <= retry_delay(1) <= BACKOFF_BASE)
+        self.assertTrue(BACKOFF_BASE <= retry_delay(2) <= 2 * BACKOFF_BASE)
+        self.assertLessEqual(retry_delay(50), BACKOFF_MAX)
+
+    def test_purge_finished(self):
+        enqueue(record, value=1)
+        enqueue(record, value=2)
+        Task.objects.filter(payload__value=1).update(status="done", finished_at=timezone.now() - timedelta(days=8))
+        self.assertEqual(purge_finished(), 1)
+        self.assertEqual(Task.objects.get().payload, {"value": 2})
+
+
+class WorkerRunTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+        # Keep the periodic tasks out of the run
+        later = timezone.now() + timedelta(days=1)
+        Schedule.objects.bulk_create([Schedule(name=name, next_run_at=later) for name in periodic_tasks()])
+
+    def test_runs_every_due_task(self):
+        enqueue_many(record, [{"value": n} for n in range(10)])
+        enqueue(fail)
+        stats = Worker(concurrency=3).run(until_empty=True)
+        self.assertEqual(sorted(calls), list(range(10)))
+        self.assertEqual(stats, {"succeeded": 10, "failed": 1})
+        self.assertEqual(Task.objects.filter(status="done").count(), 10)
@@ -0,0 +1,202 @@
+"""
+The background worker that runs queued tasks.
+
+Workers claim tasks in batches by leasing them: one UPDATE marks up to
+`batch_size` claimable tasks as running under a fresh lease token and pushes
+their `available_at` to the end of the lease. A task is claimable while it is
+pending and due, or running with an expired lease (its worker died), so
+nothing is lost when a worker is killed. The UPDATE carries its own
+conditions, so concurrent workers never claim the same task: on SQLite the
+statement holds the write lock, and on databases with SKIP LOCKED the
+candidate rows are locked and skipped by other workers first.
+
+Every few seconds a worker also queues the periodic tasks that are due (see
+`outbox.registry.queue_scheduled()`).
+
+Claimed tasks run on a thread pool. A failed run is retried after an
+exponential backoff with jitter until the task's `max_attempts` is used up,
+then it is marked failed with its traceback kept in `last_error`.
+"""
+import logging
+import random
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .registry import get_task, queue_scheduled
+
+logger = logging.getLogger(__name__)
+
+CLAIMABLE_STATUSES = ["pending", "running"]
+
+# Seconds a claimed task belongs to its worker before others may take it over
+LEASE_SECONDS = 300
+
+# Retry delays: BACKOFF_BASE * 2 ** (attempt - 1) seconds, capped, with jitter
+BACKOFF_BASE = 10
+BACKOFF_MAX = 60 * 60
+
+# Seconds between checks for due periodic tasks
+SCHEDULE_CHECK_SECONDS = 5
+
+# Finished tasks are deleted after this long
+KEEP_FINISHED = timedelta(days=7)
+
+
+def retry_delay(attempts):
+    """
+    Seconds to wait before retrying a task that has failed `attempts` times.
+    """
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim_tasks(limit, lease_seconds=LEASE_SECONDS):
+    """
+    Lease up to `limit` claimable tasks, oldest first. Returns the claimed Tasks.
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    claimable = Task.objects.filter(status__in=CLAIMABLE_STATUSES, available_at__lte=now)
+    lease = {
+        "status": "running",
+        "lease_token": token,
+        "available_at": now + timedelta(seconds=lease_seconds),
+        "attempts": F("attempts") + 1,
+    }
+    oldest = claimable.order_by("available_at")
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            pks = list(oldest.select_for_update(skip_locked=True).values_list("pk", flat=True)[:limit])
+            claimable.filter(pk__in=pks).update(**lease)
+    else:
+        # A single UPDATE ... WHERE pk IN (SELECT ... LIMIT n); repeating the
+        # claimable conditions keeps a task from being leased twice
+        claimable.filter(pk__in=oldest.values("pk")[:limit]).update(**lease)
+    return list(Task.objects.filter(lease_token=token, status="running"))
+
+
+def run_task(claimed):
+    """
+    Run one claimed task and record the outcome. Returns True on success.
+    """
+    func = get_task(claimed.name)
+    leased = Task.objects.filter(pk=claimed.pk, lease_token=claimed.lease_token)
+    try:
+        if func is None:
+            raise LookupError(f"No task registered as {claimed.name!r}.")
+        func(**claimed.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if claimed.attempts >= claimed.max_attempts:
+            logger.error(f"Task {claimed} failed for good after {claimed.attempts} attempt(s)")
+            leased.update(status="failed", last_error=error, finished_at=timezone.now(), lease_token="")
+        else:
+            delay = retry_delay(claimed.attempts)
+            logger.warning(f"Task {claimed} failed; retrying in {delay:.0f}s")
+            leased.update(
+                status="pending",
+                last_error=error,
+                available_at=timezone.now() + timedelta(seconds=delay),
+                lease_token="",
+            )
+        return False
+    else:
+        leased.update(status="done", finished_at=timezone.now(), lease_token="")
+        return True
+    finally:
+        close_old_connections()
+
+
+def purge_finished(older_than=KEEP_FINISHED):
+    """
+    Delete done and failed tasks that finished more than `older_than` ago.
+    """
+    cutoff = timezone.now() - older_than
+    return Task.objects.filter(status__in=["done", "failed"], finished_at__lt=cutoff).delete()[0]
+
+
+class Worker:
+    """
+    Claims tasks in batches and runs them on `concurrency` threads.
+    """
+
+    def __init__(self, concurrency=4, batch_size=None, poll_interval=1.0, lease_seconds=LEASE_SECONDS):
+        self.concurrency = concurrency
+        self.batch_size = batch_size or concurrency * 2
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.stats = {"succeeded": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._slots = threading.Semaphore(self.batch_size)
+        self._last_purge = 0.0
+        self._last_schedule_check = None
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, claimed):
+        try:
+            outcome = "succeeded" if run_task(claimed) else "failed"
+            with self._stats_lock:
+                self.stats[outcome] += 1
+        finally:
+            self._slots.release()
+
+    def _free_slots(self):
+        free = 0
+        while free < self.batch_size and self._slots.acquire(blocking=False):
+            free += 1
+        return free
+
+    def run(self, until_empty=False):
+        """
+        Process tasks until stopped (or, with `until_empty`, until none are due).
+        """
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="outbox-worker") as pool:
+            while not self._stop.is_set():
+                self._queue_scheduled()
+                # Never lease more than can start soon, so leases don't expire in the queue
+                free = self._free_slots()
+                if not free:
+                    # Every slot is taken; wait for a running task to finish
+                    if self._slots.acquire(timeout=self.poll_interval):
+                        self._slots.release()
+                    continue
+                claimed = claim_tasks(free, self.lease_seconds)
+                for _ in range(free - len(claimed)):
+                    self._slots.release()
+                for task in claimed:
+                    pool.submit(self._run, task)
+                if claimed:
+                    continue
+                if until_empty and free == self.batch_size:
+                    break
+                self._idle()
+        close_old_connections()
+        return self.stats
+
+    def _queue_scheduled(self):
+        now = time.monotonic()
+        if self._last_schedule_check is not None and now - self._last_schedule_check < SCHEDULE_CHECK_SECONDS:
+            return
+        self._last_schedule_check = now
+        for queued in queue_scheduled():
+            logger.info(f"Queued periodic task {queued}.")
+
+    def _idle(self):
+        if time.monotonic() - self._last_purge > 3600:
+            self._last_purge = time.monotonic()
+            purged = purge_finished()
+            if purged:
+                logger.info(f"Purged {purged} finished task(s).")
+        self._stop.wait(self.poll_interval)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:30
+
+import jobs.resumes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_profile_role_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='resume',
+            field=models.FileField(blank=True, storage=jobs.resumes.resume_storage, upload_to='resumes/'),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.urls import reverse
 
+from jobs.resumes import resume_storage
+
 
 class Profile(models.Model):
     ROLE_CHOICES = [
@@ -24,10 +26,18 @@ class Profile(models.Model):
     industry = models.CharField(max_length=100, blank=True)
     
     # Applicant-specific fields
-    resume = models.FileField(upload_to='resumes/', blank=True)
+    resume = models.FileField(upload_to='resumes/', blank=True, storage=resume_storage)  # stored once per content, see jobs.resumes
     skills = models.TextField(blank=True, help_text="Comma-separated list of skills")
     experience_years = models.IntegerField(default=0)
     education = models.TextField(blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)  # Last change; the detail pages of the user's jobs revalidate on it
+
+    class Meta:
+        indexes = [
+            # Home page company / applicant counts
+            models.Index(fields=["role"], name="profile_role_idx"),
+        ]
     
     def __str__(self):
         return f"{self.user.username} Profile ({self.get_role_display()})"
@@ -1,8 +1,12 @@
 # users/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+from jobs import resumes
+from jobs.models import Job, Application
+from jobs.signals import jobs_bulk_changed
 from .models import Profile
+from .stats import EmployerStats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,4 +36,62 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
             try:
                 instance.profile.save()
             except Exception as e:
-                logger.error(f"Error saving profile for user {instance.username}: {str(e)}")
\ No newline at end of file
+                logger.error(f"Error saving profile for user {instance.username}: {str(e)}")
+
+@receiver(post_init, sender=Profile)
+def remember_profile_resume(sender, instance, **kwargs):
+    """
+    Note the profile's stored resume, to release it if a new one is uploaded.
+    """
+    resumes.remember_resume(instance)
+
+
+@receiver(post_save, sender=Profile)
+def release_replaced_profile_resume(sender, instance, **kwargs):
+    """
+    Drop the reference to the resume the profile pointed at before an upload.
+    """
+    resumes.release_replaced_resume(instance)
+
+
+@receiver(post_delete, sender=Profile)
+def release_deleted_profile_resume(sender, instance, **kwargs):
+    """
+    Drop the deleted profile's reference to its resume.
+    """
+    resumes.release(instance.resume.name)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_employer_stats_for_job(sender, instance, **kwargs):
+    """
+    Drop the poster's cached dashboard metrics when one of their jobs changes.
+    """
+    EmployerStats.invalidate(instance.posted_by_id)
+
+
+@receiver(jobs_bulk_changed, sender=Job)
+def invalidate_employer_stats_for_bulk_jobs(sender, posted_by_ids, **kwargs):
+    """
+    Drop the cached dashboard metrics of every employer whose jobs changed in bulk.
+    """
+    for posted_by_id in posted_by_ids:
+        EmployerStats.invalidate(posted_by_id)
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_employer_stats_for_application(sender, instance, origin=None, **kwargs):
+    """
+    Drop the employer's cached dashboard metrics when an application changes.
+    """
+    if isinstance(origin, Job) or getattr(origin, "model", None) is Job:
+        # Cascading from a job delete; the job's own signal handles it
+        return
+    if Application.job.is_cached(instance):
+        posted_by_id = instance.job.posted_by_id
+    else:
+        posted_by_id = Job.objects.filter(pk=instance.job_id).values_list("posted_by_id", flat=True).first()
+    if posted_by_id is not None:
+        EmployerStats.invalidate(posted_by_id)
@@ -0,0 +1,68 @@
+"""
+Dashboard statistics for employers.
+
+`EmployerStats` gathers every metric on the employer dashboard with one
+aggregate over the employer's jobs plus reads from the daily rollup (see
+jobs.rollups) for the time windows, and caches the result per employer.
+Job and Application signals (see users.signals) drop the cached entry so
+the numbers never lag behind a change by more than the TTL for
+time-window counts.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from jobs.models import Job
+from jobs.rollups import application_window_counts, daily_application_series
+
+
+class EmployerStats:
+    """
+    Cached scalar metrics for one employer's dashboard.
+    """
+    cache_timeout = 300  # seconds; bounds how stale the 7-day window can get
+
+    def __init__(self, user):
+        self.user_id = user.pk
+
+    @staticmethod
+    def cache_key(user_id):
+        return f"employer-stats:{user_id}"
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        Forget the cached metrics for an employer.
+        """
+        cache.delete(cls.cache_key(user_id))
+
+    def compute(self):
+        """
+        Compute the metrics from the database.
+        """
+        jobs = Job.objects.filter(posted_by_id=self.user_id).aggregate(
+            total_jobs=Count("pk"),
+            active_jobs=Count("pk", filter=Q(is_active=True)),
+            total_applications=Coalesce(Sum("application_count"), 0),
+        )
+        # 7/30/90-day windows from the daily rollup plus the unrolled tail
+        windows = application_window_counts(posted_by_id=self.user_id)
+        return {
+            **jobs,
+            "inactive_jobs": jobs["total_jobs"] - jobs["active_jobs"],
+            "recent_applications_count": windows["last_7_days"],
+            "applications_last_30_days": windows["last_30_days"],
+            "applications_last_90_days": windows["last_90_days"],
+            "daily_applications": daily_application_series(days=30, posted_by_id=self.user_id),
+        }
+
+    def get(self):
+        """
+        Return the metrics, from the cache when possible.
+        """
+        key = self.cache_key(self.user_id)
+        stats = cache.get(key)
+        if stats is None:
+            stats = self.compute()
+            cache.set(key, stats, self.cache_timeout)
+        return stats
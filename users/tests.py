@@ -1,3 +1,54 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from jobs.models import Application
+from jobs.rollups import rollup_applications
+from jobs.testing import make_job, make_user
+
+from .stats import EmployerStats
+
+
+class EmployerStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = make_user("employer", role="company")
+        self.job = make_job(self.employer)
+        make_job(self.employer, is_active=False)
+        Application.objects.create(job=self.job, applicant=make_user("first"))
+
+    def stats(self):
+        return EmployerStats(self.employer).get()
+
+    def test_metrics(self):
+        stats = self.stats()
+        self.assertEqual((stats["total_jobs"], stats["active_jobs"], stats["inactive_jobs"]), (2, 1, 1))
+        self.assertEqual(stats["total_applications"], 1)
+        self.assertEqual(stats["recent_applications_count"], 1)
+        self.assertEqual(stats["daily_applications"][-1][1], 1)
+
+    def test_windows_add_the_unrolled_tail(self):
+        rollup_applications()
+        Application.objects.create(job=self.job, applicant=make_user("second"))
+        stats = self.stats()
+        self.assertEqual(stats["applications_last_30_days"], 2)
+        self.assertEqual(sum(n for _, n in stats["daily_applications"]), 2)
+
+    def test_cached_until_an_application_changes(self):
+        self.stats()
+        with self.assertNumQueries(1):
+            # Just the cache read
+            self.stats()
+        Application.objects.create(job=self.job, applicant=make_user("second"))
+        self.assertEqual(self.stats()["total_applications"], 2)
+
+    def test_job_change_invalidates(self):
+        self.stats()
+        make_job(self.employer)
+        self.assertEqual(self.stats()["total_jobs"], 3)
+
+    def test_dashboard(self):
+        self.client.force_login(self.employer)
+        response = self.client.get(reverse("employer-dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_applications"], 1)
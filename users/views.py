@@ -13,6 +13,8 @@ from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 from jobs.models import Job, Application
+from jobs.recommendations import recommend_jobs
+from .stats import EmployerStats
 
 def choose_role(request):
     """Let users choose between company or applicant role"""
@@ -142,43 +144,25 @@ def employer_dashboard(request):
         messages.error(request, 'Access denied. This page is for employers only.')
         return redirect('job-list')
     
+    # Scalar metrics (cached per employer)
+    stats = EmployerStats(request.user).get()
+
     # Get posted jobs
     posted_jobs = Job.objects.filter(posted_by=request.user).order_by('-date_posted')
     
-    # Calculate statistics
-    total_jobs = posted_jobs.count()
-    active_jobs = posted_jobs.filter(is_active=True).count()
-    inactive_jobs = total_jobs - active_jobs
-    
     # Recent jobs (last 5)
     recent_jobs = posted_jobs[:5]
     
-    # Total applications received
-    total_applications = Application.objects.filter(job__posted_by=request.user).count()
-    
     # Recent applications (last 10)
     recent_applications = Application.objects.filter(
         job__posted_by=request.user
     ).select_related('job', 'applicant').order_by('-date_applied')[:10]
     
-    # Applications in last 7 days
-    week_ago = timezone.now() - timedelta(days=7)
-    recent_applications_count = Application.objects.filter(
-        job__posted_by=request.user,
-        date_applied__gte=week_ago
-    ).count()
-    
-    # Jobs with most applications
-    popular_jobs = posted_jobs.annotate(
-        application_count=Count('applications')
-    ).order_by('-application_count')[:5]
+    # Jobs with most applications (stored counter, indexed per employer)
+    popular_jobs = posted_jobs.order_by('-application_count', '-date_posted')[:5]
     
     context = {
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'inactive_jobs': inactive_jobs,
-        'total_applications': total_applications,
-        'recent_applications_count': recent_applications_count,
+        **stats,
         'recent_jobs': recent_jobs,
         'recent_applications': recent_applications,
         'popular_jobs': popular_jobs,
@@ -214,9 +198,12 @@ def jobseeker_dashboard(request):
         date_applied__gte=week_ago
     ).count()
     
-    # Get recommended jobs (active jobs not applied to)
-    applied_job_ids = user_applications.values_list('job_id', flat=True)
-    recommended_jobs = Job.objects.filter(
+    # Get recommended jobs: best skill matches the user hasn't applied to,
+    # or simply the newest ones when the profile lists no skills
+    applied_job_ids = list(user_applications.values_list('job_id', flat=True))
+    recommended_jobs = recommend_jobs(
+        request.user.profile, exclude_ids=applied_job_ids, limit=5
+    ) or Job.objects.filter(
         is_active=True
     ).exclude(
         id__in=applied_job_ids